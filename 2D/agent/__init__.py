@@ -1 +1,3 @@
 from agent.agent import DQNAgent
+from agent.replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+from agent.inference import NumpyQNetwork, build_policy
@@ -3,9 +3,11 @@ import torch.nn as nn
 import torch.nn.functional as F
 import torch.optim as optim
 
-import random
 import numpy as np
-from collections import deque
+
+from utils import spawn_seeds, Profiler
+from agent.replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+from agent.inference import build_policy
 
 class QNetwork(nn.Module):
     def __init__(self, state_size, action_size):
@@ -23,22 +25,31 @@ class QNetwork(nn.Module):
         x = F.relu(self.fc3(x))
         return self.fc4(x)  # Output Q-values for each action
 
-class ReplayBuffer:
-    def __init__(self, buffer_size, batch_size):
-        self.buffer = deque(maxlen=buffer_size)
-        self.batch_size = batch_size
-
-    def add(self, experience):
-        self.buffer.append(experience)
-
-    def sample(self):
-        return random.sample(self.buffer, self.batch_size)
-
-    def size(self):
-        return len(self.buffer)
-    
 class DQNAgent:
-    def __init__(self, state_size, action_size, learning_rate=0.001, gamma=0.99, epsilon=1.0, epsilon_min=0.01, epsilon_decay=0.995):
+    def __init__(self, state_size, action_size, learning_rate=0.001, gamma=0.99, epsilon=1.0, epsilon_min=0.01, epsilon_decay=0.995, buffer_size=2000, batch_size=128, prioritized=False, alpha=0.6, beta=0.4, train_every=1, gradient_steps=1, target_update_interval=None, tau=None, double_dqn=False, inference_backend="torch", seed=None):
+        """
+        Args:
+            state_size (int): Length of an observation vector.
+            action_size (int): Number of discrete actions.
+            learning_rate (float): Adam learning rate.
+            gamma (float): Discount factor.
+            epsilon (float): Initial exploration rate.
+            epsilon_min (float): Lower bound for the exploration rate.
+            epsilon_decay (float): Multiplicative decay applied by `decay_epsilon`.
+            buffer_size (int): Replay buffer capacity.
+            batch_size (int): Transitions per gradient update.
+            prioritized (bool): Use prioritized experience replay.
+            alpha (float): Prioritization exponent (prioritized replay only).
+            beta (float): Initial importance-sampling exponent (prioritized replay only).
+            train_every (int): Run a training round only on every Nth call to `train` (one call per env step).
+            gradient_steps (int): Gradient updates per training round.
+            target_update_interval (int): Copy the online network into the target network every N updates
+                (hard update). None (default) disables the target network and bootstraps from the online network.
+            tau (float): If set, Polyak-average the target network by this factor after every update instead.
+            double_dqn (bool): Select bootstrap actions with the online network and evaluate them with the target network.
+            inference_backend (str): Forward path used by `act`/`act_batch`: "torch", "numpy", "torchscript" or "compile".
+            seed (int): Root seed for network initialization, exploration and replay sampling.
+        """
         self.state_size = state_size
         self.action_size = action_size
         self.learning_rate = learning_rate
@@ -46,47 +57,177 @@ class DQNAgent:
         self.epsilon = epsilon  # Exploration rate
         self.epsilon_min = epsilon_min
         self.epsilon_decay = epsilon_decay
+        # Independent random streams derived from one root seed, separate from the global generators
+        exploration_seed, buffer_seed, network_seed = spawn_seeds(seed, 3)
+        self.rng = np.random.default_rng(exploration_seed)
         # Initialize the Q-network and optimizer
-        self.q_network = QNetwork(state_size, action_size)
+        with torch.random.fork_rng(devices=[]):
+            torch.manual_seed(network_seed)
+            self.q_network = QNetwork(state_size, action_size)
         self.optimizer = optim.Adam(self.q_network.parameters(), lr=self.learning_rate)
-        # Replay buffer
-        self.replay_buffer = ReplayBuffer(buffer_size=2000, batch_size=128)
+        # Target network used for bootstrap targets, kept frozen between syncs
+        self.train_every = train_every
+        self.gradient_steps = gradient_steps
+        self.target_update_interval = target_update_interval
+        self.tau = tau
+        self.double_dqn = double_dqn
+        self.use_target_network = target_update_interval is not None or tau is not None
+        self.target_network = None
+        if self.use_target_network:
+            self.target_network = QNetwork(state_size, action_size)
+            self.target_network.load_state_dict(self.q_network.state_dict())
+            self.target_network.requires_grad_(False)
+        self.train_calls = 0  # Calls to train(), i.e. env steps
+        self.updates = 0  # Gradient updates performed
+        # Phase timers for DQNAgent.train; replace with an enabled Profiler to instrument
+        self.profiler = Profiler()
+        # Inference path; it shares the Q-network's parameters so it never needs refreshing
+        self.set_inference_backend(inference_backend)
+        # Replay buffer; prioritized replay samples by TD error and corrects the loss with importance weights
+        self.prioritized = prioritized
+        if prioritized:
+            self.replay_buffer = PrioritizedReplayBuffer(buffer_size=buffer_size, batch_size=batch_size, state_size=state_size, alpha=alpha, beta=beta, seed=buffer_seed)
+        else:
+            self.replay_buffer = ReplayBuffer(buffer_size=buffer_size, batch_size=batch_size, state_size=state_size, seed=buffer_seed)
 
     def act(self, state, greedy=False):
         # Epsilon-greedy policy
         if not greedy:
-            if random.random() <= self.epsilon:
-                return random.randint(0, self.action_size - 1)  # Explore: Random action
-        state = torch.FloatTensor(state).unsqueeze(0)  # Convert state to tensor
-        q_values = self.q_network(state)  # Get Q-values from the network
-        return torch.argmax(q_values).item()  # Exploit: Action with max Q-value
+            if self.rng.random() <= self.epsilon:
+                return int(self.rng.integers(self.action_size))  # Explore: Random action
+        state = np.asarray(state, dtype=np.float32).reshape(1, -1)
+        q_values = self.policy(state)  # Get Q-values from the network
+        return int(q_values.argmax())  # Exploit: Action with max Q-value
+
+    def act_batch(self, states, greedy_mask=False):
+        """
+        Epsilon-greedy actions for a batch of states with a single forward pass.
+
+        Args:
+            states (np.ndarray): Array of shape (batch, state_size).
+            greedy_mask (bool or np.ndarray): Rows for which exploration is disabled; a single bool applies to all.
+
+        Returns:
+            np.ndarray: int64 array of shape (batch,) with one action per state.
+        """
+        states = np.ascontiguousarray(states, dtype=np.float32)
+        actions = self.policy(states).argmax(1)
+        explore = self.rng.random(len(states)) <= self.epsilon
+        explore &= ~np.asarray(greedy_mask, dtype=bool)
+        count = int(explore.sum())
+        if count:
+            actions[explore] = self.rng.integers(0, self.action_size, size=count)
+        return actions
+
+    def set_inference_backend(self, backend):
+        """Switch the forward path used for acting (see `agent.inference.build_policy`)."""
+        self.inference_backend = backend
+        self.policy = build_policy(self.q_network, backend)
 
     def train(self):
+        """
+        Called once per env step; runs `gradient_steps` updates every `train_every` calls.
+
+        Returns:
+            float: Loss of the last update, or None if no update ran.
+        """
+        self.train_calls += 1
+        if self.train_calls % self.train_every != 0:
+            return None
         if self.replay_buffer.size() < self.replay_buffer.batch_size:
-            return
+            return None
+        loss = None
+        for _ in range(self.gradient_steps):
+            loss = self._update()
+        return loss
+
+    def _update(self):
+        profiler = self.profiler
         # Sample a batch from the replay buffer
-        batch = self.replay_buffer.sample()
-        # Prepare the batch for training
-        states, actions, rewards, next_states, dones = zip(*batch)
-        states = torch.FloatTensor(states)
-        next_states = torch.FloatTensor(next_states)
-        actions = torch.LongTensor(actions)
-        rewards = torch.FloatTensor(rewards)
-        dones = torch.FloatTensor(dones)
-        # Get Q-values for the current states and next states
-        q_values = self.q_network(states)
-        next_q_values = self.q_network(next_states)
-        # Select the Q-values corresponding to the chosen actions
-        q_value = q_values.gather(1, actions.unsqueeze(1)).squeeze(1)
-        # Compute the target Q-values using the Bellman equation
-        target_q_value = rewards + (self.gamma * next_q_values.max(1)[0] * (1 - dones))
-        # Compute the loss (mean squared error)
-        loss = nn.MSELoss()(q_value, target_q_value)
+        with profiler.phase("replay.sample"):
+            if self.prioritized:
+                states, actions, rewards, next_states, dones, weights, indices = self.replay_buffer.sample()
+            else:
+                states, actions, rewards, next_states, dones = self.replay_buffer.sample()
+        # Wrap the sampled arrays without copying
+        with profiler.phase("train.tensors"):
+            states = torch.from_numpy(states)
+            next_states = torch.from_numpy(next_states)
+            actions = torch.from_numpy(actions)
+            rewards = torch.from_numpy(rewards)
+            dones = torch.from_numpy(dones)
+        with profiler.phase("train.forward"):
+            # Get Q-values for the current states and select the ones of the chosen actions
+            q_values = self.q_network(states)
+            q_value = q_values.gather(1, actions.unsqueeze(1)).squeeze(1)
+            # Compute the target Q-values using the Bellman equation; no gradient flows through the targets
+            with torch.no_grad():
+                bootstrap_network = self.target_network if self.use_target_network else self.q_network
+                next_q_values = bootstrap_network(next_states)
+                if self.double_dqn:
+                    next_actions = self.q_network(next_states).argmax(1, keepdim=True)
+                    next_q_value = next_q_values.gather(1, next_actions).squeeze(1)
+                else:
+                    next_q_value = next_q_values.max(1)[0]
+                target_q_value = rewards + (self.gamma * next_q_value * (1 - dones))
+            # Compute the loss (mean squared error, importance-weighted for prioritized replay)
+            if self.prioritized:
+                td_errors = target_q_value - q_value
+                loss = (torch.from_numpy(weights) * td_errors.pow(2)).mean()
+                self.replay_buffer.update_priorities(indices, td_errors.detach().numpy())
+            else:
+                loss = nn.MSELoss()(q_value, target_q_value)
         # Update the Q-network
-        self.optimizer.zero_grad()
-        loss.backward()
-        self.optimizer.step()
-    
+        with profiler.phase("train.backprop"):
+            self.optimizer.zero_grad()
+            loss.backward()
+            self.optimizer.step()
+            self.updates += 1
+            self._update_target_network()
+        return loss.item()
+
+    def _update_target_network(self):
+        if not self.use_target_network:
+            return
+        if self.tau is not None:
+            # Polyak averaging: target <- tau * online + (1 - tau) * target
+            with torch.no_grad():
+                for target_param, param in zip(self.target_network.parameters(), self.q_network.parameters()):
+                    target_param.lerp_(param, self.tau)
+        elif self.updates % self.target_update_interval == 0:
+            self.target_network.load_state_dict(self.q_network.state_dict())
+
+    def state_dict(self):
+        """
+        Everything needed to continue training exactly where it stopped.
+
+        Returns:
+            dict: Network and optimizer state dicts, exploration and update counters, the exploration
+            random stream and the replay buffer's `state_dict`. Tensors and arrays are live references.
+        """
+        return {
+            "q_network": self.q_network.state_dict(),
+            "target_network": self.target_network.state_dict() if self.target_network is not None else None,
+            "optimizer": self.optimizer.state_dict(),
+            "epsilon": self.epsilon,
+            "train_calls": self.train_calls,
+            "updates": self.updates,
+            "rng": self.rng.bit_generator.state,
+            "replay_buffer": self.replay_buffer.state_dict(),
+        }
+
+    def load_state_dict(self, state):
+        # Parameters are copied in place, so the inference backend keeps sharing their storage
+        self.q_network.load_state_dict(state["q_network"])
+        if self.target_network is not None and state["target_network"] is not None:
+            self.target_network.load_state_dict(state["target_network"])
+        self.optimizer.load_state_dict(state["optimizer"])
+        self.epsilon = state["epsilon"]
+        self.train_calls = state["train_calls"]
+        self.updates = state["updates"]
+        self.rng.bit_generator.state = state["rng"]
+        self.replay_buffer.load_state_dict(state["replay_buffer"])
+
     def decay_epsilon(self):
         # Decay epsilon
         if self.epsilon > self.epsilon_min:
@@ -0,0 +1,68 @@
+import numpy as np
+import torch
+
+
+class NumpyQNetwork:
+    def __init__(self, q_network):
+        """
+        Pure-NumPy forward pass of a `QNetwork` for low-latency CPU inference.
+
+        The weight arrays are views of the torch parameters' storage, so they follow optimizer
+        steps and `load_state_dict` without any refresh.
+
+        Args:
+            q_network (QNetwork): Network whose parameters are mirrored.
+        """
+        layers = (q_network.fc1, q_network.fc2, q_network.fc3, q_network.fc4)
+        # nn.Linear stores (out, in); the transposed view lets BLAS compute x @ W^T directly
+        self.weights = [layer.weight.detach().numpy().T for layer in layers]
+        self.biases = [layer.bias.detach().numpy() for layer in layers]
+
+    def __call__(self, states):
+        """
+        Args:
+            states (np.ndarray): float32 array of shape (batch, state_size).
+
+        Returns:
+            np.ndarray: Q-values of shape (batch, action_size).
+        """
+        x = states
+        last = len(self.weights) - 1
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            x = x @ weight
+            x += bias
+            if i < last:
+                np.maximum(x, 0, out=x)
+        return x
+
+
+class TorchPolicy:
+    def __init__(self, module):
+        """Wrap a torch module (eager, scripted or compiled) behind the NumPy-in/NumPy-out interface."""
+        self.module = module
+
+    def __call__(self, states):
+        with torch.inference_mode():
+            return self.module(torch.from_numpy(states)).numpy()
+
+
+def build_policy(q_network, backend="torch"):
+    """
+    Build a NumPy-in/NumPy-out Q-value function for greedy action selection.
+
+    Args:
+        q_network (QNetwork): Network to run.
+        backend (str): "torch" (eager), "numpy", "torchscript" or "compile" (`torch.compile`).
+
+    Returns:
+        callable: Maps a float32 (batch, state_size) array to (batch, action_size) Q-values.
+    """
+    if backend == "torch":
+        return TorchPolicy(q_network)
+    if backend == "numpy":
+        return NumpyQNetwork(q_network)
+    if backend == "torchscript":
+        return TorchPolicy(torch.jit.script(q_network))
+    if backend == "compile":
+        return TorchPolicy(torch.compile(q_network))
+    raise ValueError(f"Unknown inference backend: {backend}")
@@ -0,0 +1,250 @@
+import numpy as np
+
+class ReplayBuffer:
+    def __init__(self, buffer_size, batch_size, state_size, seed=None):
+        """
+        Fixed-capacity ring buffer backed by preallocated contiguous NumPy arrays.
+
+        Inserting overwrites the oldest transition once the buffer is full. Sampling draws
+        indices uniformly (with replacement) and gathers every column with one fancy-index
+        operation, so the returned batches can be wrapped with `torch.from_numpy` without copying.
+
+        Args:
+            buffer_size (int): Maximum number of transitions kept.
+            batch_size (int): Number of transitions returned by `sample`.
+            state_size (int): Length of an observation vector.
+            seed (int): Seed of the sampling random stream.
+        """
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.state_size = state_size
+
+        self.states = np.zeros((buffer_size, state_size), dtype=np.float32)
+        self.actions = np.zeros(buffer_size, dtype=np.int64)
+        self.rewards = np.zeros(buffer_size, dtype=np.float32)
+        self.next_states = np.zeros((buffer_size, state_size), dtype=np.float32)
+        self.dones = np.zeros(buffer_size, dtype=np.float32)
+
+        self.position = 0  # Next slot to write
+        self.count = 0  # Number of valid transitions
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, experience):
+        """Insert one (state, action, reward, next_state, done) tuple in O(1)."""
+        state, action, reward, next_state, done = experience
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.position = (i + 1) % self.buffer_size
+        self.count = min(self.count + 1, self.buffer_size)
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """
+        Insert a batch of transitions, e.g. one `VectorEnvironment.step`, with a single copy per column.
+
+        Args:
+            states (np.ndarray): Array of shape (n, state_size).
+            actions (np.ndarray): Array of shape (n,).
+            rewards (np.ndarray): Array of shape (n,).
+            next_states (np.ndarray): Array of shape (n, state_size).
+            dones (np.ndarray): Array of shape (n,).
+        """
+        n = len(actions)
+        if n > self.buffer_size:
+            # Only the newest transitions would survive anyway
+            keep = slice(n - self.buffer_size, n)
+            states, actions, rewards = states[keep], actions[keep], rewards[keep]
+            next_states, dones = next_states[keep], dones[keep]
+            n = self.buffer_size
+        indices = (self.position + np.arange(n)) % self.buffer_size
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+        self.position = (self.position + n) % self.buffer_size
+        self.count = min(self.count + n, self.buffer_size)
+
+    def sample(self):
+        """
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones) arrays of `batch_size` rows.
+        """
+        indices = self.rng.integers(0, self.count, size=self.batch_size)
+        return (
+            self.states[indices],
+            self.actions[indices],
+            self.rewards[indices],
+            self.next_states[indices],
+            self.dones[indices],
+        )
+
+    def size(self):
+        return self.count
+
+    def state_dict(self):
+        """
+        Returns:
+            dict: Scalar state plus an "arrays" dict of the storage columns, which callers may save
+            as .npy files and hand back memory-mapped to `load_state_dict`.
+        """
+        return {
+            "position": self.position,
+            "count": self.count,
+            "rng": self.rng.bit_generator.state,
+            "arrays": {
+                "states": self.states,
+                "actions": self.actions,
+                "rewards": self.rewards,
+                "next_states": self.next_states,
+                "dones": self.dones,
+            },
+        }
+
+    def load_state_dict(self, state):
+        """Restore a `state_dict`; the arrays are adopted as-is (e.g. copy-on-write memory maps), not copied."""
+        arrays = state["arrays"]
+        if len(arrays["actions"]) != self.buffer_size:
+            raise ValueError(f"Buffer size mismatch: checkpoint has {len(arrays['actions'])}, buffer has {self.buffer_size}")
+        self.states = arrays["states"]
+        self.actions = arrays["actions"]
+        self.rewards = arrays["rewards"]
+        self.next_states = arrays["next_states"]
+        self.dones = arrays["dones"]
+        self.position = state["position"]
+        self.count = state["count"]
+        self.rng.bit_generator.state = state["rng"]
+
+
+class SumTree:
+    def __init__(self, capacity):
+        """
+        Binary sum tree over `capacity` leaf priorities stored in one flat array.
+
+        Node `i` has children `2i` and `2i + 1`, the root is node 1 and leaf `j` is node
+        `leaf_offset + j`. Updates and prefix-sum lookups are O(log n) and vectorized over
+        whole batches of indices.
+
+        Args:
+            capacity (int): Number of leaves (rounded up to a power of two internally).
+        """
+        self.capacity = capacity
+        self.leaf_offset = 1
+        while self.leaf_offset < capacity:
+            self.leaf_offset *= 2
+        self.depth = self.leaf_offset.bit_length() - 1
+        self.tree = np.zeros(2 * self.leaf_offset, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def get(self, indices):
+        return self.tree[self.leaf_offset + indices]
+
+    def update(self, indices, priorities):
+        """Set the priorities of the given leaves and refresh their ancestors."""
+        nodes = self.leaf_offset + np.asarray(indices)
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            # Duplicate parents just recompute the same sum, so no de-duplication is needed
+            nodes = nodes // 2
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Return, for every prefix-sum value, the leaf whose cumulative range contains it."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values > left_sum
+            values -= left_sum * go_right
+            nodes = left + go_right
+        return nodes - self.leaf_offset
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    def __init__(self, buffer_size, batch_size, state_size, alpha=0.6, beta=0.4, beta_increment=1e-4, epsilon=1e-6, seed=None):
+        """
+        Proportional prioritized experience replay (Schaul et al., 2016) on top of the ring buffer.
+
+        Transitions are sampled with probability p_i^alpha / sum_k p_k^alpha using a sum tree.
+        New transitions get the current maximum priority so each one is replayed at least once.
+
+        Args:
+            buffer_size (int): Maximum number of transitions kept.
+            batch_size (int): Number of transitions returned by `sample`.
+            state_size (int): Length of an observation vector.
+            alpha (float): How strongly priorities skew sampling (0: uniform).
+            beta (float): Initial importance-sampling correction exponent, annealed towards 1.
+            beta_increment (float): Amount added to beta after every sample.
+            epsilon (float): Added to |TD error| so no transition gets zero probability.
+            seed (int): Seed of the sampling random stream.
+        """
+        super().__init__(buffer_size, batch_size, state_size, seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(buffer_size)
+
+    def add(self, experience):
+        index = self.position
+        super().add(experience)
+        self.tree.update(np.array([index]), self.max_priority ** self.alpha)
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        n = min(len(actions), self.buffer_size)
+        indices = (self.position + np.arange(n)) % self.buffer_size
+        super().add_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(indices, self.max_priority ** self.alpha)
+
+    def sample(self):
+        """
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones, weights, indices), where `weights`
+            are the normalized importance-sampling weights and `indices` identify the sampled
+            transitions for `update_priorities`.
+        """
+        # Stratified sampling: one draw from each of batch_size equal slices of the total priority
+        total = self.tree.total()
+        segment = total / self.batch_size
+        values = (np.arange(self.batch_size) + self.rng.random(self.batch_size)) * segment
+        indices = np.minimum(self.tree.find(values), self.count - 1)
+
+        probabilities = self.tree.get(indices) / total
+        weights = (self.count * probabilities) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return (
+            self.states[indices],
+            self.actions[indices],
+            self.rewards[indices],
+            self.next_states[indices],
+            self.dones[indices],
+            weights.astype(np.float32),
+            indices,
+        )
+
+    def update_priorities(self, indices, td_errors):
+        """Set the priorities of sampled transitions from their absolute TD errors."""
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+    def state_dict(self):
+        state = super().state_dict()
+        state["beta"] = self.beta
+        state["max_priority"] = self.max_priority
+        state["arrays"]["tree"] = self.tree.tree
+        return state
+
+    def load_state_dict(self, state):
+        super().load_state_dict(state)
+        self.beta = state["beta"]
+        self.max_priority = state["max_priority"]
+        self.tree.tree = state["arrays"]["tree"]
@@ -0,0 +1,158 @@
+"""Benchmark cases registered with `benchmarks.suite`. Every case is seeded and does its setup outside the timed call."""
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from agent import DQNAgent, ReplayBuffer
+from benchmarks.suite import case
+from entities import Grenade
+from environment import Environment, SwarmEnvironment, VectorEnvironment
+from export import NumpyPolicy
+from utils import Vector
+
+STATE_SIZE = 9
+ACTION_SIZE = 3
+REPLAY_CAPACITIES = (10_000, 100_000, 1_000_000)
+
+
+@case("vector.add")
+def vector_add(seed):
+    a, b = Vector(1.5, -2.0), Vector(0.25, 3.0)
+    return (lambda: a + b), 1
+
+
+@case("vector.iadd")
+def vector_iadd(seed):
+    a, b = Vector(1.5, -2.0), Vector(0.25, 3.0)
+    return (lambda: a.iadd(b)), 1
+
+
+@case("vector.magnitude")
+def vector_magnitude(seed):
+    a = Vector(1.5, -2.0)
+    return a.magnitude, 1
+
+
+@case("grenade.update")
+def grenade_update(seed):
+    # High release point so the grenade never lands during the measurement
+    grenade = Grenade(75.0, -1e12)
+    grenade.released = True
+    wind = Vector(float(np.random.default_rng(seed).uniform(-35, 35)), 0)
+    return (lambda: grenade.update(wind, 0.1)), 1
+
+
+@case("environment.step")
+def environment_step(seed):
+    env = Environment(seed=seed)
+    env.reset()
+    actions = np.random.default_rng(seed).integers(0, 3, size=4096).tolist()
+    position = [0]
+
+    def step():
+        i = position[0] = (position[0] + 1) % len(actions)
+        _, _, done, _ = env.step(actions[i])
+        if done or env.steps >= env.max_steps:
+            env.reset()
+    return step, 1
+
+
+@case("vector_environment.step[4096]")
+def vector_environment_step(seed):
+    env = VectorEnvironment(4096, seed=seed)
+    env.reset()
+    actions = np.random.default_rng(seed).integers(0, 3, size=4096)
+    return (lambda: env.step(actions)), 4096
+
+
+def _filled_buffer(capacity, seed):
+    buffer = ReplayBuffer(capacity, 128, STATE_SIZE, seed=seed)
+    rng = np.random.default_rng(seed)
+    n = capacity
+    buffer.add_batch(rng.random((n, STATE_SIZE), dtype=np.float32), rng.integers(0, ACTION_SIZE, n),
+                     rng.random(n, dtype=np.float32), rng.random((n, STATE_SIZE), dtype=np.float32), np.zeros(n))
+    return buffer
+
+
+def _register_replay_cases(capacity):
+    @case(f"replay.add[{capacity}]")
+    def replay_add(seed):
+        buffer = _filled_buffer(capacity, seed)
+        experience = (list(range(STATE_SIZE)), 1, -0.2, list(range(STATE_SIZE)), False)
+        return (lambda: buffer.add(experience)), 1
+
+    @case(f"replay.sample[{capacity}]")
+    def replay_sample(seed):
+        buffer = _filled_buffer(capacity, seed)
+        return buffer.sample, 1
+
+
+for _capacity in REPLAY_CAPACITIES:
+    _register_replay_cases(_capacity)
+
+
+@case("agent.act")
+def agent_act(seed):
+    agent = DQNAgent(STATE_SIZE, ACTION_SIZE, seed=seed)
+    state = np.random.default_rng(seed).random(STATE_SIZE).tolist()
+    return (lambda: agent.act(state, greedy=True)), 1
+
+
+@case("agent.act_batch[1024]")
+def agent_act_batch(seed):
+    agent = DQNAgent(STATE_SIZE, ACTION_SIZE, seed=seed)
+    states = np.random.default_rng(seed).random((1024, STATE_SIZE), dtype=np.float32)
+    return (lambda: agent.act_batch(states, greedy_mask=True)), 1024
+
+
+@case("export.act[numpy]")
+def export_act(seed):
+    agent = DQNAgent(STATE_SIZE, ACTION_SIZE, seed=seed)
+    layers = (agent.q_network.fc1, agent.q_network.fc2, agent.q_network.fc3, agent.q_network.fc4)
+    policy = NumpyPolicy([layer.weight.detach().numpy().T for layer in layers],
+                         [layer.bias.detach().numpy() for layer in layers])
+    state = np.random.default_rng(seed).random(STATE_SIZE).tolist()
+    return (lambda: policy.act(state)), 1
+
+
+@case("agent.train")
+def agent_train(seed):
+    agent = DQNAgent(STATE_SIZE, ACTION_SIZE, seed=seed)
+    agent.replay_buffer = _filled_buffer(agent.replay_buffer.buffer_size, seed)
+    return agent._update, 1
+
+
+@case("swarm_environment.step[1000]")
+def swarm_environment_step(seed):
+    # 1000 drones and 250 targets; ops are drone-steps so the rate is comparable with the vector case
+    env = SwarmEnvironment(1000, 250, max_steps=None, seed=seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    actions = [np.where(rng.random(1000) < 0.05, 2, rng.integers(0, 2, size=1000)) for _ in range(16)]
+    position = [0]
+
+    def step():
+        i = position[0] = (position[0] + 1) % len(actions)
+        _, _, done, _ = env.step(actions[i])
+        if done:
+            env.reset()
+    return step, 1000
+
+
+def _cli_startup(arguments):
+    # Cold start of a fresh interpreter, so import costs are included in every call
+    main_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    command = [sys.executable, main_path, *arguments]
+    return (lambda: subprocess.run(command, stdout=subprocess.DEVNULL, check=True)), 1
+
+
+@case("cli.startup[--help]")
+def cli_startup_help(seed):
+    return _cli_startup(["--help"])
+
+
+@case("cli.startup[eval --help]")
+def cli_startup_eval_help(seed):
+    return _cli_startup(["eval", "--help"])
@@ -0,0 +1,78 @@
+"""
+Headless training speed with and without coasting through the ballistic phase.
+
+Coasting makes episodes much shorter in agent steps, so a cold agent would spend a short run
+below `batch_size` transitions and never update. Both configurations therefore start from a
+replay buffer warmed with random play, so every timed agent step runs a gradient update, and the
+rows compare the same learning work. The env-only rows time the environment alone on random
+actions, isolating what coasting itself saves per simulated step.
+
+Run from the 2D directory:
+    python -m benchmarks.coast --episodes 200
+"""
+import argparse
+import time
+
+import numpy as np
+
+from agent import DQNAgent
+from benchmarks.common import run_training
+from environment import Environment
+
+
+def warm_up(agent, env, rng):
+    """Fill the replay buffer with random-action transitions until it holds one batch."""
+    state = env.reset()
+    while agent.replay_buffer.size() < agent.replay_buffer.batch_size:
+        action = int(rng.integers(3))
+        next_state, reward, done, _ = env.step(action)
+        agent.replay_buffer.add((state, action, reward, next_state, done))
+        state = env.reset() if done else next_state
+
+
+def time_environment(env, episodes, rng, max_episode_steps=200):
+    """Random-action episodes with no agent; returns (agent steps, simulated env steps, seconds)."""
+    agent_steps = env_steps = 0
+    start = time.perf_counter()
+    for _ in range(episodes):
+        env.reset()
+        done = False
+        steps = 0
+        while not done and steps <= max_episode_steps:
+            _, _, done, info = env.step(int(rng.integers(3)))
+            steps += info.get("steps", 1)
+            agent_steps += 1
+        env_steps += steps
+    return agent_steps, env_steps, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--episodes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("Training (buffer warmed, one update per agent step):")
+    for coast in (False, True):
+        agent = DQNAgent(9, 3, seed=args.seed)
+        env = Environment(coast=coast, coast_gamma=agent.gamma, seed=args.seed)
+        warm_up(agent, env, np.random.default_rng(args.seed))
+        calls_before, updates_before = agent.train_calls, agent.updates
+        result = run_training(agent, args.episodes, env=env)
+        agent_steps = agent.train_calls - calls_before
+        updates = agent.updates - updates_before
+        print(f"  coast={str(coast):5s} {args.episodes / result['seconds']:8.1f} episodes/sec  "
+              f"{agent_steps:7d} agent steps  {updates:7d} updates  {result['env_steps']:7d} env steps  "
+              f"{result['seconds'] / agent_steps * 1e6:7.0f} us/agent step  "
+              f"{result['seconds'] / result['env_steps'] * 1e6:7.0f} us/env step")
+
+    print("Environment only (random actions):")
+    for coast in (False, True):
+        env = Environment(coast=coast, seed=args.seed)
+        agent_steps, env_steps, seconds = time_environment(env, args.episodes, np.random.default_rng(args.seed))
+        print(f"  coast={str(coast):5s} {args.episodes / seconds:8.1f} episodes/sec  {agent_steps:7d} agent steps  "
+              f"{env_steps:7d} env steps  {seconds / env_steps * 1e6:7.2f} us/env step")
+
+
+if __name__ == "__main__":
+    main()
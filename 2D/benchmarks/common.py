@@ -0,0 +1,55 @@
+"""Helpers shared by the training benchmarks."""
+import time
+
+from environment import Environment
+
+HIT_REWARD = 1000
+
+
+def is_hit(env):
+    """True if the grenade of the scalar environment landed on the target."""
+    return env.grenade.hit_ground and env._calculate_reward() == HIT_REWARD
+
+
+def run_training(agent, episodes, env=None, max_episode_steps=200, seed=None):
+    """
+    Headless copy of the `Trainer` loop.
+
+    Returns:
+        dict: episodes, env steps, wall-clock seconds, per-episode rewards and the
+        1-based episode of the first target hit (None if there was none).
+    """
+    env = env or Environment(seed=seed)
+    rewards = []
+    first_hit = None
+    env_steps = 0
+    start = time.perf_counter()
+    for episode in range(episodes):
+        state = env.reset()
+        total_reward = 0
+        done = False
+        steps = 0
+        while not done:
+            action = agent.act(state)
+            next_state, reward, done, info = env.step(action)
+            agent.replay_buffer.add((state, action, reward, next_state, done))
+            agent.train()
+            state = next_state
+            total_reward += reward
+            steps += info.get("steps", 1)
+            if done and first_hit is None and is_hit(env):
+                first_hit = episode + 1
+            if steps > max_episode_steps:
+                done = True
+                total_reward += -1000
+        env_steps += steps
+        if (episode + 1) % 2 == 0:
+            agent.decay_epsilon()
+        rewards.append(total_reward)
+    return {
+        "episodes": episodes,
+        "env_steps": env_steps,
+        "seconds": time.perf_counter() - start,
+        "rewards": rewards,
+        "first_hit": first_hit,
+    }
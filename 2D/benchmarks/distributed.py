@@ -0,0 +1,32 @@
+"""
+Aggregate env steps/sec of `DistributedTrainer` as the number of rollout workers grows.
+
+Run from the 2D directory:
+    python -m benchmarks.distributed --workers 1 2 4 --duration 20
+"""
+import argparse
+import tempfile
+
+from training import DistributedTrainer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per configuration")
+    parser.add_argument("--sync-interval", type=int, default=100)
+    args = parser.parse_args()
+
+    baseline = None
+    for num_workers in args.workers:
+        with tempfile.TemporaryDirectory() as save_dir:
+            trainer = DistributedTrainer(9, 3, num_workers=num_workers, sync_interval=args.sync_interval,
+                                         episodes=10**9, save_dir=save_dir, report_interval=float("inf"))
+            stats = trainer.run(duration=args.duration)
+        baseline = baseline or stats["env_steps_per_sec"]
+        print(f"{num_workers:3d} workers: {stats['env_steps_per_sec']:10,.0f} env steps/sec "
+              f"({stats['env_steps_per_sec'] / baseline:.2f}x)  {stats['updates_per_sec']:8,.0f} updates/sec")
+
+
+if __name__ == "__main__":
+    main()
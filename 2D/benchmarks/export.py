@@ -0,0 +1,67 @@
+"""
+Greedy action latency and throughput of exported artifacts against eager `DQNAgent.act(greedy=True)`.
+
+Every artifact is also checked for action agreement with the checkpoint on visited states.
+
+Run from the 2D directory:
+    python -m benchmarks.export [--model brains/model_episode_2000.pth]
+"""
+import argparse
+import os
+import tempfile
+import warnings
+
+import numpy as np
+import torch
+
+from agent import DQNAgent
+from benchmarks.inference import time_call
+from export import check_parity, export_checkpoint, load_policy, sample_states
+
+ARTIFACTS = (("numpy", ".npz", False), ("numpy int8", ".npz", True),
+             ("torchscript", ".pt", False), ("torchscript int8", ".pt", True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="Checkpoint to export (default: a freshly initialized network)")
+    parser.add_argument("--batch-size", type=int, default=1024, help="Batch of the throughput measurement")
+    parser.add_argument("--parity-states", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5000)
+    args = parser.parse_args()
+    torch.set_num_threads(1)
+    warnings.filterwarnings("ignore", category=FutureWarning)
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = args.model
+        if model_path is None:
+            model_path = os.path.join(directory, "model.pth")
+            torch.save(DQNAgent(9, 3, seed=0).q_network.state_dict(), model_path)
+        agent = DQNAgent(9, 3)
+        agent.q_network.load_state_dict(torch.load(model_path))
+        agent.q_network.eval()
+
+        states = sample_states(max(args.parity_states, args.batch_size))
+        state = states[0].tolist()  # What the training loop hands to act()
+        batch = states[:args.batch_size]
+
+        eager_latency = time_call(lambda: agent.act(state, greedy=True), args.repeats)
+        eager_batch = time_call(lambda: agent.act_batch(batch, greedy_mask=True), args.repeats // 10)
+        print(f"{'artifact':18s} {'bytes':>8s} {'agreement':>10s} {'max |dQ|':>9s} "
+              f"{'act us':>8s} {'speedup':>8s} {f'states/s @{args.batch_size}':>16s}")
+        print(f"{'eager act':18s} {'':>8s} {'':>10s} {'':>9s} {eager_latency * 1e6:8.1f} {1.0:7.2f}x "
+              f"{args.batch_size / eager_batch:16,.0f}")
+        for name, extension, quantize in ARTIFACTS:
+            path = os.path.join(directory, name.replace(" ", "_") + extension)
+            metadata = export_checkpoint(model_path, path, quantize=quantize)
+            parity = check_parity(model_path, path, states=states[:args.parity_states])
+            policy = load_policy(path)
+            latency = time_call(lambda: policy.act(state), args.repeats)
+            batch_latency = time_call(lambda: policy.act_batch(batch), args.repeats // 10)
+            print(f"{name:18s} {metadata['bytes']:8,d} {parity['agreement']:10.4%} {parity['max_abs_error']:9.2e} "
+                  f"{latency * 1e6:8.1f} {eager_latency / latency:7.2f}x {args.batch_size / batch_latency:16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Per-step latency and allocation count of `Grenade.update`, against the previous Vector-operator implementation.
+
+Run from the 2D directory:
+    python -m benchmarks.grenade_update --steps 200000
+"""
+import argparse
+import time
+
+from constants import AIR_DENSITY, HEIGHT
+from entities import Grenade
+from utils import Vector
+
+
+def legacy_update(grenade, wind, dt):
+    """The operator-based update `Grenade.update` used before the float rewrite, kept as the reference."""
+    if grenade.released and not grenade.hit_ground:
+        gravitational_force = grenade._calculate_gravity_force()
+        relative_velocity = grenade.velocity - wind
+        if relative_velocity.magnitude() > 0:
+            drag_force = (
+                relative_velocity.normalize() * -0.5 * AIR_DENSITY * grenade.drag_coefficient * grenade.cross_sectional_area *
+                relative_velocity.magnitude_squared()
+            )
+        else:
+            drag_force = Vector(0, 0)
+        net_force = gravitational_force + drag_force
+        acceleration = net_force / grenade.mass
+        grenade.velocity += acceleration * dt
+        if grenade.velocity.magnitude() > grenade.terminal_velocity:
+            grenade.velocity = grenade.velocity.normalize() * grenade.terminal_velocity
+        grenade.coordinates += grenade.velocity * dt
+        if grenade.coordinates.y >= HEIGHT:
+            grenade.coordinates.y = HEIGHT
+            grenade.velocity.y = 0
+            grenade.hit_ground = True
+
+
+def _falling_grenade():
+    # Start far above the ground so no step in the measurement ends the fall
+    grenade = Grenade(75.0, -1e9)
+    grenade.released = True
+    return grenade
+
+
+def measure(update, steps, dt=0.1):
+    wind = Vector(12.5, 0)
+
+    grenade = _falling_grenade()
+    start = time.perf_counter()
+    for _ in range(steps):
+        update(grenade, wind, dt)
+    return (time.perf_counter() - start) / steps
+
+
+def count_temporaries(update, steps=1000, dt=0.1):
+    """Count Vector constructions per step by wrapping Vector.__init__."""
+    wind = Vector(12.5, 0)
+    grenade = _falling_grenade()
+    created = [0]
+    original_init = Vector.__init__
+
+    def counting_init(self, x=0.0, y=0.0):
+        created[0] += 1
+        original_init(self, x, y)
+
+    Vector.__init__ = counting_init
+    try:
+        for _ in range(steps):
+            update(grenade, wind, dt)
+    finally:
+        Vector.__init__ = original_init
+    return created[0] / steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=200000)
+    args = parser.parse_args()
+
+    cases = [
+        ("legacy", legacy_update),
+        ("current", lambda grenade, wind, dt: grenade.update(wind, dt)),
+    ]
+    for name, update in cases:
+        latency = measure(update, args.steps)
+        vectors = count_temporaries(update)
+        print(f"{name:8s} {latency * 1e9:8.0f} ns/step  {vectors:5.1f} Vectors allocated/step")
+
+
+if __name__ == "__main__":
+    main()
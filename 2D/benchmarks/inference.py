@@ -0,0 +1,59 @@
+"""
+Greedy action latency of `DQNAgent` for each inference backend at several batch sizes.
+
+Run from the 2D directory:
+    python -m benchmarks.inference --backends torch numpy torchscript
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import torch
+
+from agent import DQNAgent
+
+
+def legacy_act(agent, state):
+    """The single-state path `DQNAgent.act` used before act_batch: autograd on, list-to-tensor conversion."""
+    state = torch.FloatTensor(state).unsqueeze(0)
+    q_values = agent.q_network(state)
+    return torch.argmax(q_values).item()
+
+
+def time_call(function, repeats, warmup=20):
+    for _ in range(warmup):
+        function()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch", "numpy", "torchscript"],
+                        help="Any of torch, numpy, torchscript, compile")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1024])
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+    torch.set_num_threads(1)
+    warnings.filterwarnings("ignore", category=FutureWarning)
+
+    agent = DQNAgent(9, 3)
+    rng = np.random.default_rng(0)
+    state = rng.random(9).tolist()
+    latency = time_call(lambda: legacy_act(agent, state), args.repeats)
+    print(f"{'legacy act':12s} batch {1:5d}: {latency * 1e6:9.1f} us/call {latency * 1e6:8.2f} us/state")
+
+    for backend in args.backends:
+        agent.set_inference_backend(backend)
+        for batch_size in args.batch_sizes:
+            states = rng.random((batch_size, 9), dtype=np.float32)
+            latency = time_call(lambda: agent.act_batch(states, greedy_mask=True), args.repeats)
+            print(f"{backend:12s} batch {batch_size:5d}: {latency * 1e6:9.1f} us/call "
+                  f"{latency * 1e6 / batch_size:8.2f} us/state")
+
+
+if __name__ == "__main__":
+    main()
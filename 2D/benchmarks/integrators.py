@@ -0,0 +1,58 @@
+"""
+Landing accuracy versus speed of each grenade integrator over a sweep of wind values and time steps.
+
+The reference trajectory is adaptive RK45 with tight tolerances, a small dt and exact ground contact.
+
+Run from the 2D directory:
+    python -m benchmarks.integrators --dts 0.05 0.1 0.25 0.5
+"""
+import argparse
+import time
+
+import numpy as np
+
+from constants import WIND_FORCE_MAX
+from entities import Grenade
+from entities.integrators import INTEGRATORS
+from utils import Vector
+
+RELEASE_Y = 50.0  # 140 m fall
+
+
+def drop(wind, dt, **grenade_kwargs):
+    grenade = Grenade(0.0, RELEASE_Y, **grenade_kwargs)
+    grenade.released = True
+    wind = Vector(wind, 0)
+    steps = 0
+    while not grenade.hit_ground:
+        grenade.update(wind, dt)
+        steps += 1
+    return grenade.coordinates.x, grenade.flight_time, steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dts", type=float, nargs="+", default=[0.05, 0.1, 0.25, 0.5])
+    parser.add_argument("--winds", type=int, default=15, help="Number of wind values in the sweep")
+    args = parser.parse_args()
+
+    winds = np.linspace(-WIND_FORCE_MAX, WIND_FORCE_MAX, args.winds)
+    reference = [drop(w, 0.01, integrator="rk45", exact_contact=True, rtol=1e-10, atol=1e-12) for w in winds]
+
+    print(f"{'integrator':20s} {'contact':7s} {'dt':>5s} {'max |dx| m':>11s} {'max |dt| s':>11s} {'steps/sec':>11s} {'drops/sec':>10s}")
+    for dt in args.dts:
+        for integrator in INTEGRATORS:
+            for exact_contact in (False, True):
+                start = time.perf_counter()
+                results = [drop(w, dt, integrator=integrator, exact_contact=exact_contact) for w in winds]
+                elapsed = time.perf_counter() - start
+                steps = sum(r[2] for r in results)
+                x_error = max(abs(r[0] - ref[0]) for r, ref in zip(results, reference))
+                t_error = max(abs(r[1] - ref[1]) for r, ref in zip(results, reference))
+                contact = "exact" if exact_contact else "clamp"
+                print(f"{integrator:20s} {contact:7s} {dt:5.2f} {x_error:11.4f} {t_error:11.4f} "
+                      f"{steps / elapsed:11,.0f} {len(winds) / elapsed:10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
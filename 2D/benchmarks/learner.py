@@ -0,0 +1,69 @@
+"""
+Learner FLOPs per env step and wall-clock to a reward level for several training schedules.
+
+Run from the 2D directory:
+    python -m benchmarks.learner --episodes 400 --reward -150
+"""
+import argparse
+
+import numpy as np
+
+from agent import DQNAgent
+from benchmarks.common import run_training
+
+CONFIGS = {
+    "every step, no target": dict(target_update_interval=None),
+    "every step, hard target": dict(target_update_interval=500),
+    "every 4 steps, hard target": dict(train_every=4, target_update_interval=250),
+    "every 4 steps, polyak": dict(train_every=4, tau=0.01),
+    "every 4 steps x2, double": dict(train_every=4, gradient_steps=2, target_update_interval=250, double_dqn=True),
+}
+
+
+def forward_flops(network):
+    """Multiply-adds of one forward pass for a single sample, counted as 2 FLOPs each."""
+    return sum(2 * layer.in_features * layer.out_features for layer in (network.fc1, network.fc2, network.fc3, network.fc4))
+
+
+def flops_per_update(agent):
+    batch = agent.replay_buffer.batch_size
+    forward = forward_flops(agent.q_network) * batch
+    # Online forward + backward (~2x forward) on states, one bootstrap forward, one more for double DQN
+    flops = 4 * forward
+    if agent.double_dqn:
+        flops += forward
+    return flops
+
+
+def seconds_to_reward(result, reward, window=20):
+    """Wall-clock until the moving average of episode rewards first reaches `reward` (scaled by episode share)."""
+    rewards = np.asarray(result["rewards"])
+    if len(rewards) < window:
+        return None
+    moving = np.convolve(rewards, np.ones(window) / window, mode="valid")
+    reached = np.nonzero(moving >= reward)[0]
+    if len(reached) == 0:
+        return None
+    episode = reached[0] + window
+    return result["seconds"] * episode / len(rewards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--episodes", type=int, default=400)
+    parser.add_argument("--reward", type=float, default=-150.0, help="Moving-average reward to time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for name, config in CONFIGS.items():
+        agent = DQNAgent(9, 3, seed=args.seed, **config)
+        result = run_training(agent, args.episodes, seed=args.seed)
+        flops_per_step = flops_per_update(agent) * agent.updates / result["env_steps"]
+        to_reward = seconds_to_reward(result, args.reward)
+        to_reward = f"{to_reward:.1f} s" if to_reward is not None else "not reached"
+        print(f"{name:28s} {flops_per_step / 1e6:7.2f} MFLOP/env step  {agent.updates:7d} updates  "
+              f"{result['seconds']:6.1f} s total  reward {args.reward:g}: {to_reward}")
+
+
+if __name__ == "__main__":
+    main()
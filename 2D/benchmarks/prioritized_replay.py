@@ -0,0 +1,50 @@
+"""
+Episodes-to-first-hit and wall-clock of uniform versus prioritized replay.
+
+Run from the 2D directory:
+    python -m benchmarks.prioritized_replay --episodes 300 --seeds 0 1 2
+"""
+import argparse
+import time
+
+import numpy as np
+
+from agent import DQNAgent, PrioritizedReplayBuffer, ReplayBuffer
+from benchmarks.common import run_training
+
+
+def sampling_throughput(buffer_class, capacity, batches=2000):
+    buffer = buffer_class(capacity, 128, 9)
+    rng = np.random.default_rng(0)
+    n = capacity
+    buffer.add_batch(rng.random((n, 9)), rng.integers(0, 3, n), rng.random(n), rng.random((n, 9)), np.zeros(n))
+    start = time.perf_counter()
+    for _ in range(batches):
+        batch = buffer.sample()
+        if buffer_class is PrioritizedReplayBuffer:
+            buffer.update_priorities(batch[-1], rng.random(128))
+    return batches / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--episodes", type=int, default=300)
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    args = parser.parse_args()
+
+    for capacity in (2000, 100_000, 1_000_000):
+        uniform = sampling_throughput(ReplayBuffer, capacity)
+        prioritized = sampling_throughput(PrioritizedReplayBuffer, capacity)
+        print(f"capacity {capacity:>9,}: uniform {uniform:8,.0f} batches/sec, prioritized {prioritized:8,.0f} batches/sec")
+
+    for prioritized in (False, True):
+        name = "prioritized" if prioritized else "uniform"
+        for seed in args.seeds:
+            agent = DQNAgent(9, 3, prioritized=prioritized, seed=seed)
+            result = run_training(agent, args.episodes, seed=seed)
+            print(f"{name:12s} seed {seed}: first hit at episode {result['first_hit']}, "
+                  f"{result['seconds']:.1f} s, mean reward (last 50) {np.mean(result['rewards'][-50:]):.1f}")
+
+
+if __name__ == "__main__":
+    main()
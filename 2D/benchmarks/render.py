@@ -0,0 +1,78 @@
+"""
+Steps/sec of the scalar `Environment` headless versus rendered.
+
+Run from the 2D directory:
+    python -m benchmarks.render --steps 2000
+
+The video measurement encodes with ffmpeg when it is on PATH and writes PNG frames otherwise.
+
+Windowed rendering needs a display; set SDL_VIDEODRIVER=dummy to measure it without one.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from environment import Environment
+
+
+def steps_per_second(env, steps, render, seed=0):
+    actions = np.random.default_rng(seed).integers(0, 3, size=steps).tolist()
+    env.reset()
+    start = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if render:
+            env.render()
+            env.process_events()
+        if done or env.steps >= env.max_steps:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    env.close()
+    return steps / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--no-window", action="store_true", help="Skip the windowed measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    seed = args.seed
+
+    headless = steps_per_second(Environment(seed=seed), args.steps, render=False, seed=seed)
+    print(f"headless:           {headless:12,.0f} steps/sec")
+    print(f"pygame loaded:      {'pygame' in sys.modules}")
+
+    env = Environment(renderMode=True, offscreen=True, seed=seed)
+    offscreen = steps_per_second(env, args.steps, render=True, seed=seed)
+    print(f"offscreen render:   {offscreen:12,.0f} steps/sec")
+
+    env = Environment(renderMode=True, offscreen=True, render_fps=2, seed=seed)
+    decimated = steps_per_second(env, args.steps, render=True, seed=seed)
+    print(f"offscreen @ 2 fps:  {decimated:12,.0f} steps/sec")
+
+    dump_steps = max(args.steps // 10, 1)
+    for frame_format in ("png", "bmp"):
+        with tempfile.TemporaryDirectory() as frame_dir:
+            env = Environment(renderMode=True, offscreen=True, frame_dir=frame_dir, frame_format=frame_format,
+                              seed=seed)
+            dumped = steps_per_second(env, dump_steps, render=True, seed=seed)
+        print(f"offscreen + {frame_format}:   {dumped:12,.0f} steps/sec")
+
+    with tempfile.TemporaryDirectory() as video_dir:
+        env = Environment(renderMode=True, offscreen=True, video_path=os.path.join(video_dir, "run.mp4"), render_fps=5,
+                          seed=seed)
+        recorded = steps_per_second(env, dump_steps, render=True, seed=seed)
+    print(f"video @ 5 fps:      {recorded:12,.0f} steps/sec")
+
+    if not args.no_window:
+        windowed = steps_per_second(Environment(renderMode=True, seed=seed), args.steps, render=True, seed=seed)
+        print(f"windowed render:    {windowed:12,.0f} steps/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Latency and throughput of the local policy server against every client running its own model.
+
+Each client process sends one greedy-action request at a time for a fixed duration; the server
+coalesces concurrent requests into micro-batches.
+
+Run from the 2D directory:
+    python -m benchmarks.serving [--clients 1 4 16] [--max-wait-ms 0.5 2]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from export import sample_states
+
+
+def _serve(model_path, socket_path, max_wait):
+    from serving import PolicyServer
+
+    PolicyServer(model_path, socket_path=socket_path, max_wait=max_wait, reload_interval=0, report_interval=0).run()
+
+
+def _client(socket_path, states, duration, ready, results):
+    from serving import PolicyClient
+
+    with PolicyClient(socket_path) as client:
+        ready.wait()
+        latencies = []
+        end = time.perf_counter() + duration
+        i = 0
+        while time.perf_counter() < end:
+            state = states[i % len(states)]
+            start = time.perf_counter()
+            client.act(state)
+            latencies.append(time.perf_counter() - start)
+            i += 1
+    results.put(latencies)
+
+
+def _local(model_path, states, duration, ready, results):
+    import torch
+
+    from agent import DQNAgent
+
+    torch.set_num_threads(1)
+    agent = DQNAgent(9, 3)
+    agent.q_network.load_state_dict(torch.load(model_path))
+    agent.q_network.eval()
+    ready.wait()
+    latencies = []
+    end = time.perf_counter() + duration
+    i = 0
+    while time.perf_counter() < end:
+        state = states[i % len(states)].tolist()
+        start = time.perf_counter()
+        agent.act(state, greedy=True)
+        latencies.append(time.perf_counter() - start)
+        i += 1
+    results.put(latencies)
+
+
+def run_clients(ctx, target, args, clients, duration):
+    """Run `clients` processes of `target` together; returns (requests/sec, p50 us, p99 us)."""
+    results = ctx.Queue()
+    ready = ctx.Barrier(clients)  # Clocks start once every client has loaded or connected
+    processes = [ctx.Process(target=target, args=(*args, duration, ready, results)) for _ in range(clients)]
+    for process in processes:
+        process.start()
+    latencies = np.concatenate([results.get() for _ in processes])
+    for process in processes:
+        process.join()
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+    return len(latencies) / duration, p50, p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--max-wait-ms", type=float, nargs="+", default=[0.5, 2.0])
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds of requests per measurement")
+    args = parser.parse_args()
+
+    import torch
+
+    from agent import DQNAgent
+    from serving import PolicyClient
+
+    ctx = mp.get_context("spawn")
+    states = sample_states(4096)
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, "model_episode_1.pth")
+        torch.save(DQNAgent(9, 3, seed=0).q_network.state_dict(), model_path)
+        print(f"{'setup':28s} {'clients':>7s} {'requests/s':>11s} {'p50 us':>8s} {'p99 us':>8s} {'mean batch':>10s}")
+        for clients in args.clients:
+            rate, p50, p99 = run_clients(ctx, _local, (model_path, states), clients, args.duration)
+            print(f"{'own eager model per client':28s} {clients:7d} {rate:11,.0f} {p50:8.0f} {p99:8.0f} {'':>10s}")
+        for max_wait_ms in args.max_wait_ms:
+            socket_path = os.path.join(directory, "policy.sock")
+            server = ctx.Process(target=_serve, args=(model_path, socket_path, max_wait_ms / 1e3))
+            server.start()
+            while not os.path.exists(socket_path):
+                time.sleep(0.05)
+            for clients in args.clients:
+                with PolicyClient(socket_path) as client:
+                    before = client.stats()
+                rate, p50, p99 = run_clients(ctx, _client, (socket_path, states), clients, args.duration)
+                with PolicyClient(socket_path) as client:
+                    after = client.stats()
+                batch = (after["states"] - before["states"]) / max(after["batches"] - before["batches"], 1)
+                print(f"{f'server, max wait {max_wait_ms:g} ms':28s} {clients:7d} {rate:11,.0f} {p50:8.0f} "
+                      f"{p99:8.0f} {batch:10.1f}")
+            server.terminate()
+            server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Benchmark registry, runner and regression comparison.
+
+Run from the 2D directory:
+    python -m benchmarks run --output results.json [--filter replay] [--repeats 5]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.10]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+CASES = {}
+
+
+def case(name):
+    """
+    Register a benchmark case.
+
+    The decorated function receives a seed and returns `(operation, ops_per_call)`: a zero-argument
+    callable that performs the measured work, and how many operations (steps, samples, updates...)
+    one call counts for. Everything outside `operation` is setup and is not timed.
+    """
+    def register(function):
+        CASES[name] = function
+        return function
+    return register
+
+
+def measure(operation, ops_per_call, repeats=5, warmup=0.2, min_time=0.2):
+    """
+    Time `operation` after a warmup, calibrating the number of calls per repeat to last at least `min_time`.
+
+    Returns:
+        dict: Median/min/max operations per second and the per-repeat values.
+    """
+    calls = 1
+    deadline = time.perf_counter() + warmup
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time and time.perf_counter() >= deadline:
+            break
+        if elapsed < min_time:
+            calls = max(calls * 2, int(calls * min_time / max(elapsed, 1e-9)))
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            operation()
+        runs.append(calls * ops_per_call / (time.perf_counter() - start))
+    return {
+        "ops_per_sec": statistics.median(runs),
+        "min": min(runs),
+        "max": max(runs),
+        "runs": runs,
+        "calls_per_repeat": calls,
+    }
+
+
+def _metadata():
+    import numpy
+    import torch
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "torch": torch.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def run(names, repeats=5, seed=0, output=None):
+    import benchmarks.cases  # noqa: F401  Registers the cases
+    import torch
+
+    torch.set_num_threads(1)  # Single-threaded numbers are comparable across machines
+    results = {}
+    for name in sorted(CASES):
+        if names and not any(pattern in name for pattern in names):
+            continue
+        operation, ops_per_call = CASES[name](seed)
+        results[name] = measure(operation, ops_per_call, repeats=repeats)
+        print(f"{name:36s} {results[name]['ops_per_sec']:14,.1f} ops/sec")
+    report = {"meta": _metadata(), "seed": seed, "repeats": repeats, "results": results}
+    if output:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {output}")
+    return report
+
+
+def compare(baseline_path, current_path, threshold=0.10):
+    """
+    Flag cases whose median throughput dropped by more than `threshold` relative to the baseline.
+
+    Returns:
+        bool: True if no regression was found.
+    """
+    with open(baseline_path) as file:
+        baseline = json.load(file)["results"]
+    with open(current_path) as file:
+        current = json.load(file)["results"]
+    ok = True
+    print(f"{'case':36s} {'baseline':>14s} {'current':>14s} {'change':>8s}")
+    for name in sorted(set(baseline) | set(current)):
+        if name not in baseline or name not in current:
+            print(f"{name:36s} {'missing in ' + ('baseline' if name not in baseline else 'current'):>38s}")
+            continue
+        before = baseline[name]["ops_per_sec"]
+        after = current[name]["ops_per_sec"]
+        change = after / before - 1
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            ok = False
+        elif change > threshold:
+            flag = "  improved"
+        print(f"{name:36s} {before:14,.1f} {after:14,.1f} {change:+8.1%}{flag}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmark cases")
+    run_parser.add_argument("--filter", nargs="*", default=[], help="Only run cases whose name contains one of these")
+    run_parser.add_argument("--repeats", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", help="JSON file for the results")
+    run_parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.list:
+            import benchmarks.cases  # noqa: F401
+
+            print("\n".join(sorted(CASES)))
+            return 0
+        run(args.filter, repeats=args.repeats, seed=args.seed, output=args.output)
+        return 0
+    return 0 if compare(args.baseline, args.current, args.threshold) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Step cost of `SwarmEnvironment` as the scene grows, and grid versus all-pairs impact matching.
+
+Run from the 2D directory:
+    python -m benchmarks.swarm --sizes 100 1000 10000 100000
+
+Every scene has one target per four drones and three grenades per drone; drones drop with
+probability 5% per step, so the grenade pool stays busy. Near-linear scaling shows up as a
+roughly constant cost per entity.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from environment.swarm_environment import SwarmEnvironment, TargetGrid
+
+
+def step_time(num_drones, steps, seed=0):
+    """Mean seconds per `step` over `steps` steps (scenes are reset as they finish)."""
+    env = SwarmEnvironment(num_drones, max(num_drones // 4, 1), max_steps=None, seed=seed)
+    rng = np.random.default_rng(seed)
+    actions = [np.where(rng.random(num_drones) < 0.05, 2, rng.integers(0, 2, size=num_drones)) for _ in range(16)]
+    env.reset()
+    start = time.perf_counter()
+    for i in range(steps):
+        _, _, done, _ = env.step(actions[i % len(actions)])
+        if done:
+            env.reset()
+    return (time.perf_counter() - start) / steps
+
+
+def matching_time(num_impacts, num_targets, repeats=20, seed=0):
+    """Seconds per nearest-target query batch with the grid and with all-pairs distances."""
+    rng = np.random.default_rng(seed)
+    targets = rng.uniform(40, 110, num_targets)
+    impacts = rng.uniform(0, 150, num_impacts)
+    grid = TargetGrid()
+    grid.build(targets, np.arange(num_targets))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        grid.nearest(impacts)
+    grid_time = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        np.abs(impacts[:, None] - targets[None, :]).argmin(axis=1)
+    pairs_time = (time.perf_counter() - start) / repeats
+    return grid_time, pairs_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000], help="Drone counts")
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'drones':>8} {'targets':>8} {'us/step':>10} {'ns/entity':>10}")
+    for num_drones in args.sizes:
+        seconds = step_time(num_drones, args.steps)
+        entities = num_drones + num_drones // 4
+        print(f"{num_drones:>8} {num_drones // 4:>8} {seconds * 1e6:>10.1f} {seconds * 1e9 / entities:>10.1f}")
+
+    print(f"\n{'impacts':>8} {'targets':>8} {'grid us':>10} {'pairs us':>10}")
+    for size in (100, 1000, 10000):
+        grid_time, pairs_time = matching_time(size, size)
+        print(f"{size:>8} {size:>8} {grid_time * 1e6:>10.1f} {pairs_time * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
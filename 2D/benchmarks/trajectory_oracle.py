@@ -0,0 +1,83 @@
+"""
+Accuracy and speed of `TrajectoryOracle` against step-by-step `Grenade.update` integration,
+and the hit rate of the oracle's baseline policy.
+
+Run from the 2D directory:
+    python -m benchmarks.trajectory_oracle --queries 2000 --episodes 500
+"""
+import argparse
+import time
+
+import numpy as np
+
+from constants import HEIGHT, WIND_FORCE_MAX
+from entities import Grenade
+from environment import Environment, TrajectoryOracle
+from utils import Vector
+
+
+def integrate(release_y, wind, dt):
+    grenade = Grenade(0.0, release_y)
+    grenade.released = True
+    wind = Vector(wind, 0)
+    steps = 0
+    while not grenade.hit_ground:
+        grenade.update(wind, dt)
+        steps += 1
+    return grenade.coordinates.x, steps * dt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--episodes", type=int, default=500)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    oracle = TrajectoryOracle()
+    print(f"Table build: {time.perf_counter() - start:.2f} s for {oracle.offsets.size:,} grid points")
+
+    rng = np.random.default_rng(0)
+    release_y = rng.uniform(1, HEIGHT // 2 + 1, args.queries)
+    winds = rng.uniform(-WIND_FORCE_MAX, WIND_FORCE_MAX, args.queries)
+
+    start = time.perf_counter()
+    reference = np.array([integrate(y, w, oracle.dt) for y, w in zip(release_y, winds)])
+    simulate_time = (time.perf_counter() - start) / args.queries
+
+    start = time.perf_counter()
+    offsets, times = oracle.query(HEIGHT - release_y, 0.0, winds)
+    batch_time = (time.perf_counter() - start) / args.queries
+
+    start = time.perf_counter()
+    for y, w in zip(release_y, winds):
+        oracle.predict(y, w)
+    scalar_time = (time.perf_counter() - start) / args.queries
+
+    start = time.perf_counter()
+    for y, w in zip(release_y, winds):
+        oracle.predict(y, w)
+    cached_time = (time.perf_counter() - start) / args.queries
+
+    offset_error = np.abs(offsets - reference[:, 0])
+    time_error = np.abs(times - reference[:, 1])
+    print(f"Impact offset error: mean {offset_error.mean():.3f} m, p99 {np.percentile(offset_error, 99):.3f} m, max {offset_error.max():.3f} m")
+    print(f"Time of flight error: mean {time_error.mean():.3f} s, max {time_error.max():.3f} s")
+    print(f"Integrator:      {simulate_time * 1e6:9.2f} us/query")
+    print(f"Oracle (batch):  {batch_time * 1e6:9.2f} us/query ({simulate_time / batch_time:,.0f}x)")
+    print(f"Oracle (scalar): {scalar_time * 1e6:9.2f} us/query ({simulate_time / scalar_time:,.0f}x)")
+    print(f"Oracle (cached): {cached_time * 1e6:9.2f} us/query ({simulate_time / cached_time:,.0f}x)")
+
+    env = Environment(seed=0)
+    hits = 0
+    for _ in range(args.episodes):
+        state = env.reset()
+        done = False
+        while not done and env.steps <= 200:
+            state, reward, done, _ = env.step(oracle.act(state))
+        hits += done and reward == 1000
+    print(f"Oracle baseline policy: {hits}/{args.episodes} hits ({hits / args.episodes:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Throughput and parity check for `VectorEnvironment` against the scalar `Environment`.
+
+Run from the 2D directory:
+    python -m benchmarks.vector_environment --num-envs 4096 --steps 500
+"""
+import argparse
+import time
+
+import numpy as np
+
+from entities import Grenade
+from environment import Environment, VectorEnvironment
+from utils import Vector
+
+TOLERANCE = 1e-9  # m
+
+
+def check_parity(num_envs=256, seed=0):
+    """
+    Drop every grenade at the first step and compare each landing point with the scalar integrator.
+
+    Returns:
+        float: Largest absolute landing position error over all episodes (meters).
+    """
+    env = VectorEnvironment(num_envs, max_steps=None, seed=seed)
+    env.reset()
+    start_x = env.grenade_x.copy()
+    start_y = env.grenade_y.copy()
+    winds = env.wind_x.copy()
+
+    final = np.full((num_envs, 2), np.nan)
+    pending = np.ones(num_envs, dtype=bool)
+    while pending.any():
+        _, _, dones, info = env.step(np.full(num_envs, 2))
+        newly_done = dones & pending
+        if newly_done.any():
+            # final_observation rows are ordered like the slots flagged in `dones`
+            rows = info["final_observation"][newly_done[dones]]
+            final[newly_done] = rows[:, 2:4]
+            pending &= ~newly_done
+
+    max_error = 0.0
+    for i in range(num_envs):
+        grenade = Grenade(start_x[i], start_y[i])
+        grenade.released = True
+        wind = Vector(winds[i], 0)
+        while not grenade.hit_ground:
+            grenade.update(wind, env.dt)
+        error = max(abs(grenade.coordinates.x - final[i, 0]), abs(grenade.coordinates.y - final[i, 1]))
+        max_error = max(max_error, error)
+    return max_error
+
+
+def scalar_steps_per_second(steps, seed=0):
+    env = Environment(seed=seed)
+    actions = np.random.default_rng(seed).integers(0, 3, size=steps).tolist()
+    env.reset()
+    start = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done or env.steps >= env.max_steps:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def vector_steps_per_second(num_envs, steps, seed=0):
+    env = VectorEnvironment(num_envs, seed=seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 3, size=(steps, num_envs))
+    start = time.perf_counter()
+    for t in range(steps):
+        env.step(actions[t])
+    return num_envs * steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-envs", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    max_error = check_parity(seed=args.seed)
+    status = "OK" if max_error <= TOLERANCE else "FAILED"
+    print(f"Parity: max landing error {max_error:.3e} m (tolerance {TOLERANCE:.0e}) {status}")
+
+    scalar = scalar_steps_per_second(args.steps * 20, args.seed)
+    vector = vector_steps_per_second(args.num_envs, args.steps, args.seed)
+    print(f"Scalar Environment: {scalar:,.0f} steps/sec")
+    print(f"VectorEnvironment({args.num_envs}): {vector:,.0f} steps/sec ({vector / scalar:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Cost of spatially varying wind: field generation versus cache draws, scalar and batched sampling,
+and grenade updates under a field, plus a landing-point parity check against `VectorEnvironment`.
+
+Run from the 2D directory:
+    python -m benchmarks.wind
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from constants import WIDTH, HEIGHT
+from entities import Grenade
+from environment import VectorEnvironment, WindField, WindFieldCache
+from utils import Vector
+
+FIELD = {"profile": "power", "gust_strength": 4.0, "gust_scale": 30.0, "vertical_gust_strength": 1.0}
+
+
+def check_parity(cache, num_envs=256, seed=0):
+    """
+    Drop every grenade at once and compare landing points of the batched and scalar paths.
+
+    Returns:
+        float: Largest absolute landing position error (meters).
+    """
+    env = VectorEnvironment(num_envs, max_steps=None, wind=cache, seed=seed)
+    env.reset()
+    start = np.stack([env.grenade_x, env.grenade_y], axis=1)
+    fields = [cache.fields[k] for k in env.field_index]
+    final = np.full((num_envs, 2), np.nan)
+    pending = np.ones(num_envs, dtype=bool)
+    while pending.any():
+        _, _, dones, info = env.step(np.full(num_envs, 2))
+        newly_done = dones & pending
+        if newly_done.any():
+            final[newly_done] = info["final_observation"][newly_done[dones]][:, 2:4]
+            pending &= ~newly_done
+
+    max_error = 0.0
+    for i in range(num_envs):
+        grenade = Grenade(*start[i])
+        grenade.released = True
+        while not grenade.hit_ground:
+            grenade.update(fields[i], env.dt)
+        max_error = max(max_error, abs(grenade.coordinates.x - final[i, 0]), abs(grenade.coordinates.y - final[i, 1]))
+    return max_error
+
+
+def per_call(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-envs", type=int, default=4096)
+    parser.add_argument("--cache-size", type=int, default=64)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    cache = WindFieldCache(args.cache_size, seed=0, **FIELD)
+    print(f"Parity: max landing error {check_parity(cache):.3e} m")
+
+    print(f"generate field:          {per_call(lambda: WindField.generate(rng, **FIELD), 200) * 1e6:10.2f} us")
+    print(f"draw cached field:       {per_call(lambda: cache.draw(rng), 20000) * 1e6:10.2f} us")
+
+    field = cache.fields[0]
+    print(f"scalar sample (at):      {per_call(lambda: field.at(75.3, 120.7), 200000) * 1e9:10.0f} ns")
+    x = rng.uniform(0, WIDTH, args.num_envs)
+    y = rng.uniform(0, HEIGHT, args.num_envs)
+    index = rng.integers(len(cache), size=args.num_envs)
+    batched = per_call(lambda: cache.sample(index, x, y), 200)
+    print(f"batched sample ({args.num_envs}):  {batched * 1e9 / args.num_envs:10.1f} ns/point")
+
+    for name, wind in (("constant", Vector(12.0, 0)), ("field", field)):
+        grenade = Grenade(75.0, -1e12)
+        grenade.released = True
+        print(f"grenade.update {name + ':':<9} {per_call(lambda: grenade.update(wind, 0.1), 200000) * 1e9:10.0f} ns")
+
+    for name, wind in (("constant", None), ("fields", cache)):
+        env = VectorEnvironment(args.num_envs, max_steps=None, wind=wind, seed=0)
+        env.reset()
+        env.step(np.full(args.num_envs, 2))
+        seconds = per_call(lambda: env.step(np.full(args.num_envs, 2)), 50)
+        print(f"vector step {name + ':':<12} {args.num_envs / seconds:12,.0f} steps/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,3 @@
-import pygame
-
 from constants import WIDTH, HEIGHT
 from utils import Vector
 from entities.grenade import Grenade
@@ -42,8 +40,14 @@ class Drone:
             if not self.grenade.released:
                 self.grenade.released = True
 
-    def attach_grenade(self):
-        self.grenade = Grenade(self.coordinates.x, self.coordinates.y + 1)
+    def attach_grenade(self, **grenade_kwargs):
+        """
+        Attach a new grenade below the drone.
+
+        Args:
+            **grenade_kwargs: Passed to `Grenade`, e.g. `integrator` or `exact_contact`.
+        """
+        self.grenade = Grenade(self.coordinates.x, self.coordinates.y + 1, **grenade_kwargs)
         return self.grenade
 
     def render(self, screen, pixel_per_meter):
@@ -53,7 +57,12 @@ class Drone:
         Args:
             screen (pygame.Surface): The Pygame screen to render on.
             pixel_per_meter (int): Conversion factor from meters to pixels.
+
+        Returns:
+            pygame.Rect: Screen area drawn.
         """
+        import pygame
+
         # Convert world coordinates and dimensions to screen coordinates
         screen_x = int((self.coordinates.x - self.width / 2) * pixel_per_meter)
         screen_y = int((self.coordinates.y - self.height / 2) * pixel_per_meter)
@@ -61,4 +70,4 @@ class Drone:
         screen_height = int(self.height * pixel_per_meter)
 
         # Draw the drone as a rectangle
-        pygame.draw.rect(screen, (0, 0, 255), (screen_x, screen_y, screen_width, screen_height))
+        return pygame.draw.rect(screen, (0, 0, 255), (screen_x, screen_y, screen_width, screen_height))
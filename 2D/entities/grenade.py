@@ -1,12 +1,12 @@
 import math
 
-import pygame
-
 from utils import Vector
 from constants import PIXELS_PER_METER, HEIGHT, GRAVITY, AIR_DENSITY
+from entities.integrators import INTEGRATORS, find_crossing
 
 class Grenade:
-    def __init__(self, x, y, radius=0.032, mass=0.4, drag_coefficient=0.47):
+    def __init__(self, x, y, radius=0.032, mass=0.4, drag_coefficient=0.47, integrator="semi_implicit_euler",
+                 exact_contact=False, rtol=1e-6, atol=1e-8):
         """
         Initializes the grenade with basic properties such as position, velocity, and physical characteristics.
         
@@ -16,7 +16,14 @@ class Grenade:
             radius (float): The radius of the grenade in meters (default: 0.032 m).
             mass (float): The mass of the grenade in kilograms (default: 0.4 kg).
             drag_coefficient (float): The drag coefficient for the grenade (default: 0.47).
+            integrator (str): "semi_implicit_euler" (default), "explicit_euler", "rk4" or "rk45" (adaptive).
+            exact_contact (bool): Locate the ground-crossing time within the step by root finding instead of
+                clamping the overshoot, so large time steps still give accurate landing points.
+            rtol (float): Relative tolerance of the adaptive "rk45" integrator.
+            atol (float): Absolute tolerance of the adaptive "rk45" integrator.
         """
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator: {integrator}")
         self.coordinates = Vector(x, y)
         self.velocity = Vector(0, 0)
 
@@ -25,68 +32,107 @@ class Grenade:
         self.drag_coefficient = drag_coefficient  # Drag coefficient for a sphere
         self.cross_sectional_area = math.pi * (self.radius ** 2)  # m^2
         self.terminal_velocity = self._calculate_terminal_velocity()  # m/s
+        # Constants of the drag equation, precomputed for the update hot path
+        self._drag_factor = 0.5 * AIR_DENSITY * self.drag_coefficient * self.cross_sectional_area
+        self._terminal_velocity_squared = self.terminal_velocity ** 2
+
+        self.integrator = integrator
+        self.exact_contact = exact_contact
+        self.rtol = rtol
+        self.atol = atol
+        self._rk45_substep = None  # Last accepted adaptive sub-step, reused as the next initial guess
 
         self.released = False  # Flag to track if grenade is released
         self.hit_ground = False  # Flag to track if grenade has hit the ground
+        self.flight_time = 0.0  # Time since release until ground contact (s)
 
     def update(self, wind, dt, max_altitude=HEIGHT):
         """
         Updates the grenade's position based on forces (gravity, wind) and velocity.
 
         Args:
-            wind (Vector): The wind vector affecting the grenade's motion.
+            wind (Vector or WindField): Constant wind, or a field sampled at the grenade's position
+                (held constant over the step).
             dt (float): The time step for the simulation.
             max_altitude (float): The maximum altitude (in meters) to scale wind forces (default: HEIGHT).
         """
         if self.released and not self.hit_ground:
-            # Calculate gravitational force
-            gravitational_force = self._calculate_gravity_force()
-            # Calculate relative velocity: wind is moving, so we subtract it from the grenade's velocity
-            relative_velocity = self.velocity - wind
-            # Calculate drag force based on relative velocity (quadratic drag equation)
-            if relative_velocity.magnitude() > 0:
-                drag_force = (
-                    relative_velocity.normalize() * -0.5 * AIR_DENSITY * self.drag_coefficient * self.cross_sectional_area *
-                    relative_velocity.magnitude_squared()
-                )
+            if self.integrator != "semi_implicit_euler" or self.exact_contact:
+                self._integrate(wind, dt)
+                return
+            # Integrate on plain floats: no temporary Vectors are allocated per step
+            velocity = self.velocity
+            coordinates = self.coordinates
+            vx = velocity.x
+            vy = velocity.y
+            if wind.__class__ is Vector:
+                wind_x = wind.x
+                wind_y = wind.y
             else:
-                drag_force = Vector(0, 0)  # No drag if relative velocity is zero (e.g., initially stationary)
-            # The total net force is the sum of gravity and drag forces
-            net_force = gravitational_force + drag_force
-            # Calculate acceleration from net force (F = ma)
-            acceleration = net_force / self.mass
-            # Update velocity by integrating acceleration over time
-            self.velocity += acceleration * dt
+                wind_x, wind_y = wind.at(coordinates.x, coordinates.y)
+            # Relative velocity: wind is moving, so we subtract it from the grenade's velocity
+            rel_x = vx - wind_x
+            rel_y = vy - wind_y
+            # Quadratic drag opposes the relative velocity: F = -k * |v_rel| * v_rel
+            drag = -self._drag_factor * math.sqrt(rel_x * rel_x + rel_y * rel_y)
+            # Gravity plus drag, divided by mass (F = ma), integrated over dt
+            vx += (drag * rel_x / self.mass) * dt
+            vy += ((self.mass * GRAVITY + drag * rel_y) / self.mass) * dt
             # Cap the velocity at terminal velocity to prevent infinite speed
-            if self.velocity.magnitude() > self.terminal_velocity:
-                self.velocity = self.velocity.normalize() * self.terminal_velocity
+            speed_squared = vx * vx + vy * vy
+            if speed_squared > self._terminal_velocity_squared:
+                scale = self.terminal_velocity / math.sqrt(speed_squared)
+                vx *= scale
+                vy *= scale
             # Update the position using the updated velocity
-            self.coordinates += self.velocity * dt
+            x = coordinates.x + vx * dt
+            y = coordinates.y + vy * dt
             # Check for collision with the ground
-            if self.coordinates.y >= HEIGHT:
-                self.coordinates.y = HEIGHT  # Ensure the grenade doesn't fall below the ground level
-                self.velocity.y = 0  # Stop vertical velocity
+            if y >= HEIGHT:
+                y = HEIGHT  # Ensure the grenade doesn't fall below the ground level
+                vy = 0  # Stop vertical velocity
                 self.hit_ground = True  # Mark as hit ground
+            velocity.x = vx
+            velocity.y = vy
+            coordinates.x = x
+            coordinates.y = y
+            self.flight_time += dt
+
+    def _integrate(self, wind, dt):
+        """General update through `entities.integrators`, with optional event-accurate ground contact."""
+        wind_x, wind_y = (wind.x, wind.y) if wind.__class__ is Vector else wind.at(self.coordinates.x, self.coordinates.y)
+        # The steppers cap the speed wherever a velocity moves the grenade, as the fast path above does
+        params = (wind_x, wind_y, self._drag_factor, self.mass, self.terminal_velocity)
+        state = (self.coordinates.x, self.coordinates.y, self.velocity.x, self.velocity.y)
+        if self.integrator == "rk45":
+            def advance(start, h):
+                end, _ = INTEGRATORS["rk45"](start, h, params, self.rtol, self.atol, self._rk45_substep)
+                return end
+
+            new_state, self._rk45_substep = INTEGRATORS["rk45"](state, dt, params, self.rtol, self.atol, self._rk45_substep)
+        else:
+            stepper = INTEGRATORS[self.integrator]
+
+            def advance(start, h):
+                return stepper(start, h, params)
+
+            new_state = advance(state, dt)
+        elapsed = dt
+        x, y, vx, vy = new_state
+        if y >= HEIGHT:
+            if self.exact_contact:
+                elapsed, (x, y, vx, vy) = find_crossing(advance, state, dt, HEIGHT)
+            y = HEIGHT  # Ensure the grenade doesn't fall below the ground level
+            vy = 0  # Stop vertical velocity
+            self.hit_ground = True
+        self.coordinates.set(x, y)
+        self.velocity.set(vx, vy)
+        self.flight_time += elapsed
 
     def _calculate_gravity_force(self):
         """Calculates the gravitational force acting on the grenade."""
         return Vector(0, self.mass * GRAVITY)
     
-    def _calculate_wind_force_at_attitude(self, wind, max_altitude):
-        """
-        Calculates the wind force on the grenade based on its current altitude.
-        
-        Args:
-            wind (Vector): The wind vector at sea level (in meters per second).
-            max_altitude (float): The maximum altitude (in meters) for wind scaling.
-
-        Returns:
-            Vector: The adjusted wind force based on the grenade's altitude.
-        """
-        altitude = max_altitude - self.coordinates.y  # Altitude above ground
-        altitude_factor = max(min(altitude / max_altitude, 1.0), 0.0)  # Normalize the altitude factor
-        return wind * altitude_factor
-
     def _calculate_terminal_velocity(self):
         """
         Calculates the terminal velocity for the grenade using the drag equation.
@@ -99,9 +145,11 @@ class Grenade:
         )
     
     def render(self, screen, pixels_per_meter):
+        import pygame
+
         # Convert position to pixels for rendering
         position_pixels = self.coordinates * pixels_per_meter
-        pygame.draw.circle(
+        return pygame.draw.circle(
             screen, (200, 50, 50), 
             (int(position_pixels.x), int(position_pixels.y)), 
             5
@@ -0,0 +1,194 @@
+"""
+Time integrators for the grenade's ballistic motion.
+
+The state is the tuple (x, y, vx, vy) in screen coordinates (y grows towards the ground). Every
+stepper has the signature `step(state, h, params)` where `params` is (wind_x, wind_y, drag_factor,
+mass, max_speed), and returns the new state; the adaptive stepper additionally returns an error estimate.
+
+`max_speed` (None: no cap) is the grenade's terminal-velocity cap. Every stepper applies it at the
+same point as the original semi-implicit scheme: a velocity is capped before it moves the position,
+so all integrators discretise the same capped motion.
+"""
+import math
+
+from constants import GRAVITY
+
+
+def cap_speed(vx, vy, max_speed):
+    """Scale the velocity down to `max_speed` if it is faster (no cap if `max_speed` is None)."""
+    if max_speed is not None:
+        speed_squared = vx * vx + vy * vy
+        if speed_squared > max_speed * max_speed:
+            scale = max_speed / math.sqrt(speed_squared)
+            return vx * scale, vy * scale
+    return vx, vy
+
+
+def acceleration(vx, vy, params):
+    """Gravity plus quadratic drag against the velocity relative to the wind, divided by mass."""
+    wind_x, wind_y, drag_factor, mass, _ = params
+    rel_x = vx - wind_x
+    rel_y = vy - wind_y
+    drag = -drag_factor * math.sqrt(rel_x * rel_x + rel_y * rel_y)
+    return drag * rel_x / mass, (mass * GRAVITY + drag * rel_y) / mass
+
+
+def explicit_euler(state, h, params):
+    """Forward Euler: position advances with the velocity at the start of the step."""
+    x, y, vx, vy = state
+    vx, vy = cap_speed(vx, vy, params[4])
+    ax, ay = acceleration(vx, vy, params)
+    return (x + vx * h, y + vy * h, *cap_speed(vx + ax * h, vy + ay * h, params[4]))
+
+
+def semi_implicit_euler(state, h, params):
+    """Symplectic Euler: velocity first, then position with the new velocity (the original `Grenade.update` scheme)."""
+    x, y, vx, vy = state
+    ax, ay = acceleration(vx, vy, params)
+    vx, vy = cap_speed(vx + ax * h, vy + ay * h, params[4])
+    return x + vx * h, y + vy * h, vx, vy
+
+
+def rk4(state, h, params):
+    """Classic fourth-order Runge-Kutta."""
+    x, y, vx, vy = state
+    max_speed = params[4]
+    vx, vy = cap_speed(vx, vy, max_speed)
+    a1x, a1y = acceleration(vx, vy, params)
+    v2x, v2y = cap_speed(vx + 0.5 * h * a1x, vy + 0.5 * h * a1y, max_speed)
+    a2x, a2y = acceleration(v2x, v2y, params)
+    v3x, v3y = cap_speed(vx + 0.5 * h * a2x, vy + 0.5 * h * a2y, max_speed)
+    a3x, a3y = acceleration(v3x, v3y, params)
+    v4x, v4y = cap_speed(vx + h * a3x, vy + h * a3y, max_speed)
+    a4x, a4y = acceleration(v4x, v4y, params)
+    return (
+        x + h / 6 * (vx + 2 * v2x + 2 * v3x + v4x),
+        y + h / 6 * (vy + 2 * v2y + 2 * v3y + v4y),
+        *cap_speed(vx + h / 6 * (a1x + 2 * a2x + 2 * a3x + a4x), vy + h / 6 * (a1y + 2 * a2y + 2 * a3y + a4y), max_speed),
+    )
+
+
+# Dormand-Prince 5(4) tableau
+_DP_C = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0)
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_B5 = (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0)
+_DP_B4 = (5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40)
+
+
+def dormand_prince(state, h, params):
+    """
+    One embedded Runge-Kutta 5(4) step.
+
+    Returns:
+        tuple: (fifth-order state, per-component absolute difference to the fourth-order solution).
+    """
+    max_speed = params[4]
+    state = (*state[:2], *cap_speed(state[2], state[3], max_speed))
+    derivatives = []
+    for stage in range(7):
+        s = list(state)
+        for j, a in enumerate(_DP_A[stage]):
+            dx, dy, dvx, dvy = derivatives[j]
+            s[0] += h * a * dx
+            s[1] += h * a * dy
+            s[2] += h * a * dvx
+            s[3] += h * a * dvy
+        vx, vy = cap_speed(s[2], s[3], max_speed)
+        ax, ay = acceleration(vx, vy, params)
+        derivatives.append((vx, vy, ax, ay))
+    high = list(state)
+    low = list(state)
+    for (dx, dy, dvx, dvy), b5, b4 in zip(derivatives, _DP_B5, _DP_B4):
+        for i, d in enumerate((dx, dy, dvx, dvy)):
+            high[i] += h * b5 * d
+            low[i] += h * b4 * d
+    high[2:] = cap_speed(high[2], high[3], max_speed)
+    low[2:] = cap_speed(low[2], low[3], max_speed)
+    return tuple(high), tuple(abs(a - b) for a, b in zip(high, low))
+
+
+def rk45(state, h, params, rtol=1e-6, atol=1e-8, substep=None):
+    """
+    Adaptive Dormand-Prince integration over an interval `h`, sub-stepping as the error estimate requires.
+
+    Args:
+        state (tuple): (x, y, vx, vy) at the start of the interval.
+        h (float): Length of the interval.
+        params (tuple): (wind_x, wind_y, drag_factor, mass, max_speed).
+        rtol (float): Relative error tolerance per sub-step.
+        atol (float): Absolute error tolerance per sub-step.
+        substep (float): Initial sub-step size (default: the whole interval).
+
+    Returns:
+        tuple: (state at the end of the interval, last accepted sub-step size for warm-starting the next call).
+    """
+    t = 0.0
+    step = min(substep or h, h)
+    accepted = step
+    while t < h:
+        step = min(step, h - t)
+        candidate, error = dormand_prince(state, step, params)
+        scale = max(atol + rtol * max(abs(a), abs(b)) for a, b in zip(state, candidate))
+        ratio = max(error) / scale if scale > 0 else 0.0
+        if ratio <= 1.0:
+            t += step
+            state = candidate
+            accepted = step
+        # Standard step-size controller with safety factor and growth limits
+        factor = 5.0 if ratio == 0 else min(5.0, max(0.2, 0.9 * ratio ** -0.2))
+        step *= factor
+    return state, accepted
+
+
+def find_crossing(advance, state, h, ground, tolerance=1e-10, max_iterations=60):
+    """
+    Time within a step at which the trajectory reaches the ground, found with the Illinois method.
+
+    `advance(state, tau)` must return the state after integrating for `tau`; the trajectory is assumed
+    to start above the ground (y < ground) and to be at or below it after `h`.
+
+    Returns:
+        tuple: (tau, state at tau with y set exactly to `ground`).
+    """
+    low, high = 0.0, h
+    f_low = state[1] - ground
+    crossing = advance(state, high)
+    f_high = crossing[1] - ground
+    side = 0
+    tau = high
+    for _ in range(max_iterations):
+        if f_high == f_low:
+            break
+        tau = high - f_high * (high - low) / (f_high - f_low)
+        crossing = advance(state, tau)
+        f_tau = crossing[1] - ground
+        if abs(f_tau) <= tolerance or high - low <= tolerance:
+            break
+        if f_tau > 0:
+            high, f_high = tau, f_tau
+            if side == -1:
+                f_low /= 2
+            side = -1
+        else:
+            low, f_low = tau, f_tau
+            if side == 1:
+                f_high /= 2
+            side = 1
+    x, _, vx, vy = crossing
+    return tau, (x, ground, vx, vy)
+
+
+INTEGRATORS = {
+    "explicit_euler": explicit_euler,
+    "semi_implicit_euler": semi_implicit_euler,
+    "rk4": rk4,
+    "rk45": rk45,
+}
@@ -1,5 +1,3 @@
-import pygame
-
 from constants import HEIGHT
 from utils import Vector
 
@@ -16,7 +14,12 @@ class Target:
         Args:
             screen (pygame.Surface): The Pygame screen to render on.
             pixel_per_meter (int): Conversion factor from meters to pixels.
+
+        Returns:
+            pygame.Rect: Screen area drawn.
         """
+        import pygame
+
         # Convert world coordinates and dimensions to screen coordinates
         screen_x = int((self.coordinates.x - self.width / 2) * pixel_per_meter)
         screen_y = int((self.coordinates.y - self.height / 2) * pixel_per_meter)
@@ -24,4 +27,4 @@ class Target:
         screen_height = int(self.height * pixel_per_meter)
 
         # Draw the drone as a rectangle
-        pygame.draw.rect(screen, (100, 150, 50), (screen_x, screen_y, screen_width, screen_height))
\ No newline at end of file
+        return pygame.draw.rect(screen, (100, 150, 50), (screen_x, screen_y, screen_width, screen_height))
\ No newline at end of file
@@ -1 +1,7 @@
-from environment.environment import Environment
\ No newline at end of file
+from environment.environment import Environment
+from environment.vector_environment import VectorEnvironment
+from environment.trajectory_oracle import TrajectoryOracle
+from environment.episode_log import EpisodeLog, read_episode_logs, write_episode_logs, replay
+from environment.recorder import FrameRecorder
+from environment.swarm_environment import SwarmEnvironment
+from environment.wind import WindField, WindFieldCache
@@ -1,49 +1,128 @@
-import random
 import time
 import math
+import os
 
-import pygame
+import numpy as np
 
 from constants import WIDTH, HEIGHT, WIND_FORCE_MAX, PIXELS_PER_METER, RENDER_PAUSE
 from utils import Vector
 from entities import Drone, Grenade, Target
+from environment.recorder import FrameRecorder
+from environment.wind import WindFieldCache
 
 class Environment:
-    def __init__(self, dt=0.1, max_steps=100, drone_min_height = 0.5, renderMode=False):
+    def __init__(self, dt=0.1, max_steps=100, drone_min_height = 0.5, renderMode=False, offscreen=False, frame_dir=None, video_path=None, render_fps=None, frame_format="png", integrator="semi_implicit_euler", exact_contact=False, coast=False, coast_gamma=1.0, wind=None, seed=None):
+        """
+        Args:
+            dt (float): Time step for the simulation.
+            max_steps (int): Maximum number of steps per episode.
+            drone_min_height (float): Fraction of the height kept free below the drone at reset.
+            renderMode (bool): Enable rendering. pygame is only imported when this is set.
+            offscreen (bool): Render to an in-memory surface instead of a window; never sleeps or pumps events.
+            frame_dir (str): Directory to dump every rendered frame to as PNG (default: no dump).
+            video_path (str): Record rendered frames to this video file (via ffmpeg, falling back to an
+                image sequence), see `FrameRecorder`.
+            render_fps (float): Frames per second of simulated time. `render` skips calls until the next
+                frame is due, independent of `dt`, and a window is paced to this rate in wall-clock time.
+                None draws every call.
+            frame_format (str): Image format of `frame_dir` frames; "bmp" is uncompressed and much faster to write.
+            integrator (str): Grenade integrator, see `Grenade`.
+            exact_contact (bool): Locate the exact ground-crossing time instead of clamping the overshoot.
+            coast (bool): Once the grenade is released, simulate the rest of the fall inside the same `step`
+                call and return one aggregated, terminal transition.
+            coast_gamma (float): Discount applied when aggregating the rewards of coasted steps
+                (1.0: plain sum). Pass the agent's gamma so the aggregated reward equals its discounted return.
+            wind (WindFieldCache or dict): Spatially varying wind: every episode draws a pre-generated field
+                from the bank (a dict is passed to `WindFieldCache`). None keeps one constant wind per episode.
+            seed (int): Seed of the environment's random stream; every episode draws its own seed from it.
+        """
         self.dt = dt
+        self.integrator = integrator
+        self.exact_contact = exact_contact
+        self.coast = coast
+        self.coast_gamma = coast_gamma
         self.max_steps=max_steps
         self.drone_min_height = drone_min_height
+        self.wind_fields = WindFieldCache(**wind) if isinstance(wind, dict) else wind
         self.width = WIDTH
         self.height = HEIGHT
 
         self.renderMode = renderMode
+        self.offscreen = offscreen
+        self.frame_dir = frame_dir
+        self.video_path = video_path
+        self.render_fps = render_fps
+        self.frame_format = frame_format
+        self.recorder = None
         self.screen = None
+        self.next_frame_time = 0.0  # Simulated time at which the next frame is due
+        self.last_flip = 0.0  # Wall-clock time of the last window update
 
-    def reset(self):
-        self.drone = Drone(random.randint(0, WIDTH), random.randint(0, HEIGHT-(HEIGHT*self.drone_min_height)))
-        self.grenade = self.drone.attach_grenade()
-        self.target = Target(random.randint(40, WIDTH-40))
-        self.wind = self.generateWindForce()
+        self.np_random = np.random.default_rng(seed)
+        self.episode_seed = None
+        self.actions = []  # Actions of the current episode, for `episode_log`
+
+    def reset(self, seed=None):
+        """
+        Start a new episode.
+
+        Args:
+            seed (int): Seed for this episode. If None, one is drawn from the environment's stream,
+                so every episode can be replayed from its `episode_seed` alone.
+        """
+        if seed is None:
+            seed = int(self.np_random.integers(2**63))
+        self.episode_seed = seed
+        rng = self._episode_rng = np.random.default_rng(seed)
+        drone_max_y = int(HEIGHT - (HEIGHT * self.drone_min_height))
+        self.drone = Drone(int(rng.integers(0, WIDTH, endpoint=True)), int(rng.integers(0, drone_max_y, endpoint=True)))
+        self.grenade = self.drone.attach_grenade(integrator=self.integrator, exact_contact=self.exact_contact)
+        self.target = Target(int(rng.integers(40, WIDTH - 40, endpoint=True)))
+        self.wind = self.generateWindForce() if self.wind_fields is None else self.wind_fields.draw(rng)
         self.steps = 0
         self.score = 0
+        self.actions = []
+        self.next_frame_time = 0.0
 
         if self.renderMode and self.screen is None:
-            pygame.init()
-            self.screen = pygame.display.set_mode((self.width*PIXELS_PER_METER, self.height*PIXELS_PER_METER))
-            self.font = pygame.font.SysFont(None, 20)
+            self._init_screen()
 
         return self._get_observation()
 
     def step(self, action):
+        self.actions.append(action)
         self.drone.update(action, self.dt)
         self.grenade.update(self.wind, self.dt)
         self.steps += 1
 
         done = self._is_done()
         reward = self._calculate_reward()
+        steps = 1
+        if self.coast and self.grenade.released and not done:
+            reward, steps = self._coast(reward)
+            done = True
         observation = self._get_observation()
 
-        return observation, reward, done, {}
+        # "steps" is the number of simulation steps this call covered; "hit" holds even when the reward was coasted
+        return observation, reward, done, {"steps": steps, "hit": done and self._is_hit()}
+
+    def _coast(self, reward):
+        """
+        Simulate the ballistic phase to the ground; agent actions cannot change its outcome.
+
+        Returns:
+            tuple: (discounted sum of the rewards of all covered steps, number of covered steps).
+        """
+        total = reward
+        discount = 1.0
+        steps = 1
+        while not self.grenade.hit_ground:
+            self.grenade.update(self.wind, self.dt)
+            self.steps += 1
+            steps += 1
+            discount *= self.coast_gamma
+            total += discount * self._calculate_reward()
+        return total, steps
 
     def _get_observation(self):
         observation = [
@@ -57,50 +136,165 @@ class Environment:
 
     def _calculate_reward(self):
         if self.grenade.hit_ground:
-            target_x = self.target.coordinates.x
-            grenade_x = self.grenade.coordinates.x
-            # Calculate the horizontal (X) distance between the grenade and the target
-            distance = math.sqrt(abs(target_x**2 - grenade_x**2))
-            if distance <= 10:
+            if self._is_hit():
                 return 1000
             else:
-                return -distance  # Negative penalty for missing the target area
+                return -self._landing_distance()  # Negative penalty for missing the target area
         return -0.2
 
+    def _landing_distance(self):
+        target_x = self.target.coordinates.x
+        grenade_x = self.grenade.coordinates.x
+        # Calculate the horizontal (X) distance between the grenade and the target
+        return math.sqrt(abs(target_x**2 - grenade_x**2))
+
+    def _is_hit(self):
+        return self.grenade.hit_ground and self._landing_distance() <= 10
+
 
     def _is_done(self):
         return self.grenade.hit_ground
 
     def generateWindForce(self):
-        return Vector(random.uniform(-WIND_FORCE_MAX, WIND_FORCE_MAX), 0)
+        return Vector(float(self._episode_rng.uniform(-WIND_FORCE_MAX, WIND_FORCE_MAX)), 0)
+
+    def config(self):
+        """Constructor arguments that affect the simulation (rendering excluded)."""
+        return {
+            "dt": self.dt,
+            "max_steps": self.max_steps,
+            "drone_min_height": self.drone_min_height,
+            "integrator": self.integrator,
+            "exact_contact": self.exact_contact,
+            "coast": self.coast,
+            "coast_gamma": self.coast_gamma,
+            "wind": self.wind_fields.config() if self.wind_fields is not None else None,
+        }
+
+    def episode_log(self):
+        """
+        Record of the current episode from which `environment.episode_log.replay` reproduces it bit-for-bit.
+
+        Returns:
+            EpisodeLog: Episode seed, environment config, actions taken and the current observation.
+        """
+        from environment.episode_log import EpisodeLog
+
+        return EpisodeLog(self.episode_seed, self.actions, self.config(), self._get_observation())
+
+    def _init_screen(self):
+        import pygame  # Imported lazily so headless training never loads pygame
+
+        size = (self.width*PIXELS_PER_METER, self.height*PIXELS_PER_METER)
+        if self.offscreen:
+            pygame.font.init()
+            self.screen = pygame.Surface(size)
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode(size)
+        self.font = pygame.font.SysFont(None, 20)
+        self.text_cache = {}  # HUD key -> (text, rendered surface)
+
+        # Background and scale never change, so they are drawn once
+        self.background = pygame.Surface(size, 0, self.screen)  # Same pixel format as the screen, so blits are plain copies
+        self.background.fill((180, 180, 180))
+        self._draw_scale(self.background)
+        self.static_layer = None
+        self.static_target_x = None
+        self.dirty_rects = []  # Screen areas drawn over the static layer by the last frame
+
+        fps = self.render_fps or 1 / self.dt
+        if self.frame_dir is not None:
+            self.recorder = FrameRecorder(self.frame_dir, size, fps, self.frame_format)
+        elif self.video_path is not None:
+            self.recorder = FrameRecorder(self.video_path, size, fps, self.frame_format)
+
+    def render(self, force=False):
+        """
+        Draw the current state and record/show it.
 
-    def render(self):
+        Args:
+            force (bool): Draw even if `render_fps` says no frame is due yet.
+
+        Returns:
+            bool: Whether a frame was drawn.
+        """
         if not self.renderMode:
             raise Exception("Render is not True.")
         if self.screen is None:
             raise Exception("Pygame not initialized. Call reset() or set renderMode=True before rendering.")
 
-        self.screen.fill((180, 180, 180))  # Clear the screen
+        if self.render_fps is not None:
+            sim_time = self.steps * self.dt
+            # The landing frame is always drawn so recordings show where the grenade hit
+            if sim_time + 1e-9 < self.next_frame_time and not force and not self.grenade.hit_ground:
+                return False
+            self.next_frame_time = (math.floor(sim_time * self.render_fps + 1e-9) + 1) / self.render_fps
 
-        # Draw objects (dummy example)
-        self.drone.render(self.screen, PIXELS_PER_METER)
-        self.grenade.render(self.screen, PIXELS_PER_METER)
-        self.target.render(self.screen, PIXELS_PER_METER)
+        # Background, scale and target are one cached layer, rebuilt only when the target moves
+        if self.static_target_x != self.target.coordinates.x:
+            self.static_layer = self.background.copy()
+            self.target.render(self.static_layer, PIXELS_PER_METER)
+            self.static_target_x = self.target.coordinates.x
+            self.screen.blit(self.static_layer, (0, 0))
+            previous_rects = [self.screen.get_rect()]
+        else:
+            # Only the areas drawn over last frame need the static layer restored
+            previous_rects = self.dirty_rects
+            for rect in previous_rects:
+                self.screen.blit(self.static_layer, rect, rect)
 
-        self._draw_info()
+        self.dirty_rects = [
+            self.drone.render(self.screen, PIXELS_PER_METER),
+            self.grenade.render(self.screen, PIXELS_PER_METER),
+            *self._draw_info(),
+        ]
 
-        pygame.display.flip()
-        
-        time.sleep(RENDER_PAUSE)
+        if self.recorder is not None:
+            self.recorder.write(self.screen)
+        if not self.offscreen:
+            import pygame
+
+            pygame.display.update(previous_rects + self.dirty_rects)
+            if self.render_fps is None:
+                time.sleep(RENDER_PAUSE)
+            else:
+                # Pace the window to render_fps in wall-clock time
+                delay = self.last_flip + 1 / self.render_fps - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                self.last_flip = time.perf_counter()
+        return True
+
+    def process_events(self):
+        """Drain the window event queue so the OS does not mark it unresponsive. No-op when headless."""
+        if self.screen is not None and not self.offscreen:
+            import pygame
+
+            pygame.event.get()
 
     def close(self):
-        if self.renderMode:
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.screen is not None:
+            import pygame
+
             pygame.quit()
+            self.screen = None
+
+    def _text(self, key, text):
+        """Rendered HUD text, re-rendered only when `text` differs from the last call with the same key."""
+        cached = self.text_cache.get(key)
+        if cached is None or cached[0] != text:
+            # Opaque on the background color, so blitting needs no per-pixel alpha blending
+            cached = self.text_cache[key] = (text, self.font.render(text, True, (0, 0, 0), (180, 180, 180)))
+        return cached[1]
 
-    def _draw_scale(self):
+    def _draw_scale(self, surface):
         for y in range(0, HEIGHT, 20):
             text = self.font.render(f"{y} meters", True, (0, 0, 0))
-            self.screen.blit(text, (5, (HEIGHT - y) * PIXELS_PER_METER))
+            surface.blit(text, (5, (HEIGHT - y) * PIXELS_PER_METER))
 
     def _draw_time_counter(self):
         total_time = self.steps * self.dt  # Total simulation time
@@ -109,33 +303,32 @@ class Environment:
         rounded_seconds = round(seconds, 2)  # Round to two decimal places for seconds
 
         time_text = f"Time: {minutes:02}:{rounded_seconds:05.2f}"  # Format as mm:ss.xx
-        text = self.font.render(time_text, True, (0, 0, 0))
-        self.screen.blit(text, (WIDTH * PIXELS_PER_METER - 150, 10))
+        return self.screen.blit(self._text("time", time_text), (WIDTH * PIXELS_PER_METER - 150, 10))
 
     def _draw_grenade_velocity(self):
         velocity_magnitude = self.grenade.velocity.magnitude()
         terminal_velocity_text = f"T.Velocity: {self.grenade.terminal_velocity:.2f} m/s"
         velocity_text = f"Velocity: {velocity_magnitude:.2f} m/s"
 
-        text = self.font.render(velocity_text, True, (0, 0, 0))
-        self.screen.blit(text, (WIDTH * PIXELS_PER_METER - 150, 30))
-        text = self.font.render(terminal_velocity_text, True, (0, 0, 0))
-        self.screen.blit(text, (WIDTH * PIXELS_PER_METER - 150, 50))
+        return (
+            self.screen.blit(self._text("velocity", velocity_text), (WIDTH * PIXELS_PER_METER - 150, 30)),
+            self.screen.blit(self._text("terminal_velocity", terminal_velocity_text), (WIDTH * PIXELS_PER_METER - 150, 50)),
+        )
 
     def _draw_wind_info(self):
         wind_magnitude = self.wind.x
         wind_text = f"Wind: {wind_magnitude:.2f} m/s"
-        text = self.font.render(wind_text, True, (0, 0, 0))
-        self.screen.blit(text, (WIDTH * PIXELS_PER_METER - 150, 90))
+        return self.screen.blit(self._text("wind", wind_text), (WIDTH * PIXELS_PER_METER - 150, 90))
 
     def _draw_score(self):
         score_text = f"Score: {self.score}"
-        text = self.font.render(score_text, True, (0, 0, 0))
-        self.screen.blit(text, (WIDTH * PIXELS_PER_METER - 150, 110))
+        return self.screen.blit(self._text("score", score_text), (WIDTH * PIXELS_PER_METER - 150, 110))
 
     def _draw_info(self):
-        self._draw_scale()
-        self._draw_time_counter()
-        self._draw_grenade_velocity()
-        self._draw_wind_info()
-        self._draw_score()
\ No newline at end of file
+        """Draw the HUD and return the screen areas it covers."""
+        return [
+            self._draw_time_counter(),
+            *self._draw_grenade_velocity(),
+            self._draw_wind_info(),
+            self._draw_score(),
+        ]
@@ -0,0 +1,71 @@
+import json
+
+class EpisodeLog:
+    def __init__(self, seed, actions, config=None, final_observation=None):
+        """
+        Everything needed to replay one episode without the agent.
+
+        Args:
+            seed (int): Episode seed passed to `Environment.reset`.
+            actions (list): Actions in the order they were taken.
+            config (dict): `Environment.config()` of the recording environment.
+            final_observation (list): Last observation of the episode, used by `verify`.
+        """
+        self.seed = seed
+        self.actions = [int(action) if not isinstance(action, str) else action for action in actions]
+        self.config = config or {}
+        self.final_observation = final_observation
+
+    def to_dict(self):
+        return {
+            "seed": self.seed,
+            "actions": self.actions,
+            "config": self.config,
+            "final_observation": self.final_observation,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["seed"], data["actions"], data.get("config"), data.get("final_observation"))
+
+
+def write_episode_logs(path, logs, append=True):
+    """Write logs as JSON lines. JSON float repr round-trips exactly, so observations survive bit-for-bit."""
+    with open(path, "a" if append else "w") as file:
+        for log in logs:
+            file.write(json.dumps(log.to_dict()) + "\n")
+
+
+def read_episode_logs(path):
+    with open(path) as file:
+        return [EpisodeLog.from_dict(json.loads(line)) for line in file if line.strip()]
+
+
+def replay(log, env=None):
+    """
+    Re-run a logged episode.
+
+    Args:
+        log (EpisodeLog): Episode to replay.
+        env (Environment): Environment to replay in (default: a new one built from `log.config`).
+
+    Returns:
+        list: One (observation, reward, done) tuple per action.
+    """
+    if env is None:
+        from environment.environment import Environment
+
+        env = Environment(**log.config)
+    env.reset(seed=log.seed)
+    trajectory = []
+    for action in log.actions:
+        observation, reward, done, _ = env.step(action)
+        trajectory.append((observation, reward, done))
+    return trajectory
+
+
+def verify(log):
+    """True if replaying `log` ends on exactly the recorded final observation."""
+    trajectory = replay(log)
+    final = trajectory[-1][0] if trajectory else None
+    return final == log.final_observation
@@ -0,0 +1,63 @@
+import os
+import shutil
+import subprocess
+
+
+class FrameRecorder:
+    def __init__(self, path, size, fps=10, image_format="png"):
+        """
+        Write rendered frames to a video file or an image sequence, without needing a window.
+
+        A path ending in .mp4, .webm, .mkv, .avi or .gif is encoded by piping raw RGB frames to
+        `ffmpeg`. Without ffmpeg on PATH the frames are written next to it as an image sequence in
+        `<path without extension>_frames/` instead. Any other path is taken as the image-sequence
+        directory.
+
+        Args:
+            path (str): Video file or frame directory.
+            size (tuple): Frame size in pixels (width, height).
+            fps (float): Playback frame rate of the video.
+            image_format (str): Image-sequence file format; "bmp" skips compression and is much
+                faster to write than "png".
+        """
+        self.size = size
+        self.fps = fps
+        self.image_format = image_format
+        self.frame_index = 0
+        self.process = None
+        self.frame_dir = None
+
+        stem, extension = os.path.splitext(path)
+        if extension.lower() in (".mp4", ".webm", ".mkv", ".avi", ".gif"):
+            ffmpeg = shutil.which("ffmpeg")
+            if ffmpeg is not None:
+                width, height = size
+                self.process = subprocess.Popen(
+                    [ffmpeg, "-loglevel", "error", "-y",
+                     "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                     # yuv420p needs even dimensions; pad by one pixel if necessary
+                     "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", path],
+                    stdin=subprocess.PIPE,
+                )
+                self.path = path
+                return
+            print(f"ffmpeg not found; writing {path} as an image sequence instead")
+            path = stem + "_frames"
+        self.frame_dir = self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, surface):
+        """Append the current contents of a pygame surface as one frame."""
+        import pygame
+
+        if self.process is not None:
+            self.process.stdin.write(pygame.image.tobytes(surface, "RGB"))
+        else:
+            pygame.image.save(surface, os.path.join(self.frame_dir, f"frame_{self.frame_index:06d}.{self.image_format}"))
+        self.frame_index += 1
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+            self.process = None
@@ -0,0 +1,279 @@
+import numpy as np
+
+from constants import WIDTH, HEIGHT, WIND_FORCE_MAX, AIR_DENSITY
+from entities import Grenade
+from environment.vector_environment import integrate_grenades
+from environment.wind import WindFieldCache
+
+
+class GrenadePool:
+    def __init__(self, capacity):
+        """
+        Fixed-capacity struct-of-arrays store of falling grenades.
+
+        Landed grenades return their slot to a free list (a stack of slot indices), so a scene can
+        drop far more grenades over its lifetime than `capacity` as long as no more than `capacity`
+        are airborne at once. Allocation and release are vectorized over batches of slots.
+
+        Args:
+            capacity (int): Maximum number of grenades in flight.
+        """
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.owner = np.zeros(capacity, dtype=np.int64)  # Index of the drone that dropped the grenade
+        self.active = np.zeros(capacity, dtype=bool)
+        self.free = np.arange(capacity)[::-1].copy()  # Free slots; the top of the stack is free[free_count - 1]
+        self.free_count = capacity
+
+    def clear(self):
+        self.active[:] = False
+        self.free[:] = np.arange(self.capacity)[::-1]
+        self.free_count = self.capacity
+
+    def allocate(self, count):
+        """Pop up to `count` free slots and mark them active; returns the slot indices."""
+        count = min(count, self.free_count)
+        slots = self.free[self.free_count - count:self.free_count].copy()
+        self.free_count -= count
+        self.active[slots] = True
+        return slots
+
+    def release(self, slots):
+        """Deactivate `slots` and push them back onto the free list."""
+        self.active[slots] = False
+        self.free[self.free_count:self.free_count + len(slots)] = slots
+        self.free_count += len(slots)
+
+    def in_flight(self):
+        return self.capacity - self.free_count
+
+
+class TargetGrid:
+    def __init__(self, cell_size=None):
+        """
+        Uniform grid over the x-axis bucketing targets for nearest-target queries.
+
+        Targets are kept sorted by x, and `cell_start[c]` is the first of them in cell `c` (a
+        compressed, counting-sort layout), so a query finds its cell's slice of targets with one
+        division instead of a search, and touches a handful of targets instead of all of them.
+
+        Args:
+            cell_size (float): Cell width in meters. None sizes the cells at every `build` so that
+                there is about one target per cell, which keeps scans short however dense the targets are.
+        """
+        self.cell_size = cell_size
+        self.cell = cell_size or 1.0  # Cell width in use
+        self.origin = 0.0
+        self.num_cells = 1
+        self.sorted_x = np.zeros(0)
+        self.sorted_ids = np.zeros(0, dtype=np.int64)
+        self.cell_start = np.zeros(2, dtype=np.int64)
+
+    def build(self, x, ids):
+        """Index the targets `ids` at positions `x`, spanning the grid over their extent."""
+        order = np.argsort(x, kind="stable")
+        self.sorted_x = x[order]
+        self.sorted_ids = ids[order]
+        if len(x) == 0:
+            return
+        self.origin = self.sorted_x[0]
+        extent = self.sorted_x[-1] - self.origin
+        self.cell = self.cell_size or max(extent / len(x), 1e-6)
+        self.num_cells = int(extent // self.cell) + 1
+        cells = self.cells(self.sorted_x)
+        self.cell_start = np.searchsorted(cells, np.arange(self.num_cells + 1))
+
+    def cells(self, x):
+        """Cell of every position; points beyond the targets' extent are clamped to the edge cells."""
+        return np.clip(((x - self.origin) // self.cell).astype(np.int64), 0, self.num_cells - 1)
+
+    def nearest(self, x):
+        """
+        Nearest indexed target of every point.
+
+        Because targets are sorted, the nearest one to a point in cell `c` is either in cell `c`,
+        the last target before it or the first target after it, so every query scans one cell plus
+        two neighbours, whatever the distances involved.
+
+        Args:
+            x (np.ndarray): Query positions.
+
+        Returns:
+            tuple: (target ids, absolute distances); ids are -1 and distances inf if the grid is empty.
+        """
+        best_id = np.full(len(x), -1, dtype=np.int64)
+        best_distance = np.full(len(x), np.inf)
+        if len(self.sorted_x) == 0 or len(x) == 0:
+            return best_id, best_distance
+        cells = self.cells(x)
+        lo = np.maximum(self.cell_start[cells] - 1, 0)
+        hi = np.minimum(self.cell_start[cells + 1] + 1, len(self.sorted_x))
+        best_index = np.zeros(len(x), dtype=np.int64)
+        for k in range(int((hi - lo).max())):
+            index = np.minimum(lo + k, hi - 1)
+            distance = np.abs(x - self.sorted_x[index])
+            better = distance < best_distance
+            best_distance[better] = distance[better]
+            best_index[better] = index[better]
+        best_id = self.sorted_ids[best_index]
+        return best_id, best_distance
+
+
+class SwarmEnvironment:
+    """
+    One scene with many drones, each carrying several grenades, against many targets.
+
+    Every component lives in a contiguous array: drones and targets as struct-of-arrays, falling
+    grenades in a `GrenadePool` whose landed slots are recycled. Grenade physics is the shared
+    `integrate_grenades` step of `VectorEnvironment`. Impacts are matched to targets through a
+    `TargetGrid` instead of all drone/target pairs, so a step costs time linear in the number of
+    entities.
+
+    A grenade landing within `hit_radius` of a live target destroys it and earns its drone 1000;
+    a miss costs the distance to the nearest live target. Every drone pays -0.2 per step. The
+    scene ends when all targets are destroyed, when every grenade has been dropped and has
+    landed, or after `max_steps` steps.
+    """
+
+    def __init__(self, num_drones, num_targets, grenades_per_drone=3, max_in_flight=None, dt=0.1, max_steps=100,
+                 drone_min_height=0.5, hit_radius=10, cell_size=None, wind=None, seed=None):
+        """
+        Args:
+            num_drones (int): Number of drones.
+            num_targets (int): Number of targets.
+            grenades_per_drone (int): Grenades every drone starts with.
+            max_in_flight (int): Capacity of the grenade pool (default: one per drone); drops beyond it wait.
+            dt (float): Time step for the simulation.
+            max_steps (int): Steps after which the scene is truncated (None disables truncation).
+            drone_min_height (float): Fraction of the height kept free below the drones at reset.
+            hit_radius (float): Horizontal distance within which an impact destroys a target.
+            cell_size (float): Width of the spatial grid cells (default: sized to about one target per cell).
+            wind (WindFieldCache or dict): Bank of wind fields; each scene draws one and every grenade
+                samples it at its own position. None keeps one constant wind per scene.
+            seed (int): Seed for the environment random generator.
+        """
+        self.num_drones = num_drones
+        self.num_targets = num_targets
+        self.grenades_per_drone = grenades_per_drone
+        self.dt = dt
+        self.max_steps = max_steps
+        self.drone_min_height = drone_min_height
+        self.hit_radius = hit_radius
+        self.rng = np.random.default_rng(seed)
+        self.wind_fields = WindFieldCache(**wind) if isinstance(wind, dict) else wind
+        self.wind_field = None
+
+        grenade = Grenade(0, 0)
+        self.mass = grenade.mass
+        self.terminal_velocity = grenade.terminal_velocity
+        self.drag_factor = 0.5 * AIR_DENSITY * grenade.drag_coefficient * grenade.cross_sectional_area
+
+        self.drone_x = np.zeros(num_drones)
+        self.drone_y = np.zeros(num_drones)
+        self.ammo = np.zeros(num_drones, dtype=np.int64)
+        self.target_x = np.zeros(num_targets)
+        self.target_alive = np.zeros(num_targets, dtype=bool)
+        self.grenades = GrenadePool(max_in_flight or num_drones)
+        self.grid = TargetGrid(cell_size)
+        self.wind_x = 0.0
+        self.steps = 0
+
+    def reset(self, seed=None):
+        """
+        Start a new scene and return the drone observations of shape (num_drones, 9).
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        rng = self.rng
+        drone_max_y = int(HEIGHT - (HEIGHT * self.drone_min_height))
+        self.drone_x[:] = rng.integers(0, WIDTH, size=self.num_drones, endpoint=True)
+        self.drone_y[:] = rng.integers(0, drone_max_y, size=self.num_drones, endpoint=True)
+        self.ammo[:] = self.grenades_per_drone
+        self.target_x[:] = rng.uniform(40, WIDTH - 40, size=self.num_targets)
+        self.target_alive[:] = True
+        self.grid.build(self.target_x, np.arange(self.num_targets))
+        self.grenades.clear()
+        if self.wind_fields is None:
+            self.wind_x = float(rng.uniform(-WIND_FORCE_MAX, WIND_FORCE_MAX))
+        else:
+            self.wind_field = self.wind_fields.draw(rng)
+            self.wind_x = self.wind_field.x
+        self.steps = 0
+        return self._get_observation()
+
+    def step(self, actions):
+        """
+        Advance the scene by one time step.
+
+        Args:
+            actions (array-like): One action per drone (0 right, 1 left, 2 drop, anything else idles).
+
+        Returns:
+            tuple: (observations, rewards, done, info) with one observation row and reward per drone;
+            info holds "hits" and "misses" of this step and "targets_left".
+        """
+        actions = np.asarray(actions)
+        dt = self.dt
+        self.drone_x += np.where(actions == 0, 10 * dt, np.where(actions == 1, -10 * dt, 0.0))
+
+        # Drops take a free pool slot; without one the drone keeps its grenade
+        droppers = np.flatnonzero((actions == 2) & (self.ammo > 0))
+        slots = self.grenades.allocate(len(droppers))
+        droppers = droppers[:len(slots)]
+        pool = self.grenades
+        pool.x[slots] = self.drone_x[droppers]
+        pool.y[slots] = self.drone_y[droppers] + 1
+        pool.vx[slots] = 0.0
+        pool.vy[slots] = 0.0
+        pool.owner[slots] = droppers
+        self.ammo[droppers] -= 1
+
+        rewards = np.full(self.num_drones, -0.2)
+        hits = misses = 0
+        flying = np.flatnonzero(pool.active)
+        if flying.size:
+            x, y = pool.x[flying], pool.y[flying]
+            wind_x, wind_y = (self.wind_x, 0.0) if self.wind_field is None else self.wind_field.sample(x, y)
+            x, y, vx, vy, landed = integrate_grenades(x, y, pool.vx[flying], pool.vy[flying], wind_x, dt,
+                                                      self.drag_factor, self.mass, self.terminal_velocity, wind_y)
+            pool.x[flying], pool.y[flying], pool.vx[flying], pool.vy[flying] = x, y, vx, vy
+            if landed.any():
+                hits, misses = self._resolve_impacts(flying[landed], rewards)
+        self.steps += 1
+
+        targets_left = int(self.target_alive.sum())
+        done = targets_left == 0 or (not self.ammo.any() and pool.in_flight() == 0)
+        if self.max_steps is not None and self.steps >= self.max_steps:
+            done = True
+        info = {"hits": hits, "misses": misses, "targets_left": targets_left}
+        return self._get_observation(), rewards, done, info
+
+    def _resolve_impacts(self, slots, rewards):
+        """Score the grenades in `slots` that just landed, destroy hit targets and free the slots."""
+        pool = self.grenades
+        target_ids, distances = self.grid.nearest(pool.x[slots])
+        hit = distances <= self.hit_radius
+        # Misses cost the distance to the nearest live target (nothing once all are destroyed)
+        impact_rewards = np.where(hit, 1000.0, -np.where(np.isfinite(distances), distances, 0.0))
+        np.add.at(rewards, pool.owner[slots], impact_rewards)
+        if hit.any():
+            self.target_alive[target_ids[hit]] = False
+            alive = np.flatnonzero(self.target_alive)
+            self.grid.build(self.target_x[alive], alive)
+        pool.release(slots)
+        return int(hit.sum()), int((~hit).sum())
+
+    def _get_observation(self):
+        """Per-drone rows laid out like `Environment._get_observation`, against the nearest live target."""
+        target_ids, _ = self.grid.nearest(self.drone_x)
+        target_x = np.where(target_ids >= 0, self.target_x[np.maximum(target_ids, 0)], self.drone_x)
+        return np.stack([
+            self.drone_x, self.drone_y,
+            self.drone_x, self.drone_y + 1,  # The next grenade hangs below the drone
+            target_x, np.full(self.num_drones, float(HEIGHT)),
+            np.full(self.num_drones, self.wind_x), np.zeros(self.num_drones),
+            (self.ammo == 0).astype(np.float64),
+        ], axis=1)
@@ -0,0 +1,195 @@
+from bisect import bisect_right
+from collections import OrderedDict
+
+import numpy as np
+
+from constants import HEIGHT, WIND_FORCE_MAX
+from environment.vector_environment import VectorEnvironment
+
+class TrajectoryOracle:
+    def __init__(self, dt=0.1, heights=None, velocities=None, winds=None, cache_size=4096, cache_decimals=2):
+        """
+        Lookup table of where a released grenade lands, built once by integrating the whole grid in batch.
+
+        The table is indexed by fall height (HEIGHT - release y), initial horizontal velocity and wind,
+        and stores the horizontal impact offset from the release point and the time of flight. Queries
+        interpolate trilinearly; scalar queries are memoized in an LRU cache.
+
+        Args:
+            dt (float): Time step of the environment the table is built for.
+            heights (np.ndarray): Fall height grid in meters (default: 0 to HEIGHT every meter).
+            velocities (np.ndarray): Initial horizontal velocity grid in m/s (default: -10 to 10).
+            winds (np.ndarray): Wind grid in m/s (default: every m/s within +/- WIND_FORCE_MAX).
+            cache_size (int): Maximum number of memoized scalar queries.
+            cache_decimals (int): Scalar query arguments are rounded to this many decimals for the cache key.
+        """
+        self.dt = dt
+        self.heights = np.linspace(0, HEIGHT, HEIGHT + 1) if heights is None else np.asarray(heights, dtype=np.float64)
+        self.velocities = np.linspace(-10, 10, 5) if velocities is None else np.asarray(velocities, dtype=np.float64)
+        self.winds = np.linspace(-WIND_FORCE_MAX, WIND_FORCE_MAX, 2 * WIND_FORCE_MAX + 1) if winds is None else np.asarray(winds, dtype=np.float64)
+        self.cache_size = cache_size
+        self.cache_decimals = cache_decimals
+        self._cache = OrderedDict()
+
+        h, v, w = np.meshgrid(self.heights, self.velocities, self.winds, indexing="ij")
+        offsets, times = simulate_impacts(h.ravel(), v.ravel(), w.ravel(), dt)
+        shape = h.shape
+        self.offsets = offsets.reshape(shape)
+        self.times = times.reshape(shape)
+        # Python-native copies for the scalar path, where NumPy call overhead would dominate
+        self._axes = [axis.tolist() for axis in (self.heights, self.velocities, self.winds)]
+        self._offsets = self.offsets.tolist()
+        self._times = self.times.tolist()
+
+    def query(self, heights, velocities, winds):
+        """
+        Vectorized trilinear interpolation of the table.
+
+        Args:
+            heights (array-like): Fall heights in meters.
+            velocities (array-like): Initial horizontal velocities in m/s.
+            winds (array-like): Wind speeds in m/s.
+
+        Returns:
+            tuple: (impact x-offsets, times of flight) as arrays broadcast from the inputs.
+        """
+        heights, velocities, winds = np.broadcast_arrays(
+            np.asarray(heights, dtype=np.float64), np.asarray(velocities, dtype=np.float64), np.asarray(winds, dtype=np.float64)
+        )
+        axes = (self.heights, self.velocities, self.winds)
+        corners = [_bracket(axis, values) for axis, values in zip(axes, (heights, velocities, winds))]
+        offsets = np.zeros(heights.shape)
+        times = np.zeros(heights.shape)
+        for corner in range(8):
+            index = []
+            weight = np.ones(heights.shape)
+            for axis, (lower, fraction) in enumerate(corners):
+                upper = (corner >> axis) & 1
+                index.append(np.minimum(lower + upper, len(axes[axis]) - 1))
+                weight = weight * (fraction if upper else 1 - fraction)
+            offsets += weight * self.offsets[tuple(index)]
+            times += weight * self.times[tuple(index)]
+        return offsets, times
+
+    def predict(self, release_y, wind, velocity=0.0):
+        """
+        Impact x-offset and time of flight for one release, memoized with LRU eviction.
+
+        Args:
+            release_y (float): Grenade y-coordinate at release (screen coordinates, ground at HEIGHT).
+            wind (float): Horizontal wind in m/s.
+            velocity (float): Initial horizontal velocity in m/s.
+
+        Returns:
+            tuple: (impact x-offset, time of flight) as floats.
+        """
+        decimals = self.cache_decimals
+        key = (round(float(release_y), decimals), round(float(wind), decimals), round(float(velocity), decimals))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        result = self._interpolate_scalar(HEIGHT - key[0], key[2], key[1])
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def _interpolate_scalar(self, height, velocity, wind):
+        """Trilinear interpolation on Python floats; same result as `query` for a single point."""
+        brackets = []
+        for axis, value in zip(self._axes, (height, velocity, wind)):
+            if len(axis) == 1:
+                brackets.append((0, 0, 0.0))
+                continue
+            value = min(max(value, axis[0]), axis[-1])
+            lower = min(max(bisect_right(axis, value) - 1, 0), len(axis) - 2)
+            brackets.append((lower, lower + 1, (value - axis[lower]) / (axis[lower + 1] - axis[lower])))
+        (h0, h1, fh), (v0, v1, fv), (w0, w1, fw) = brackets
+        offset = 0.0
+        time_of_flight = 0.0
+        for h, weight_h in ((h0, 1 - fh), (h1, fh)):
+            for v, weight_v in ((v0, 1 - fv), (v1, fv)):
+                weight_hv = weight_h * weight_v
+                offsets = self._offsets[h][v]
+                times = self._times[h][v]
+                for w, weight_w in ((w0, 1 - fw), (w1, fw)):
+                    weight = weight_hv * weight_w
+                    offset += weight * offsets[w]
+                    time_of_flight += weight * times[w]
+        return offset, time_of_flight
+
+    def predicted_miss(self, observation):
+        """
+        Signed horizontal distance between the target and where the grenade would land if dropped now.
+
+        Args:
+            observation (list): Observation as returned by `Environment`.
+
+        Returns:
+            float: Predicted impact x minus target x.
+        """
+        grenade_x, grenade_y, target_x, wind_x = observation[2], observation[3], observation[4], observation[6]
+        offset, _ = self.predict(grenade_y, wind_x)
+        return grenade_x + offset - target_x
+
+    def features(self, observation):
+        """Oracle observation features: [predicted miss, time of flight]."""
+        offset, time_of_flight = self.predict(observation[3], observation[6])
+        return [observation[2] + offset - observation[4], time_of_flight]
+
+    def shaping_reward(self, observation, scale=0.01):
+        """Dense shaping term that grows as the predicted impact approaches the target."""
+        return -scale * abs(self.predicted_miss(observation))
+
+    def act(self, observation, tolerance=0.5):
+        """
+        Baseline policy: fly towards the release point that lands on the target, then drop.
+
+        Args:
+            observation (list): Observation as returned by `Environment`.
+            tolerance (float): Drop once the predicted miss is within this many meters.
+
+        Returns:
+            int: 0 (right), 1 (left) or 2 (drop).
+        """
+        miss = self.predicted_miss(observation)
+        if abs(miss) <= tolerance:
+            return 2
+        return 1 if miss > 0 else 0
+
+
+def simulate_impacts(heights, velocities, winds, dt=0.1):
+    """
+    Integrate released grenades to the ground in batch with the `VectorEnvironment` physics.
+
+    Args:
+        heights (np.ndarray): Fall heights in meters.
+        velocities (np.ndarray): Initial horizontal velocities in m/s.
+        winds (np.ndarray): Wind speeds in m/s.
+        dt (float): Time step.
+
+    Returns:
+        tuple: (impact x-offsets, times of flight) arrays.
+    """
+    env = VectorEnvironment(len(heights), dt=dt, max_steps=None)
+    env.grenade_y[:] = HEIGHT - np.asarray(heights, dtype=np.float64)
+    env.grenade_vx[:] = velocities
+    env.wind_x[:] = winds
+    env.released[:] = True
+    times = np.zeros(len(heights))
+    while not env.hit_ground.all():
+        falling = ~env.hit_ground
+        env._update_grenades(dt)
+        times[falling] += dt
+    return env.grenade_x.copy(), times
+
+
+def _bracket(axis, values):
+    """Lower grid index and interpolation fraction of each value along one axis (clamped to the grid)."""
+    if len(axis) == 1:
+        return np.zeros(values.shape, dtype=np.int64), np.zeros(values.shape)
+    values = np.clip(values, axis[0], axis[-1])
+    lower = np.clip(np.searchsorted(axis, values, side="right") - 1, 0, len(axis) - 2)
+    fraction = (values - axis[lower]) / (axis[lower + 1] - axis[lower])
+    return lower, fraction
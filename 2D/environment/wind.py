@@ -0,0 +1,181 @@
+import numpy as np
+
+from constants import WIDTH, HEIGHT, WIND_FORCE_MAX
+
+PROFILES = ("uniform", "linear", "power")
+
+
+def altitude_profile(altitude, profile="power", alpha=1 / 7):
+    """
+    Wind speed multiplier by altitude, 1 at the top of the domain.
+
+    Args:
+        altitude (np.ndarray): Height above the ground in meters.
+        profile (str): "uniform" (no shear), "linear" (proportional to altitude) or "power"
+            (boundary-layer power law, (altitude / HEIGHT) ** alpha).
+        alpha (float): Exponent of the power law; 1/7 is the usual neutral-atmosphere value.
+    """
+    fraction = np.clip(altitude / HEIGHT, 0.0, 1.0)
+    if profile == "uniform":
+        return np.ones_like(fraction)
+    if profile == "linear":
+        return fraction
+    if profile == "power":
+        return fraction ** alpha
+    raise ValueError(f"Unknown wind profile: {profile}")
+
+
+class WindField:
+    def __init__(self, u, v, cell=5.0, reference=(0.0, 0.0)):
+        """
+        Wind on a regular grid over the scene, sampled by bilinear interpolation.
+
+        Node (j, i) sits at x = i * cell, y = j * cell (screen coordinates, y grows downwards);
+        positions outside the grid are clamped to its border. `x` and `y` hold the reference
+        (top-of-domain) wind, so a field can stand in wherever a constant wind `Vector` is read
+        for observations or display.
+
+        Args:
+            u (np.ndarray): Horizontal wind in m/s, shape (ny, nx).
+            v (np.ndarray): Vertical wind in m/s (positive downwards), shape (ny, nx).
+            cell (float): Grid spacing in meters.
+            reference (tuple): Reference wind (x, y) in m/s.
+        """
+        self.u = u
+        self.v = v
+        self.cell = cell
+        self.x, self.y = reference
+        self._inv_cell = 1.0 / cell
+        self._max_i = u.shape[1] - 1
+        self._max_j = u.shape[0] - 1
+        # Nested lists make the scalar path a handful of list lookups instead of NumPy indexing
+        self._u_rows = u.tolist()
+        self._v_rows = v.tolist()
+        self._calm_v = not v.any()
+
+    @classmethod
+    def generate(cls, rng, wind=None, profile="power", alpha=1 / 7, gust_strength=0.0, gust_scale=30.0,
+                 vertical_gust_strength=0.0, cell=5.0):
+        """
+        Draw a field: a reference wind shaped by an altitude profile, plus smooth gust noise.
+
+        Gusts are Gaussian values on a coarse grid with `gust_scale` spacing, bilinearly refined to
+        the field grid, so they vary smoothly over about `gust_scale` meters.
+
+        Args:
+            rng (np.random.Generator): Random stream.
+            wind (float): Reference horizontal wind in m/s (default: uniform in +/- WIND_FORCE_MAX).
+            profile (str): Altitude profile, see `altitude_profile`.
+            alpha (float): Power-law exponent.
+            gust_strength (float): Standard deviation of horizontal gusts in m/s.
+            gust_scale (float): Gust correlation length in meters.
+            vertical_gust_strength (float): Standard deviation of vertical gusts in m/s.
+            cell (float): Grid spacing in meters.
+        """
+        if wind is None:
+            wind = float(rng.uniform(-WIND_FORCE_MAX, WIND_FORCE_MAX))
+        nx = int(np.ceil(WIDTH / cell)) + 1
+        ny = int(np.ceil(HEIGHT / cell)) + 1
+        y = np.arange(ny) * cell
+        u = np.repeat((wind * altitude_profile(HEIGHT - y, profile, alpha))[:, None], nx, axis=1)
+        v = np.zeros((ny, nx))
+        if gust_strength > 0 or vertical_gust_strength > 0:
+            coarse_shape = (int(np.ceil(HEIGHT / gust_scale)) + 1, int(np.ceil(WIDTH / gust_scale)) + 1)
+            gusts = cls(rng.normal(0.0, gust_strength, coarse_shape),
+                        rng.normal(0.0, vertical_gust_strength, coarse_shape), cell=gust_scale)
+            grid_x, grid_y = np.meshgrid(np.arange(nx) * cell, y)
+            gust_u, gust_v = gusts.sample(grid_x.ravel(), grid_y.ravel())
+            u += gust_u.reshape(ny, nx)
+            v += gust_v.reshape(ny, nx)
+        return cls(u, v, cell, (wind, 0.0))
+
+    def at(self, x, y):
+        """Wind (x, y) in m/s at one position; pure Python for the per-grenade update path."""
+        fx = x * self._inv_cell
+        fy = y * self._inv_cell
+        fx = 0.0 if fx < 0.0 else (self._max_i if fx > self._max_i else fx)
+        fy = 0.0 if fy < 0.0 else (self._max_j if fy > self._max_j else fy)
+        i = min(int(fx), self._max_i - 1)
+        j = min(int(fy), self._max_j - 1)
+        tx = fx - i
+        ty = fy - j
+        rows = self._u_rows
+        top = rows[j][i] + (rows[j][i + 1] - rows[j][i]) * tx
+        bottom = rows[j + 1][i] + (rows[j + 1][i + 1] - rows[j + 1][i]) * tx
+        wind_x = top + (bottom - top) * ty
+        if self._calm_v:
+            return wind_x, 0.0
+        rows = self._v_rows
+        top = rows[j][i] + (rows[j][i + 1] - rows[j][i]) * tx
+        bottom = rows[j + 1][i] + (rows[j + 1][i + 1] - rows[j + 1][i]) * tx
+        return wind_x, top + (bottom - top) * ty
+
+    def sample(self, x, y):
+        """Wind components at many positions at once; returns (wind_x, wind_y) arrays."""
+        return _bilinear(self.u[None], self.v[None], np.zeros(np.shape(x), dtype=np.int64), x, y, self.cell)
+
+
+def _bilinear(u, v, index, x, y, cell):
+    """Bilinear interpolation of fields u[index], v[index] (stacked (K, ny, nx) grids) at (x, y)."""
+    max_j, max_i = u.shape[1] - 1, u.shape[2] - 1
+    fx = np.clip(np.asarray(x, dtype=np.float64) / cell, 0.0, max_i)
+    fy = np.clip(np.asarray(y, dtype=np.float64) / cell, 0.0, max_j)
+    i = np.minimum(fx.astype(np.int64), max_i - 1)
+    j = np.minimum(fy.astype(np.int64), max_j - 1)
+    tx = fx - i
+    ty = fy - j
+    # Flat offsets of the four corners into the raveled (K, ny, nx) arrays; the +1 neighbours always
+    # exist because i <= max_i - 1 and j <= max_j - 1 on grids of at least two nodes per axis
+    nx = max_i + 1
+    corner = (np.asarray(index) * (max_j + 1) + j) * nx + i
+    components = []
+    for grid in (u, v):
+        flat = grid.reshape(-1)
+        c00 = flat.take(corner)
+        c01 = flat.take(corner + 1)
+        c10 = flat.take(corner + nx)
+        c11 = flat.take(corner + nx + 1)
+        top = c00 + (c01 - c00) * tx
+        bottom = c10 + (c11 - c10) * tx
+        components.append(top + (bottom - top) * ty)
+    return components[0], components[1]
+
+
+class WindFieldCache:
+    def __init__(self, size=64, seed=0, **field_kwargs):
+        """
+        Bank of pre-generated wind fields stored as one stacked array.
+
+        Episodes draw a field from the bank at reset instead of generating one, and vectorized
+        environments sample every slot's own field in one call (`sample`). The bank is rebuilt
+        identically from `config()`, which is what episode logs record.
+
+        Args:
+            size (int): Number of fields.
+            seed (int): Seed of the generation stream.
+            **field_kwargs: Passed to `WindField.generate` (profile, gust_strength, ...).
+        """
+        self.size = size
+        self.seed = seed
+        self.field_kwargs = field_kwargs
+        rng = np.random.default_rng(seed)
+        fields = [WindField.generate(rng, **field_kwargs) for _ in range(size)]
+        self.cell = fields[0].cell
+        self.u = np.stack([field.u for field in fields])
+        self.v = np.stack([field.v for field in fields])
+        self.reference_x = np.array([field.x for field in fields])
+        self.fields = [WindField(self.u[k], self.v[k], self.cell, (field.x, field.y)) for k, field in enumerate(fields)]
+
+    def __len__(self):
+        return self.size
+
+    def draw(self, rng):
+        """A field chosen uniformly with `rng`."""
+        return self.fields[int(rng.integers(self.size))]
+
+    def sample(self, index, x, y):
+        """Wind at (x, y) in field `index`, all arrays of one shape; returns (wind_x, wind_y)."""
+        return _bilinear(self.u, self.v, index, x, y, self.cell)
+
+    def config(self):
+        return {"size": self.size, "seed": self.seed, **self.field_kwargs}
@@ -0,0 +1 @@
+from evaluation.evaluator import evaluate_checkpoints, evaluate_policy, evaluate_seeds, find_checkpoints, summarize, format_report
@@ -0,0 +1,234 @@
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+
+import numpy as np
+
+from utils import spawn_seeds
+
+Z_95 = 1.959964  # Two-sided 95% normal quantile
+
+
+def find_checkpoints(directory):
+    """`model_episode_<n>.pth` files of `directory`, ordered by episode number."""
+    models = []
+    for name in os.listdir(directory):
+        match = re.fullmatch(r"model_episode_(\d+)\.pth", name)
+        if match:
+            models.append((int(match.group(1)), os.path.join(directory, name)))
+    return [path for _, path in sorted(models)]
+
+
+def _init_worker():
+    import torch
+
+    torch.set_num_threads(1)  # One core per worker; parallelism comes from the pool
+
+
+_loaded = {}  # Per-process cache of the last loaded policy, keyed by checkpoint path
+
+
+def _load_policy(model_path, state_size, action_size):
+    if model_path not in _loaded:
+        import torch
+
+        from agent.agent import QNetwork
+        from agent.inference import NumpyQNetwork
+
+        q_network = QNetwork(state_size, action_size)
+        q_network.load_state_dict(torch.load(model_path))
+        q_network.eval()
+        _loaded.clear()
+        _loaded[model_path] = (q_network, NumpyQNetwork(q_network))
+    return _loaded[model_path][1]
+
+
+def evaluate_seeds(model_path, seeds, state_size=9, action_size=3, max_episode_steps=200, env_kwargs=None,
+                   lockstep=64):
+    """
+    Load a checkpoint and run `evaluate_policy` with its greedy policy.
+
+    Args:
+        model_path (str): Checkpoint (`QNetwork` state dict) to evaluate.
+        seeds (list): One episode seed per episode.
+        state_size (int): Length of an observation vector.
+        action_size (int): Number of discrete actions.
+        max_episode_steps (int): Steps after which an episode without a landing is cut.
+        env_kwargs (dict): Extra `Environment` constructor arguments.
+        lockstep (int): Number of environments stepped together.
+    """
+    policy = _load_policy(model_path, state_size, action_size)
+    return evaluate_policy(policy, seeds, state_size, max_episode_steps, env_kwargs, lockstep)
+
+
+def evaluate_policy(policy, seeds, state_size=9, max_episode_steps=200, env_kwargs=None, lockstep=64):
+    """
+    Run one greedy, headless episode per seed.
+
+    Up to `lockstep` environments advance together so the Q-network runs once per step on a
+    (lockstep, state_size) batch instead of once per environment.
+
+    Args:
+        policy (callable): Maps a float32 (batch, state_size) array to Q-values, e.g. `build_policy(...)`.
+        seeds (list): One episode seed per episode; the same seeds give the same episodes.
+        state_size (int): Length of an observation vector.
+        max_episode_steps (int): Steps after which an episode without a landing is cut.
+        env_kwargs (dict): Extra `Environment` constructor arguments.
+        lockstep (int): Number of environments stepped together.
+
+    Returns:
+        dict: Per-episode arrays "hit", "landed", "miss_distance" (NaN if not landed), "length" and "reward".
+    """
+    from environment import Environment
+
+    n = len(seeds)
+    hit = np.zeros(n, dtype=bool)
+    landed = np.zeros(n, dtype=bool)
+    miss_distance = np.full(n, np.nan)
+    length = np.zeros(n, dtype=np.int64)
+    total_reward = np.zeros(n)
+
+    envs = [Environment(**(env_kwargs or {})) for _ in range(min(lockstep, n))]
+    episode_of = [None] * len(envs)  # Episode index each environment is running
+    states = np.zeros((len(envs), state_size), dtype=np.float32)
+    next_episode = 0
+    for slot, env in enumerate(envs):
+        states[slot] = env.reset(seed=seeds[next_episode])
+        episode_of[slot] = next_episode
+        next_episode += 1
+
+    active = list(range(len(envs)))
+    while active:
+        actions = policy(states[active]).argmax(axis=1)
+        still_active = []
+        for slot, action in zip(active, actions.tolist()):
+            env, episode = envs[slot], episode_of[slot]
+            state, reward, done, info = env.step(action)
+            total_reward[episode] += reward
+            if not done and env.steps < max_episode_steps:
+                states[slot] = state
+                still_active.append(slot)
+                continue
+            length[episode] = env.steps
+            if done:
+                landed[episode] = True
+                hit[episode] = info["hit"]  # The reward of a coasted fall is a discounted sum, not the hit bonus
+                miss_distance[episode] = abs(env.grenade.coordinates.x - env.target.coordinates.x)
+            if next_episode < n:
+                states[slot] = env.reset(seed=seeds[next_episode])
+                episode_of[slot] = next_episode
+                next_episode += 1
+                still_active.append(slot)
+        active = still_active
+
+    return {"hit": hit, "landed": landed, "miss_distance": miss_distance, "length": length, "reward": total_reward}
+
+
+def _mean_interval(values):
+    """Mean with a normal-approximation 95% confidence interval."""
+    values = values[~np.isnan(values)] if values.dtype.kind == "f" else values
+    if len(values) == 0:
+        return {"mean": None, "ci95": None}
+    mean = float(values.mean())
+    half = Z_95 * float(values.std(ddof=1)) / math.sqrt(len(values)) if len(values) > 1 else float("inf")
+    return {"mean": mean, "ci95": [mean - half, mean + half]}
+
+
+def _wilson_interval(successes, n):
+    """Wilson score 95% interval for a binomial proportion; well behaved at rates near 0 or 1."""
+    if n == 0:
+        return {"mean": None, "ci95": None}
+    p = successes / n
+    denominator = 1 + Z_95 ** 2 / n
+    centre = (p + Z_95 ** 2 / (2 * n)) / denominator
+    half = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n ** 2)) / denominator
+    return {"mean": p, "ci95": [centre - half, centre + half]}
+
+
+def summarize(results):
+    """
+    Aggregate per-episode arrays from `evaluate_seeds`.
+
+    Returns:
+        dict: Episode count plus hit rate (Wilson interval), landing rate, and mean miss distance,
+        episode length and reward (normal intervals), each as {"mean", "ci95"}.
+    """
+    n = len(results["hit"])
+    return {
+        "episodes": n,
+        "hit_rate": _wilson_interval(int(results["hit"].sum()), n),
+        "landed_rate": _wilson_interval(int(results["landed"].sum()), n),
+        "miss_distance": _mean_interval(results["miss_distance"]),
+        "length": _mean_interval(results["length"].astype(np.float64)),
+        "reward": _mean_interval(results["reward"]),
+    }
+
+
+def _rank_key(entry):
+    miss = entry["miss_distance"]["mean"]
+    return (-entry["hit_rate"]["mean"], math.inf if miss is None else miss)
+
+
+def evaluate_checkpoints(model_paths, episodes=1000, seed=0, workers=None, chunk_size=250, state_size=9,
+                         action_size=3, max_episode_steps=200, env_kwargs=None):
+    """
+    Evaluate checkpoints in parallel on one shared, fixed set of episode seeds.
+
+    Every checkpoint is split into chunks of `chunk_size` episodes, and all (checkpoint, chunk)
+    tasks are spread over a process pool, so a single checkpoint still uses every worker.
+
+    Args:
+        model_paths (list): Checkpoints to evaluate.
+        episodes (int): Greedy episodes per checkpoint.
+        seed (int): Root of the episode seeds; every checkpoint sees the same episodes.
+        workers (int): Worker processes (default: CPU count; 0 evaluates in this process).
+        chunk_size (int): Episodes per task.
+        state_size (int): Length of an observation vector.
+        action_size (int): Number of discrete actions.
+        max_episode_steps (int): Steps after which an episode without a landing is cut.
+        env_kwargs (dict): Extra `Environment` constructor arguments.
+
+    Returns:
+        list: One summary per checkpoint (see `summarize`) with its "model" path, best first
+        (highest hit rate, then lowest mean miss distance).
+    """
+    seeds = spawn_seeds(seed, episodes)
+    chunks = [seeds[start:start + chunk_size] for start in range(0, episodes, chunk_size)]
+    tasks = [(path, chunk) for path in model_paths for chunk in chunks]
+    arguments = (state_size, action_size, max_episode_steps, env_kwargs)
+
+    if workers == 0:
+        outputs = [evaluate_seeds(path, chunk, *arguments) for path, chunk in tasks]
+    else:
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"),
+                                 initializer=_init_worker) as pool:
+            futures = [pool.submit(evaluate_seeds, path, chunk, *arguments) for path, chunk in tasks]
+            outputs = [future.result() for future in futures]
+
+    report = []
+    for i, path in enumerate(model_paths):
+        parts = outputs[i * len(chunks):(i + 1) * len(chunks)]
+        results = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+        report.append({"model": path, **summarize(results)})
+    return sorted(report, key=_rank_key)
+
+
+def format_report(report):
+    """Ranked plain-text table of `evaluate_checkpoints` output."""
+    def interval(stat, scale=1.0, precision=1):
+        if stat["mean"] is None:
+            return "n/a"
+        low, high = stat["ci95"]
+        return f"{stat['mean'] * scale:.{precision}f} [{low * scale:.{precision}f}, {high * scale:.{precision}f}]"
+
+    width = max([len("model")] + [len(entry["model"]) for entry in report])
+    lines = [f"{'rank':>4}  {'model':<{width}}  {'episodes':>8}  {'hit rate % (95% CI)':>22}  "
+             f"{'miss distance (95% CI)':>24}  {'length (95% CI)':>22}"]
+    for rank, entry in enumerate(report, 1):
+        lines.append(f"{rank:>4}  {entry['model']:<{width}}  {entry['episodes']:>8}  "
+                     f"{interval(entry['hit_rate'], 100):>22}  {interval(entry['miss_distance']):>24}  "
+                     f"{interval(entry['length']):>22}")
+    return "\n".join(lines)
@@ -0,0 +1,2 @@
+from export.runtime import NumpyPolicy, TorchScriptPolicy, load_policy
+from export.exporter import export_checkpoint, checkpoint_policy, check_parity, sample_states
@@ -0,0 +1,152 @@
+import json
+import os
+
+import numpy as np
+
+from export.runtime import FORMAT_VERSION, NumpyPolicy, artifact_format, load_policy
+
+
+def _load_q_network(model_path, state_size, action_size):
+    import torch
+
+    from agent.agent import QNetwork
+
+    q_network = QNetwork(state_size, action_size)
+    q_network.load_state_dict(torch.load(model_path, map_location="cpu"))
+    q_network.eval()
+    return q_network
+
+
+def checkpoint_policy(model_path, state_size=9, action_size=3):
+    """`NumpyPolicy` straight from a `QNetwork` checkpoint, without writing an artifact (needs torch)."""
+    q_network = _load_q_network(model_path, state_size, action_size)
+    layers = (q_network.fc1, q_network.fc2, q_network.fc3, q_network.fc4)
+    return NumpyPolicy([layer.weight.detach().numpy().T for layer in layers],
+                       [layer.bias.detach().numpy() for layer in layers],
+                       {"source": os.path.abspath(model_path), "quantized": False})
+
+
+def _quantize(weight):
+    """Symmetric per-output-channel int8 quantization of an (in, out) matrix; returns (int8 values, float32 scales)."""
+    scale = np.abs(weight).max(axis=0) / 127.0
+    scale[scale == 0] = 1.0
+    values = np.clip(np.rint(weight / scale), -127, 127).astype(np.int8)
+    return values, scale.astype(np.float32)
+
+
+def export_checkpoint(model_path, output, quantize=False, state_size=9, action_size=3):
+    """
+    Freeze a `QNetwork` checkpoint into an inference-only artifact.
+
+    The format follows the extension of `output`:
+      - `.npz`: the layers as contiguous (in, out) float32 matrices and biases, loaded and run with
+        NumPy alone. `quantize` stores int8 weights with per-output-channel scales (4x smaller
+        weights, dequantized once at load).
+      - `.pt`: a TorchScript module with its metadata embedded. `quantize` applies torch dynamic
+        quantization, so the linear layers run int8 kernels with activations quantized per batch.
+
+    The file is written next to `output` and renamed over it, so a policy server watching the path
+    never reads a partial artifact.
+
+    Args:
+        model_path (str): `QNetwork` state dict saved by training (`brains/model_episode_<n>.pth`).
+        output (str): Artifact path (`.npz` or `.pt`).
+        quantize (bool): Store int8 weights.
+        state_size (int): Length of an observation vector.
+        action_size (int): Number of discrete actions.
+
+    Returns:
+        dict: Artifact metadata, including its size in bytes.
+    """
+    import torch
+
+    q_network = _load_q_network(model_path, state_size, action_size)
+    layers = (q_network.fc1, q_network.fc2, q_network.fc3, q_network.fc4)
+    metadata = {
+        "format_version": FORMAT_VERSION,
+        "format": artifact_format(output),
+        "quantized": bool(quantize),
+        "state_size": state_size,
+        "action_size": action_size,
+        "layers": len(layers),
+        "source": os.path.abspath(model_path),
+    }
+    tmp_path = f"{output}.tmp"
+    if metadata["format"] == "numpy":
+        arrays = {"metadata": np.array(json.dumps(metadata))}
+        for i, layer in enumerate(layers):
+            weight = np.ascontiguousarray(layer.weight.detach().numpy().T, dtype=np.float32)
+            if quantize:
+                arrays[f"q{i}"], arrays[f"s{i}"] = _quantize(weight)
+            else:
+                arrays[f"w{i}"] = weight
+            arrays[f"b{i}"] = layer.bias.detach().numpy().astype(np.float32)
+        with open(tmp_path, "wb") as file:
+            np.savez(file, **arrays)
+    else:
+        module = q_network
+        if quantize:
+            module = torch.ao.quantization.quantize_dynamic(q_network, {torch.nn.Linear}, dtype=torch.qint8)
+        scripted = torch.jit.freeze(torch.jit.script(module))
+        torch.jit.save(scripted, tmp_path, _extra_files={"metadata.json": json.dumps(metadata)})
+    os.replace(tmp_path, output)
+    metadata["bytes"] = os.path.getsize(output)
+    return metadata
+
+
+def sample_states(count, seed=0, num_envs=256):
+    """
+    Observations visited by random play in `VectorEnvironment`, the states a deployed policy sees.
+
+    Args:
+        count (int): Number of states.
+        seed (int): Seed of the environments and the random actions.
+        num_envs (int): Environments stepped together.
+
+    Returns:
+        np.ndarray: float32 array of shape (count, 9).
+    """
+    from environment import VectorEnvironment
+
+    env = VectorEnvironment(num_envs, seed=seed)
+    rng = np.random.default_rng(seed)
+    states = [env.reset()]
+    collected = num_envs
+    while collected < count:
+        # Drop rarely so grenades are seen at every stage of their fall
+        actions = np.where(rng.random(num_envs) < 0.05, 2, rng.integers(0, 2, size=num_envs))
+        observations, _, _, _ = env.step(actions)
+        states.append(observations)
+        collected += num_envs
+    return np.concatenate(states)[:count].astype(np.float32)
+
+
+def check_parity(model_path, artifact_path, states=None, samples=100_000, seed=0):
+    """
+    Compare an exported artifact with the eager checkpoint it came from.
+
+    Args:
+        model_path (str): Original `QNetwork` checkpoint.
+        artifact_path (str): Exported artifact.
+        states (np.ndarray): States to compare on (default: `samples` states from `sample_states`).
+        samples (int): Number of sampled states when `states` is None.
+        seed (int): Seed of the sampled states.
+
+    Returns:
+        dict: Greedy action agreement rate, disagreeing states and the largest absolute Q-value error.
+    """
+    import torch
+
+    policy = load_policy(artifact_path)
+    q_network = _load_q_network(model_path, policy.state_size, policy.action_size)
+    states = sample_states(samples, seed) if states is None else np.asarray(states, dtype=np.float32)
+    with torch.inference_mode():
+        reference = q_network(torch.from_numpy(states)).numpy()
+    q_values = policy(states)
+    agree = reference.argmax(1) == q_values.argmax(1)
+    return {
+        "states": len(states),
+        "agreement": float(agree.mean()),
+        "disagreements": int((~agree).sum()),
+        "max_abs_error": float(np.abs(reference - q_values).max()),
+    }
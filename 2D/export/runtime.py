@@ -0,0 +1,140 @@
+import json
+import os
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+def artifact_format(path):
+    """"numpy" for `.npz` artifacts, "torchscript" for anything else (`.pt`)."""
+    return "numpy" if os.path.splitext(path)[1] == ".npz" else "torchscript"
+
+
+class NumpyPolicy:
+    def __init__(self, weights, biases, metadata=None):
+        """
+        Frozen greedy policy: the `QNetwork` MLP run with NumPy only, biases fused into the weights.
+
+        Inputs carry an extra constant 1 and every layer matrix an extra row holding its bias, so a
+        layer is a single `x @ W` call with no separate bias add. Hidden matrices also get a column
+        that passes the 1 on (ReLU keeps it), so the constant is set once per forward pass.
+
+        `act` reuses one preallocated input vector; give every thread its own policy.
+
+        Args:
+            weights (list): Per-layer (in, out) matrices.
+            biases (list): Per-layer bias vectors.
+            metadata (dict): Artifact metadata (sizes, quantization, source checkpoint).
+        """
+        self.metadata = metadata or {}
+        self.state_size = weights[0].shape[0]
+        self.action_size = weights[-1].shape[1]
+        self.layers = []
+        last = len(weights) - 1
+        for i, (weight, bias) in enumerate(zip(weights, biases)):
+            rows, columns = weight.shape
+            layer = np.zeros((rows + 1, columns + (i < last)), dtype=np.float32)
+            layer[:rows, :columns] = weight
+            layer[rows, :columns] = bias
+            if i < last:
+                layer[rows, columns] = 1.0  # Carries the constant input on to the next layer
+            self.layers.append(layer)
+        self._state = np.ones(self.state_size + 1, dtype=np.float32)
+
+    @classmethod
+    def load(cls, path):
+        """Read a `.npz` artifact written by `export_checkpoint`; int8 layers are dequantized once here."""
+        with np.load(path) as archive:
+            metadata = json.loads(str(archive["metadata"]))
+            layers = metadata["layers"]
+            if metadata["quantized"]:
+                # Symmetric per-output-channel int8: W = q * scale
+                weights = [archive[f"q{i}"].astype(np.float32) * archive[f"s{i}"] for i in range(layers)]
+            else:
+                weights = [archive[f"w{i}"] for i in range(layers)]
+            biases = [archive[f"b{i}"] for i in range(layers)]
+        return cls(weights, biases, metadata)
+
+    def _forward(self, x):
+        for layer in self.layers[:-1]:
+            x = x @ layer
+            np.maximum(x, 0, out=x)
+        return x @ self.layers[-1]
+
+    def __call__(self, states):
+        """
+        Args:
+            states (np.ndarray): Array of shape (batch, state_size).
+
+        Returns:
+            np.ndarray: float32 Q-values of shape (batch, action_size).
+        """
+        x = np.empty((len(states), self.state_size + 1), dtype=np.float32)
+        x[:, :self.state_size] = states
+        x[:, self.state_size] = 1.0
+        return self._forward(x)
+
+    def act(self, state):
+        """Greedy action for one state; a 1-D pass through the layers, with no batch dimension."""
+        self._state[:self.state_size] = state
+        return int(self._forward(self._state).argmax())
+
+    def act_batch(self, states):
+        """Greedy actions, int64 array of shape (batch,)."""
+        return self(states).argmax(1)
+
+
+class TorchScriptPolicy:
+    def __init__(self, module, metadata=None):
+        """
+        Frozen greedy policy backed by a TorchScript module (optionally with dynamically quantized int8 layers).
+
+        Args:
+            module (torch.jit.ScriptModule): Scripted Q-network.
+            metadata (dict): Artifact metadata.
+        """
+        import torch
+
+        self._torch = torch
+        self.module = module
+        self.metadata = metadata or {}
+        self.state_size = self.metadata.get("state_size")
+        self.action_size = self.metadata.get("action_size")
+
+    @classmethod
+    def load(cls, path):
+        import torch
+
+        extra_files = {"metadata.json": ""}
+        module = torch.jit.load(path, map_location="cpu", _extra_files=extra_files)
+        module.eval()
+        return cls(module, json.loads(extra_files["metadata.json"] or "{}"))
+
+    def __call__(self, states):
+        # The module is float32; float64 (or list) input would otherwise fail in the first layer
+        states = np.asarray(states, dtype=np.float32)
+        with self._torch.inference_mode():
+            return self.module(self._torch.from_numpy(states)).numpy()
+
+    def act(self, state):
+        return int(self(np.reshape(state, (1, -1))).argmax())
+
+    def act_batch(self, states):
+        return self(states).argmax(1)
+
+
+def load_policy(path):
+    """
+    Load an exported artifact as a greedy policy.
+
+    NumPy artifacts need neither torch nor any agent or training code; TorchScript artifacts need
+    only torch. Both policies map a float32 (batch, state_size) array to Q-values when called, and
+    provide `act(state)` and `act_batch(states)` for greedy actions.
+
+    Args:
+        path (str): `.npz` (NumPy) or `.pt` (TorchScript) file written by `export_checkpoint`.
+    """
+    if artifact_format(path) == "numpy":
+        return NumpyPolicy.load(path)
+    return TorchScriptPolicy.load(path)
@@ -1,138 +1,480 @@
+"""
+Command line entry point.
+
+Usage (from the 2D directory):
+    python main.py {human,train,sweep,collect,offline,test,eval,export,serve,bench} [options]
+    python -m main {human,train,sweep,collect,offline,test,eval,export,serve,bench} [options]
+
+Every subcommand except `bench` accepts `--config file.json`, whose keys are option names (e.g.
+"episodes", "learning_rate"); explicit flags override the file. `bench` passes all its arguments
+on to `python -m benchmarks`. Heavy dependencies (torch, NumPy, pygame) are imported only by the
+subcommands that need them, so `--help` and startup stay fast.
+"""
+import argparse
+import json
 import os
+import sys
+
+ACTION_SPACE = ["right", "left", "drop"]
+
+
+def run_human(args):
+    import pygame
+
+    from environment import Environment
+
+    env = Environment(renderMode=True, offscreen=args.offscreen, frame_dir=args.frame_dir,
+                      frame_format=args.frame_format, video_path=args.video, render_fps=args.render_fps, seed=args.seed)
+    # Reset the environment to get the initial state
+    state = env.reset()
+    done = False
+    while not done:
+        # Handle Pygame events
+        action = "none"  # Default action if no key is pressed
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                done = True
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RIGHT:
+                    action = 0  # Move drone right
+                elif event.key == pygame.K_LEFT:
+                    action = 1  # Move drone left
+                elif event.key == pygame.K_DOWN:
+                    action = 2  # Drop grenade
+        # Perform the action in the environment
+        state, reward, done, _ = env.step(action)
+        # Render the environment if renderMode is enabled
+        env.render()
+        # Display the current observation (e.g., drone position, etc.)
+        print(f"--- Simulation Status ---\n"
+              f"State: {state}\n"
+              f"Reward: {reward}\n"
+              f"Done: {done}\n"
+              f"------------------------")
+    print("Episode finished!")
+    env.close()
+
+
+# Single-process training options (with their defaults) the actor/learner mode has no counterpart for
+SINGLE_PROCESS_TRAIN_OPTIONS = {"render_every": 0, "frame_dir": None, "video": None, "resume": False, "episode_log": None,
+                                "profile": False, "cprofile_start": None, "torch_profile": False, "eval_episodes": 0}
+
+
+def run_train(args):
+    from agent import DQNAgent
+    from environment import Environment
+    from training import DistributedTrainer, Trainer
+    from utils import Profiler, spawn_seeds
+
+    agent_kwargs = dict(
+        learning_rate=args.learning_rate,
+        gamma=args.gamma,
+        epsilon_decay=args.epsilon_decay,
+        buffer_size=args.buffer_size,
+        batch_size=args.batch_size,
+        prioritized=args.prioritized,
+        train_every=args.train_every,
+        gradient_steps=args.gradient_steps,
+        target_update_interval=args.target_update_interval or None,
+        tau=args.tau,
+        double_dqn=args.double_dqn,
+        inference_backend=args.inference_backend,
+    )
+    env_kwargs = dict(integrator=args.integrator, exact_contact=args.exact_contact, coast=args.coast,
+                      coast_gamma=args.gamma)
+
+    if args.workers > 0:
+        unsupported = [name for name, default in SINGLE_PROCESS_TRAIN_OPTIONS.items() if getattr(args, name) != default]
+        if unsupported:
+            flags = ", ".join("--" + name.replace("_", "-") for name in unsupported)
+            print(f"error: {flags} not supported with --workers; drop them or train single-process", file=sys.stderr)
+            return 2
+        trainer = DistributedTrainer(args.state_size, len(ACTION_SPACE), num_workers=args.workers,
+                                     sync_interval=args.sync_interval, episodes=args.episodes,
+                                     save_dir=args.save_dir, save_every=args.save_every,
+                                     max_episode_steps=args.max_episode_steps, agent_kwargs=agent_kwargs,
+                                     env_kwargs=env_kwargs, seed=args.seed)
+        stats = trainer.run()
+        print(f"Aggregate env steps/sec with {args.workers} workers: {stats['env_steps_per_sec']:,.0f}")
+        return
+
+    env_seed, agent_seed = spawn_seeds(args.seed, 2)
+    agent = DQNAgent(args.state_size, len(ACTION_SPACE), seed=agent_seed, **agent_kwargs)
+    # Headless unless some episodes are rendered; rendering never runs on the other episodes
+    env = Environment(renderMode=args.render_every > 0, offscreen=args.offscreen, frame_dir=args.frame_dir,
+                      frame_format=args.frame_format, video_path=args.video, render_fps=args.render_fps,
+                      seed=env_seed, **env_kwargs)
+    profiler = Profiler(
+        enabled=args.profile,
+        cprofile_start=args.cprofile_start,
+        cprofile_episodes=args.cprofile_episodes,
+        torch_profile=args.torch_profile,
+        output_dir=args.profile_dir,
+    )
+    trainer = Trainer(agent, env, save_dir=args.save_dir, save_every=args.save_every, metrics_dir=args.metrics_dir,
+                      status_interval=args.status_interval, render_every=args.render_every,
+                      episode_log=args.episode_log, profiler=profiler, keep_checkpoints=args.keep_checkpoints,
+                      max_episode_steps=args.max_episode_steps, eval_episodes=args.eval_episodes)
+    if args.resume:
+        trainer.resume()
+    # --episodes is the total, so a resumed run stops where an uninterrupted one would have
+    trainer.run(max(args.episodes - trainer.episode, 0))
+    trainer.close()
+    env.close()
+
+
+def run_sweep(args):
+    from training import Sweep, format_summary
 
-import pygame
-import torch
-import pandas as pd
+    space = None
+    if args.space:
+        with open(args.space) as file:
+            space = json.load(file)
+    env_kwargs = {"integrator": args.integrator, "exact_contact": args.exact_contact, "coast": args.coast}
+    sweep = Sweep(args.sweep_dir, space=space, trials=args.trials, min_episodes=args.min_episodes,
+                  max_episodes=args.max_episodes, eta=args.eta, workers=args.workers,
+                  threads_per_worker=args.threads_per_worker, pin_cpus=not args.no_pin, env_kwargs=env_kwargs,
+                  eval_episodes=args.eval_episodes, seed=args.seed)
+    print(f"Sweeping {args.trials} trials over rungs {sweep.budgets} with {sweep.workers} workers "
+          f"x {args.threads_per_worker} threads")
+    summary = sweep.run()
+    print(format_summary(summary, sweep.space))
+    print(f"Summary written to {os.path.join(args.sweep_dir, 'summary.csv')}")
 
-from environment import Environment
-from agent import DQNAgent
 
+def run_collect(args):
+    from training import collect
 
-def main(mode="human"):
-    env = Environment(renderMode=True)
-    if mode == "human":
-        # Reset the environment to get the initial state
+    stats = collect(args.store, args.steps, workers=args.workers, policy=args.policy, model_path=args.model,
+                    epsilon=args.epsilon, num_envs=args.num_envs, chunk_size=args.chunk_size, seed=args.seed)
+    print(f"Wrote {stats['transitions']:,} transitions to {args.store} "
+          f"({stats['transitions_per_sec']:,.0f} transitions/sec)")
+
+
+def run_offline(args):
+    from agent import DQNAgent
+    from training import OfflineTrainer, TransitionStore
+
+    store = TransitionStore(args.store, seed=args.seed)
+    agent = DQNAgent(
+        store.state_size, len(ACTION_SPACE),
+        learning_rate=args.learning_rate,
+        gamma=args.gamma,
+        batch_size=args.batch_size,
+        buffer_size=1,  # Replaced by the store
+        gradient_steps=args.gradient_steps,
+        target_update_interval=args.target_update_interval or None,
+        tau=args.tau,
+        double_dqn=args.double_dqn,
+        seed=args.seed,
+    )
+    trainer = OfflineTrainer(agent, store, save_dir=args.save_dir, save_every=args.save_every)
+    stats = trainer.run(args.updates)
+    print(f"{stats['updates']:,} updates from {store.size():,} stored transitions at "
+          f"{stats['updates_per_sec']:,.0f} updates/sec, mean loss {stats['mean_loss']:.4f}")
+
+
+def latest_model(save_dir):
+    """Checkpoint with the highest episode number in `save_dir`, or None."""
+    from evaluation import find_checkpoints
+
+    models = find_checkpoints(save_dir) if os.path.isdir(save_dir) else []
+    return models[-1] if models else None
+
+
+def _load_agent(args):
+    import torch
+
+    from agent import DQNAgent
+
+    model_path = args.model or latest_model(args.save_dir)
+    if model_path is None or not os.path.exists(model_path):
+        print(f"Model file {model_path or args.save_dir + '/*.pth'} not found!")
+        return None, None
+    # Initialize agent and load the model
+    agent = DQNAgent(args.state_size, len(ACTION_SPACE), inference_backend=args.inference_backend)
+    agent.q_network.load_state_dict(torch.load(model_path))
+    agent.q_network.eval()  # Set the model to evaluation mode
+    return agent, model_path
+
+
+def run_test(args):
+    from environment import Environment
+
+    agent, model_path = _load_agent(args)
+    if agent is None:
+        return
+    print(f"Loaded model: {model_path}")
+
+    env = Environment(renderMode=True, offscreen=args.offscreen, frame_dir=args.frame_dir,
+                      frame_format=args.frame_format, video_path=args.video, render_fps=args.render_fps, seed=args.seed)
+    for trial in range(args.trials):
+        print(f"Trial {trial + 1}/{args.trials}")
         state = env.reset()
+        total_reward = 0
         done = False
+
         while not done:
-            # Handle Pygame events
-            action = "none"  # Default action if no key is pressed
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    done = True
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RIGHT:
-                        action = 0  # Move drone right
-                    elif event.key == pygame.K_LEFT:
-                        action = 1  # Move drone left
-                    elif event.key == pygame.K_DOWN:
-                        action = 2  # Drop grenade
-            # Perform the action in the environment
+            action = agent.act(state, greedy=True)  # Always take the best action
             state, reward, done, _ = env.step(action)
-            # Render the environment if renderMode is enabled
             env.render()
-            # Display the current observation (e.g., drone position, etc.)
-            print(f"--- Simulation Status ---\n"
-                  f"State: {state}\n"
-                  f"Reward: {reward}\n"
-                  f"Done: {done}\n"
-                  f"------------------------")
-        print("Episode finished!")
-
-    elif mode == "train":
-        env = Environment(renderMode=True)  # Enable rendering
-        action_space = ["right", "left", "drop"]
-        state_size = 9
-        episodes = 2000
-
-        agent = DQNAgent(state_size, len(action_space))
-
-        # Create the directory to save models if it doesn't exist
-        save_dir = "brains"
-        os.makedirs(save_dir, exist_ok=True)
-
-        plot_data = []
-
-        for episode in range(episodes):
-            state = env.reset()  # Reset the environment and get initial state
-            total_reward = 0
-            done = False
-            steps = 0
-            while not done:
-                env.score = total_reward
-                action = agent.act(state)  # Get action from agent
-                next_state, reward, done, _ = env.step(action)  # Take action in the environment
-                env.render()  # Ensure rendering happens
-                pygame.event.get()  # Process Pygame events to avoid freezing
-                agent.replay_buffer.add((state, action, reward, next_state, done))  # Add experience to replay buffer
-                agent.train()  # Train the agent using replay buffer
-                state = next_state  # Update state
-                total_reward += reward
-                steps += 1
-                if steps > 200:
-                    done = True
-                    total_reward += -1000
-
-            if (episode + 1) % 2 == 0:
-                agent.decay_epsilon()
-                plot_data.append((episode, total_reward))
-            
-            if total_reward > 0:
-                print(30*"!")
-
-            print(f"--- Simulation Status ---\n"
-                  f"Episode {episode+1}/{episodes}\n"
-                  f"Total Reward: {total_reward}\n"
-                  f"Epsilon: {agent.epsilon:.2f}\n"
-                  f"Steps: {steps}\n"
-                  f"------------------------")
-
-            # Save the model every 100 episodes
-            if (episode + 1) % 250 == 0:
-                model_path = os.path.join(save_dir, f"model_episode_{episode+1}.pth")
-                torch.save(agent.q_network.state_dict(), model_path)
-                print(f"Model saved at episode {episode+1} to {model_path}")
-        
-        df = pd.DataFrame(plot_data)
-        df.to_csv("plot_data.csv", index=False, header=False)
-
-    elif mode == "test":
-        # Select a model from the brain folder
-        model_name = "model_episode_2000.pth"
-        model_path = os.path.join("brains", model_name)
-
-        if not os.path.exists(model_path):
-            print(f"Model file {model_path} not found!")
-            return
-
-        # Initialize agent and load the model
-        action_space = ["right", "left", "drop"]
-        state_size = 9
-        agent = DQNAgent(state_size, len(action_space))
-        agent.q_network.load_state_dict(torch.load(model_path))
-        agent.q_network.eval()  # Set the model to evaluation mode
-
-        print(f"Loaded model: {model_name}")
-
-        # Run the model 10 times
-        for trial in range(10):
-            print(f"Trial {trial + 1}/10")
-            state = env.reset()
-            total_reward = 0
-            done = False
-
-            while not done:
-                action = agent.act(state, greedy=True)  # Always take the best action
-                state, reward, done, _ = env.step(action)
-                env.render()
-                pygame.event.get()  # Process Pygame events to avoid freezing
-                total_reward += reward
-
-            print(f"Trial {trial + 1} Total Reward: {total_reward}")
+            env.process_events()  # Process Pygame events to avoid freezing
+            total_reward += reward
+
+        print(f"Trial {trial + 1} Total Reward: {total_reward}")
     env.close()
 
 
+def run_eval(args):
+    from evaluation import evaluate_checkpoints, find_checkpoints, format_report
+
+    if args.model:
+        models = args.model
+    else:
+        models = find_checkpoints(args.save_dir) if os.path.isdir(args.save_dir) else []
+        if args.latest:
+            models = models[-1:]
+    if not models:
+        print(f"No checkpoints found in {args.save_dir}!")
+        return 1
+    report = evaluate_checkpoints(models, episodes=args.episodes, seed=args.seed, workers=args.workers,
+                                  chunk_size=args.chunk_size, state_size=args.state_size,
+                                  max_episode_steps=args.max_episode_steps)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Report written to {args.output}")
+
+
+def run_export(args):
+    from export import check_parity, export_checkpoint
+
+    model_path = args.model or latest_model(args.save_dir)
+    if model_path is None or not os.path.exists(model_path):
+        print(f"Model file {model_path or args.save_dir + '/*.pth'} not found!")
+        return 1
+    output = args.output or os.path.splitext(model_path)[0] + (".pt" if args.format == "torchscript" else ".npz")
+    metadata = export_checkpoint(model_path, output, quantize=args.quantize, state_size=args.state_size,
+                                 action_size=len(ACTION_SPACE))
+    print(f"Exported {model_path} to {output} ({metadata['format']}{', int8' if args.quantize else ''}, "
+          f"{metadata['bytes']:,} bytes)")
+    if args.parity_states:
+        parity = check_parity(model_path, output, samples=args.parity_states, seed=args.seed)
+        print(f"Greedy action agreement on {parity['states']:,} visited states: {parity['agreement']:.4%} "
+              f"({parity['disagreements']} disagreements), max |Q error| {parity['max_abs_error']:.2e}")
+
+
+def run_serve(args):
+    from serving import PolicyServer
+
+    server = PolicyServer(args.model or args.save_dir, socket_path=args.socket, max_batch=args.max_batch,
+                          max_wait=args.max_wait_ms / 1e3, reload_interval=args.reload_interval,
+                          report_interval=args.report_interval, state_size=args.state_size,
+                          action_size=len(ACTION_SPACE))
+    server.run()
+
+
+def run_bench(args):
+    from benchmarks.suite import main as benchmarks_main
+
+    return benchmarks_main(args.bench_args)
+
+
+def _add_common(parser):
+    parser.add_argument("--config", help="JSON file with option defaults; explicit flags take precedence")
+    parser.add_argument("--seed", type=int, default=None, help="Root seed (default: fresh entropy)")
+
+
+def _add_model(parser):
+    parser.add_argument("--model", help="Checkpoint to load (default: latest in --save-dir)")
+    parser.add_argument("--save-dir", default="brains")
+    parser.add_argument("--state-size", type=int, default=9)
+    parser.add_argument("--inference-backend", default="torch", choices=["torch", "numpy", "torchscript", "compile"])
+
+
+def _add_rendering(parser):
+    parser.add_argument("--offscreen", action="store_true", help="Render to an offscreen surface instead of a window")
+    parser.add_argument("--frame-dir", help="Dump rendered frames to this directory")
+    parser.add_argument("--frame-format", default="png", choices=["png", "bmp", "jpg"], help="Image format of --frame-dir frames")
+    parser.add_argument("--video", help="Record rendered frames to this video file (ffmpeg; image sequence without it)")
+    parser.add_argument("--render-fps", type=float, default=None,
+                        help="Frames per simulated second; skips frames independent of dt and paces the window")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    human = commands.add_parser("human", help="Fly the drone with the arrow keys")
+    _add_common(human)
+    _add_rendering(human)
+    human.set_defaults(handler=run_human)
+
+    train = commands.add_parser("train", help="Train a DQN agent (headless by default)")
+    _add_common(train)
+    _add_rendering(train)
+    train.add_argument("--episodes", type=int, default=2000)
+    train.add_argument("--state-size", type=int, default=9)
+    train.add_argument("--save-dir", default="brains")
+    train.add_argument("--save-every", type=int, default=250)
+    train.add_argument("--max-episode-steps", type=int, default=200, help="Steps after which an episode is cut with a -1000 penalty")
+    train.add_argument("--keep-checkpoints", type=int, default=3, help="Full-state checkpoints kept besides the best")
+    train.add_argument("--eval-episodes", type=int, default=0,
+                       help="Greedy episodes scoring each checkpoint (0: score by mean training reward)")
+    train.add_argument("--resume", action="store_true", help="Continue from the latest full-state checkpoint in --save-dir")
+    train.add_argument("--metrics-dir", default="metrics")
+    train.add_argument("--status-interval", type=float, default=5.0, help="Minimum seconds between status blocks")
+    train.add_argument("--episode-log", help="Append a replayable log line per episode to this file")
+    train.add_argument("--render-every", type=int, default=0, help="Render every Kth episode (0: headless)")
+    train.add_argument("--coast", action="store_true", help="Simulate the fall after release inside one step")
+    train.add_argument("--integrator", default="semi_implicit_euler",
+                       choices=["explicit_euler", "semi_implicit_euler", "rk4", "rk45"])
+    train.add_argument("--exact-contact", action="store_true", help="Root-find the exact ground-crossing time")
+    train.add_argument("--learning-rate", type=float, default=0.001)
+    train.add_argument("--gamma", type=float, default=0.99)
+    train.add_argument("--epsilon-decay", type=float, default=0.995)
+    train.add_argument("--buffer-size", type=int, default=2000)
+    train.add_argument("--batch-size", type=int, default=128)
+    train.add_argument("--prioritized", action="store_true", help="Prioritized experience replay")
+    train.add_argument("--train-every", type=int, default=1)
+    train.add_argument("--gradient-steps", type=int, default=1)
+    train.add_argument("--target-update-interval", type=int, default=0,
+                       help="Hard target sync interval, e.g. 500 (default 0: bootstrap from the online network)")
+    train.add_argument("--tau", type=float, default=None, help="Polyak factor for soft target updates")
+    train.add_argument("--double-dqn", action="store_true")
+    train.add_argument("--inference-backend", default="torch", choices=["torch", "numpy", "torchscript", "compile"])
+    train.add_argument("--workers", type=int, default=0, help="Rollout worker processes (0: single-process training)")
+    train.add_argument("--sync-interval", type=int, default=100, help="Learner updates between weight broadcasts")
+    train.add_argument("--profile", action="store_true", help="Time every training phase and print a summary table")
+    train.add_argument("--cprofile-start", type=int, default=None, help="First episode of a cProfile capture window")
+    train.add_argument("--cprofile-episodes", type=int, default=10, help="Episodes in the capture window")
+    train.add_argument("--torch-profile", action="store_true", help="Also capture the window with torch.profiler")
+    train.add_argument("--profile-dir", default="profiles", help="Directory for capture files")
+    train.set_defaults(handler=run_train)
+
+    sweep = commands.add_parser("sweep", help="Tune agent hyperparameters with parallel successive-halving trials")
+    _add_common(sweep)
+    sweep.add_argument("--space", help="JSON search space (default: learning rate, gamma, epsilon decay, buffer and batch size)")
+    sweep.add_argument("--sweep-dir", default="sweeps", help="Directory of trial checkpoints and the summary table")
+    sweep.add_argument("--trials", type=int, default=27, help="Configurations sampled")
+    sweep.add_argument("--min-episodes", type=int, default=50, help="Episodes before the first pruning decision")
+    sweep.add_argument("--max-episodes", type=int, default=2000, help="Episodes of the trials that survive every rung")
+    sweep.add_argument("--eta", type=int, default=3, help="Each rung keeps the top 1/eta of its trials")
+    sweep.add_argument("--workers", type=int, default=None, help="Trial processes (default: cores // threads per worker)")
+    sweep.add_argument("--threads-per-worker", type=int, default=1, help="Torch threads and pinned cores per trial")
+    sweep.add_argument("--no-pin", action="store_true", help="Do not pin workers to cores")
+    sweep.add_argument("--eval-episodes", type=int, default=0,
+                       help="Greedy episodes scoring each rung (0: mean reward of the last training episodes)")
+    sweep.add_argument("--coast", action="store_true", help="Simulate the fall after release inside one step")
+    sweep.add_argument("--integrator", default="semi_implicit_euler",
+                       choices=["explicit_euler", "semi_implicit_euler", "rk4", "rk45"])
+    sweep.add_argument("--exact-contact", action="store_true", help="Root-find the exact ground-crossing time")
+    sweep.set_defaults(handler=run_sweep)
+
+    collect = commands.add_parser("collect", help="Write an offline dataset of transitions to a chunked .npy store")
+    _add_common(collect)
+    collect.add_argument("store", help="Store directory")
+    collect.add_argument("--steps", type=int, default=1_000_000, help="Transitions to collect")
+    collect.add_argument("--workers", type=int, default=1, help="Collector processes")
+    collect.add_argument("--policy", default="random", choices=["random", "oracle", "model"])
+    collect.add_argument("--model", help="Checkpoint for --policy model")
+    collect.add_argument("--epsilon", type=float, default=0.1, help="Probability of a random action")
+    collect.add_argument("--num-envs", type=int, default=256, help="Episodes stepped in parallel per worker")
+    collect.add_argument("--chunk-size", type=int, default=100_000, help="Transitions per chunk")
+    collect.set_defaults(handler=run_collect)
+
+    offline = commands.add_parser("offline", help="Train a DQN agent from a collected store")
+    _add_common(offline)
+    offline.add_argument("store", help="Store directory")
+    offline.add_argument("--updates", type=int, default=100_000)
+    offline.add_argument("--save-dir", default="brains")
+    offline.add_argument("--save-every", type=int, default=10_000, help="Save the model every this many updates")
+    offline.add_argument("--learning-rate", type=float, default=0.001)
+    offline.add_argument("--gamma", type=float, default=0.99)
+    offline.add_argument("--batch-size", type=int, default=128)
+    offline.add_argument("--gradient-steps", type=int, default=1)
+    offline.add_argument("--target-update-interval", type=int, default=500, help="Hard target sync interval (0: no target network)")
+    offline.add_argument("--tau", type=float, default=None, help="Polyak factor for soft target updates")
+    offline.add_argument("--double-dqn", action="store_true")
+    offline.set_defaults(handler=run_offline)
+
+    test = commands.add_parser("test", help="Watch a trained model play")
+    _add_common(test)
+    _add_model(test)
+    _add_rendering(test)
+    test.add_argument("--trials", type=int, default=10)
+    test.set_defaults(handler=run_test)
+
+    evaluate = commands.add_parser("eval", aliases=["evaluate"],
+                                   help="Rank checkpoints by headless greedy evaluation on fixed seeds")
+    _add_common(evaluate)
+    evaluate.add_argument("--model", nargs="+", help="Checkpoints to evaluate (default: every checkpoint in --save-dir)")
+    evaluate.add_argument("--save-dir", default="brains")
+    evaluate.add_argument("--latest", action="store_true", help="Only evaluate the latest checkpoint in --save-dir")
+    evaluate.add_argument("--state-size", type=int, default=9)
+    evaluate.add_argument("--episodes", type=int, default=1000, help="Greedy episodes per checkpoint")
+    evaluate.add_argument("--max-episode-steps", type=int, default=200)
+    evaluate.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 0: in-process)")
+    evaluate.add_argument("--chunk-size", type=int, default=250, help="Episodes per worker task")
+    evaluate.add_argument("--output", help="Write the ranked report to this JSON file")
+    evaluate.set_defaults(handler=run_eval, seed=0)
+
+    export = commands.add_parser("export", help="Freeze a checkpoint into a NumPy or TorchScript inference artifact")
+    _add_common(export)
+    export.add_argument("--model", help="Checkpoint to export (default: latest in --save-dir)")
+    export.add_argument("--save-dir", default="brains")
+    export.add_argument("--state-size", type=int, default=9)
+    export.add_argument("--output", help="Artifact path; the extension picks the format (default: next to the checkpoint)")
+    export.add_argument("--format", default="numpy", choices=["numpy", "torchscript"], help="Format when --output is not given")
+    export.add_argument("--quantize", action="store_true", help="Store int8 weights")
+    export.add_argument("--parity-states", type=int, default=100_000,
+                        help="Visited states on which actions are compared with the checkpoint (0: skip)")
+    export.set_defaults(handler=run_export, seed=0)
+
+    serve = commands.add_parser("serve", help="Serve greedy actions of one model to local clients over a Unix socket")
+    _add_common(serve)
+    serve.add_argument("--model", help="Checkpoint or exported artifact to serve (default: latest in --save-dir, reloaded as new ones appear)")
+    serve.add_argument("--save-dir", default="brains")
+    serve.add_argument("--state-size", type=int, default=9)
+    serve.add_argument("--socket", default="/tmp/drone_policy.sock", help="Unix socket path")
+    serve.add_argument("--max-batch", type=int, default=256, help="Most states per forward pass")
+    serve.add_argument("--max-wait-ms", type=float, default=2.0, help="Longest a request waits for a batch to fill")
+    serve.add_argument("--reload-interval", type=float, default=2.0, help="Seconds between checks for a newer model (0: never)")
+    serve.add_argument("--report-interval", type=float, default=10.0, help="Seconds between statistics reports (0: never)")
+    serve.set_defaults(handler=run_serve)
+
+    bench = commands.add_parser("bench", help="Run or compare benchmarks (see python -m benchmarks -h)",
+                                add_help=False)
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER)
+    bench.set_defaults(handler=run_bench)
+
+    return parser, commands.choices
+
+
+def parse_args(argv=None):
+    """Parse flags, applying `--config` file values as defaults of the chosen subcommand."""
+    parser, subparsers = build_parser()
+    args = parser.parse_args(argv)
+    config_path = getattr(args, "config", None)
+    if config_path:
+        with open(config_path) as file:
+            config = json.load(file)
+        subparser = subparsers[args.command]
+        known = {action.dest for action in subparser._actions}
+        unknown = set(config) - known
+        if unknown:
+            parser.error(f"unknown option(s) in {config_path}: {', '.join(sorted(unknown))}")
+        subparser.set_defaults(**config)
+        args = parser.parse_args(argv)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return args.handler(args)
+
+
 if __name__ == "__main__":
-    # main("human")
-    main("train")
-    # main("test")
+    sys.exit(main())
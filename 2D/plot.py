@@ -1,20 +1,60 @@
+"""
+Live plot of a training metrics log, tailed incrementally while training runs.
+
+Usage (from the 2D directory):
+    python plot.py [metrics_dir] [--field reward] [--window 50]
+"""
+import argparse
+
 import matplotlib.pyplot as plt
-import numpy as np
+from matplotlib.animation import FuncAnimation
+
+from utils import MetricsTailer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("metrics_dir", nargs="?", default="metrics")
+    parser.add_argument("--field", default="reward", help="Metrics column to plot against the episode")
+    parser.add_argument("--window", type=int, default=50, help="Moving-average window")
+    parser.add_argument("--interval", type=int, default=1000, help="Refresh interval in milliseconds")
+    args = parser.parse_args()
+
+    tailer = MetricsTailer(args.metrics_dir)
+    episodes, values, averages = [], [], []
+    running_sum = 0.0
 
-# Read data from the CSV file
-data = np.genfromtxt('plot_data.csv', delimiter=',')
+    figure, axes = plt.subplots()
+    raw_line, = axes.plot([], [], alpha=0.4, label=args.field)
+    average_line, = axes.plot([], [], label=f"{args.window}-episode average")
+    axes.set_xlabel("Episode")
+    axes.set_ylabel(args.field)
+    axes.set_title(f"{args.field} from {args.metrics_dir}")
+    axes.legend(loc="upper left")
 
-# Extract x and y values
-x = data[:, 0]
-y = data[:, 1]
+    def update(_):
+        nonlocal running_sum
+        # Only rows appended since the last refresh are read
+        for row in tailer.poll():
+            if row.get(args.field, "") == "":
+                continue
+            value = float(row[args.field])
+            episodes.append(int(row["episode"]))
+            values.append(value)
+            running_sum += value
+            if len(values) > args.window:
+                running_sum -= values[-args.window - 1]
+            averages.append(running_sum / min(len(values), args.window))
+        raw_line.set_data(episodes, values)
+        average_line.set_data(episodes, averages)
+        axes.relim()
+        axes.autoscale_view()
+        return raw_line, average_line
 
-# Create the plot
-plt.plot(x, y)
+    animation = FuncAnimation(figure, update, interval=args.interval, cache_frame_data=False)
+    plt.show()
+    return animation
 
-# Add labels and title
-plt.xlabel('X')
-plt.ylabel('Y')
-plt.title('Plot from plot_data.csv')
 
-# Show the plot
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+from serving.server import PolicyServer, ServingStats, format_stats
+from serving.client import PolicyClient
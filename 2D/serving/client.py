@@ -0,0 +1,63 @@
+import json
+import socket
+
+import numpy as np
+
+from serving.protocol import ACT, DEFAULT_SOCKET, ERROR, RESPONSE, STATS, pack_request
+
+
+class PolicyClient:
+    def __init__(self, socket_path=DEFAULT_SOCKET, timeout=10.0):
+        """
+        Blocking client of a `PolicyServer`, one connection per client.
+
+        Requests on one connection are answered in order; run one client per thread or process
+        to have requests batched together by the server.
+
+        Args:
+            socket_path (str): Unix socket the server listens on.
+            timeout (float): Seconds to wait for a reply before raising `socket.timeout`.
+        """
+        self.socket_path = socket_path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+
+    def act(self, state):
+        """Greedy action for one state."""
+        return int(self.act_batch(state)[0])
+
+    def act_batch(self, states):
+        """Greedy actions for a (batch, state_size) array, int64 array of shape (batch,)."""
+        self.sock.sendall(pack_request(ACT, states))
+        return np.frombuffer(self._receive(), dtype=np.int64)
+
+    def stats(self):
+        """The server's `ServingStats.summary()` plus the loaded model."""
+        self.sock.sendall(pack_request(STATS))
+        return json.loads(self._receive())
+
+    def _receive(self):
+        kind, length = RESPONSE.unpack(self._read(RESPONSE.size))
+        payload = self._read(length)
+        if kind == ERROR:
+            raise RuntimeError(f"Policy server error: {payload.decode()}")
+        return payload
+
+    def _read(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Policy server closed the connection")
+            data += chunk
+        return bytes(data)
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
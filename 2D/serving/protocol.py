@@ -0,0 +1,27 @@
+import struct
+
+import numpy as np
+
+# Request: kind, rows, columns, then rows * columns float32 states (row-major)
+REQUEST = struct.Struct("<BII")
+# Response: kind, payload length in bytes, then the payload
+RESPONSE = struct.Struct("<BI")
+
+ACT = 0  # Request: greedy actions; response payload: one int64 action per row
+STATS = 1  # Request: server statistics (no states); response payload: JSON
+ERROR = 2  # Response only; payload: UTF-8 message
+
+DEFAULT_SOCKET = "/tmp/drone_policy.sock"
+
+
+def pack_request(kind, states=None):
+    if states is None:
+        return REQUEST.pack(kind, 0, 0)
+    states = np.ascontiguousarray(states, dtype=np.float32)
+    if states.ndim == 1:
+        states = states.reshape(1, -1)
+    return REQUEST.pack(kind, states.shape[0], states.shape[1]) + states.tobytes()
+
+
+def pack_response(kind, payload):
+    return RESPONSE.pack(kind, len(payload)) + payload
@@ -0,0 +1,259 @@
+import asyncio
+import json
+import os
+import signal
+import time
+
+import numpy as np
+
+from serving.protocol import ACT, DEFAULT_SOCKET, ERROR, REQUEST, STATS, pack_response
+
+
+class ServingStats:
+    def __init__(self, window=100_000):
+        """
+        Request latencies over a sliding window and a histogram of forward-pass batch sizes.
+
+        Args:
+            window (int): Most recent request latencies kept for the percentiles.
+        """
+        self.latencies = np.zeros(window)
+        self.count = 0  # Requests answered; the window holds the last min(count, window)
+        self.states = 0
+        self.batches = 0
+        self.batch_histogram = np.zeros(32, dtype=np.int64)  # Bucket k counts batch sizes in [2**k, 2**(k+1))
+
+    def record_batch(self, batch_size, latencies):
+        """Add one forward pass of `batch_size` states answering requests with the given latencies (seconds)."""
+        self.batches += 1
+        self.states += batch_size
+        self.batch_histogram[batch_size.bit_length() - 1] += 1
+        window = len(self.latencies)
+        for latency in latencies:
+            self.latencies[self.count % window] = latency
+            self.count += 1
+
+    def summary(self):
+        latencies = self.latencies[:min(self.count, len(self.latencies))] * 1e6
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) if len(latencies) else (float("nan"),) * 3
+        last = int(np.flatnonzero(self.batch_histogram).max()) + 1 if self.batches else 0
+        return {
+            "requests": self.count,
+            "states": self.states,
+            "batches": self.batches,
+            "mean_batch_size": self.states / self.batches if self.batches else 0.0,
+            "latency_us": {"p50": float(p50), "p90": float(p90), "p99": float(p99)},
+            "batch_histogram": {_bucket(k): int(self.batch_histogram[k]) for k in range(last)},
+        }
+
+
+def _bucket(k):
+    low, high = 2 ** k, 2 ** (k + 1) - 1
+    return str(low) if low == high else f"{low}-{high}"
+
+
+def format_stats(stats):
+    """One-line latency summary plus the batch-size histogram, for the console."""
+    latency = stats["latency_us"]
+    lines = [f"Requests: {stats['requests']:,}  states: {stats['states']:,}  batches: {stats['batches']:,}  "
+             f"mean batch: {stats['mean_batch_size']:.1f}  latency p50/p90/p99: "
+             f"{latency['p50']:.0f}/{latency['p90']:.0f}/{latency['p99']:.0f} us"]
+    total = max(sum(stats["batch_histogram"].values()), 1)
+    for bucket, count in stats["batch_histogram"].items():
+        lines.append(f"  batch {bucket:>9s}: {count:>10,d} {'#' * round(40 * count / total)}")
+    return "\n".join(lines)
+
+
+def load_model(path, state_size=9, action_size=3):
+    """Greedy policy from a `QNetwork` checkpoint (`.pth`) or an exported artifact (`.npz`, `.pt`)."""
+    from export import checkpoint_policy, load_policy
+
+    if path.endswith(".pth"):
+        return checkpoint_policy(path, state_size, action_size)
+    return load_policy(path)
+
+
+def latest_model(model):
+    """`model` itself if it is a file, else the checkpoint with the highest episode number in the directory."""
+    if not os.path.isdir(model):
+        return model
+    from evaluation import find_checkpoints
+
+    models = find_checkpoints(model)
+    return models[-1] if models else None
+
+
+class PolicyServer:
+    def __init__(self, model="brains", socket_path=DEFAULT_SOCKET, max_batch=256, max_wait=0.002,
+                 reload_interval=2.0, report_interval=10.0, state_size=9, action_size=3):
+        """
+        Local greedy-policy server: one loaded model shared by many clients over a Unix socket.
+
+        Requests from all connections go to one queue. The batcher takes the first waiting request,
+        then keeps collecting until `max_batch` states are queued or `max_wait` seconds have passed
+        since that first request, and answers the whole micro-batch with one forward pass. Each
+        connection has at most one request in flight, so the batch also closes as soon as every
+        connected client is waiting in it; a lone client never waits for the deadline at all. The
+        forward pass runs on the event loop itself: it takes microseconds, less than a hand-off to
+        a thread would cost. If it raises, e.g. because a reloaded model expects another state
+        size, every request of the batch gets an error reply and serving continues.
+
+        `model` is polled every `reload_interval` seconds. When a directory gains a newer
+        checkpoint, or a model file is replaced, the new model is loaded in a thread and swapped in
+        between two batches; a file that fails to load is retried at the next poll.
+
+        Args:
+            model (str): Checkpoint directory (its latest `model_episode_<n>.pth` is served) or a
+                `.pth` checkpoint or exported `.npz`/`.pt` artifact.
+            socket_path (str): Unix socket to listen on; a stale socket file is replaced.
+            max_batch (int): Most states answered by one forward pass.
+            max_wait (float): Longest a request waits for others to join its batch, in seconds.
+            reload_interval (float): Seconds between checks for a newer model (0: never reload).
+            report_interval (float): Seconds between console statistics reports (0: never).
+            state_size (int): Length of an observation vector.
+            action_size (int): Number of discrete actions (for `.pth` checkpoints).
+        """
+        self.model = model
+        self.socket_path = socket_path
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.reload_interval = reload_interval
+        self.report_interval = report_interval
+        self.state_size = state_size
+        self.action_size = action_size
+        self.stats = ServingStats()
+        self.reloads = 0
+        self.connections = 0
+
+        self.model_path = latest_model(model)
+        if self.model_path is None:
+            raise FileNotFoundError(f"No checkpoint found in {model}")
+        self.policy = load_model(self.model_path, state_size, action_size)
+        self.model_mtime = os.path.getmtime(self.model_path)
+
+    async def serve(self):
+        """Serve until SIGINT/SIGTERM (or cancellation), then remove the socket file."""
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        tasks = [asyncio.create_task(self._batcher())]
+        if self.reload_interval:
+            tasks.append(asyncio.create_task(self._watch()))
+        if self.report_interval:
+            tasks.append(asyncio.create_task(self._report()))
+        print(f"Serving {self.model_path} on {self.socket_path} "
+              f"(max batch {self.max_batch}, max wait {self.max_wait * 1e3:g} ms)")
+        try:
+            await stop.wait()
+        finally:
+            server.close()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print(format_stats(self.summary()))
+
+    def run(self):
+        asyncio.run(self.serve())
+
+    def summary(self):
+        return {**self.stats.summary(), "model": self.model_path, "reloads": self.reloads}
+
+    async def _handle_client(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        self.connections += 1
+        try:
+            while True:
+                kind, rows, columns = REQUEST.unpack(await reader.readexactly(REQUEST.size))
+                if kind == STATS:
+                    writer.write(pack_response(STATS, json.dumps(self.summary()).encode()))
+                elif kind != ACT or columns != self.state_size or rows == 0:
+                    # Discard the payload so the connection stays usable
+                    await reader.readexactly(rows * columns * 4)
+                    message = f"expected an act request with {self.state_size} columns, got kind {kind} with {rows}x{columns}"
+                    writer.write(pack_response(ERROR, message.encode()))
+                else:
+                    states = np.frombuffer(await reader.readexactly(rows * columns * 4), dtype=np.float32)
+                    result = loop.create_future()
+                    self.queue.put_nowait((states.reshape(rows, columns), result, time.perf_counter()))
+                    try:
+                        actions = await result
+                    except Exception as error:  # The forward pass of this request's batch failed
+                        writer.write(pack_response(ERROR, f"forward pass failed: {error}".encode()))
+                    else:
+                        writer.write(pack_response(ACT, actions.tobytes()))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass  # Client disconnected
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        queue = self.queue
+        while True:
+            batch = [await queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            # A connection has at most one request in flight, so once every client is waiting nothing else can join
+            while size < self.max_batch and len(batch) < self.connections:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    request = queue.get_nowait()
+                batch.append(request)
+                size += len(request[0])
+            states = np.concatenate([request[0] for request in batch])
+            try:
+                actions = self.policy.act_batch(states)
+            except Exception as error:  # Fail this batch only; the next model reload may fix it
+                print(f"Forward pass of {self.model_path} failed on a batch of {size}: {error}")
+                for _, result, _ in batch:
+                    if not result.done():
+                        result.set_exception(error)
+                continue
+            now = time.perf_counter()
+            start = 0
+            for request_states, result, _ in batch:
+                if not result.done():
+                    result.set_result(actions[start:start + len(request_states)])
+                start += len(request_states)
+            self.stats.record_batch(size, [now - received for _, _, received in batch])
+
+    async def _watch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            path = latest_model(self.model)
+            if path is None:
+                continue
+            try:
+                mtime = os.path.getmtime(path)
+                if path == self.model_path and mtime == self.model_mtime:
+                    continue
+                policy = await loop.run_in_executor(None, load_model, path, self.state_size, self.action_size)
+            except Exception as error:  # A half-written or deleted file; keep serving the current model
+                print(f"Could not load {path}: {error}")
+                continue
+            self.policy, self.model_path, self.model_mtime = policy, path, mtime
+            self.reloads += 1
+            print(f"Reloaded {path}")
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            if self.stats.count:
+                print(format_stats(self.summary()))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The packages are imported top-level, as when running from the 2D directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
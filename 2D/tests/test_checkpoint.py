@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import torch
+
+from agent import DQNAgent
+from environment import Environment
+from training.checkpoint import CheckpointManager
+
+
+def play(agent, env, steps):
+    """Train for `steps` epsilon-greedy steps from a fresh episode; returns the actions taken."""
+    actions = []
+    state = env.reset()
+    for _ in range(steps):
+        action = agent.act(state)
+        next_state, reward, done, _ = env.step(action)
+        agent.replay_buffer.add((state, action, reward, next_state, done))
+        agent.train()
+        actions.append(action)
+        state = env.reset() if done else next_state
+    return actions
+
+
+def test_checkpoint_round_trip(tmp_path):
+    agent = DQNAgent(9, 3, buffer_size=256, batch_size=16, prioritized=True, seed=0)
+    play(agent, Environment(seed=0), 40)
+    manager = CheckpointManager(str(tmp_path), keep_last=1)
+    manager.save(1, {"agent": agent.state_dict()}, weights=agent.q_network.state_dict())
+    manager.close()
+
+    loaded = CheckpointManager(str(tmp_path)).load()["agent"]
+    buffer = agent.replay_buffer.state_dict()
+    for name, array in buffer["arrays"].items():
+        np.testing.assert_array_equal(loaded["replay_buffer"]["arrays"][name], array)
+    for name, value in agent.q_network.state_dict().items():
+        torch.testing.assert_close(loaded["q_network"][name], value, rtol=0, atol=0)
+    assert (tmp_path / "model_episode_1.pth").exists()
+
+
+def test_resumed_agent_continues_identically(tmp_path):
+    agent = DQNAgent(9, 3, buffer_size=256, batch_size=16, prioritized=True, seed=0)
+    env = Environment(seed=0)
+    play(agent, env, 40)
+    manager = CheckpointManager(str(tmp_path), keep_last=1)
+    manager.save(1, {"agent": agent.state_dict(), "env_rng": env.np_random.bit_generator.state,
+                     "torch_rng": torch.get_rng_state()})
+    manager.close()
+    expected = play(agent, env, 40)
+
+    state = CheckpointManager(str(tmp_path)).load()
+    resumed = DQNAgent(9, 3, buffer_size=256, batch_size=16, prioritized=True, seed=1)
+    resumed.load_state_dict(state["agent"])
+    resumed_env = Environment(seed=1)
+    resumed_env.np_random.bit_generator.state = state["env_rng"]
+    torch.set_rng_state(state["torch_rng"])
+    assert play(resumed, resumed_env, 40) == expected
+    for name, value in agent.q_network.state_dict().items():
+        torch.testing.assert_close(resumed.q_network.state_dict()[name], value, rtol=0, atol=0)
+
+
+def test_saving_a_step_again_never_replaces_it_in_place(tmp_path, monkeypatch):
+    manager = CheckpointManager(str(tmp_path), keep_last=2)
+    manager.save(1, {"value": 1})
+    manager.wait()
+    first = manager.latest()
+
+    # A crash right after the new checkpoint is renamed into place leaves both versions on disk
+    monkeypatch.setattr(manager, "_prune", lambda: None)
+    manager.save(1, {"value": 2})
+    manager.wait()
+    assert os.path.isdir(first)
+    assert manager.load()["value"] == 2
+    monkeypatch.undo()
+
+    # The next save prunes the superseded version
+    manager.save(2, {"value": 3})
+    manager.close()
+    assert not os.path.exists(first)
+    assert [manager.load(path)["value"] for path in manager.checkpoints()] == [2, 3]
+
+
+def test_pruning_keeps_the_best_checkpoint(tmp_path):
+    manager = CheckpointManager(str(tmp_path), keep_last=1)
+    for step, score in [(1, 5.0), (2, 9.0), (3, 1.0), (4, 2.0)]:
+        manager.save(step, {"step": step}, score=score)
+    manager.close()
+    assert [manager.load(path)["step"] for path in manager.checkpoints()] == [2, 4]
+    assert CheckpointManager(str(tmp_path)).best == {"step": 2, "score": 9.0}
@@ -0,0 +1,55 @@
+import multiprocessing as mp
+import queue
+import threading
+
+from training.distributed import DistributedTrainer, _state_dict_to_numpy, rollout_worker
+
+
+def collect_episodes(env_kwargs, episodes, max_episode_steps=200):
+    """Run `rollout_worker` on a thread until `episodes` episodes end; returns [(transitions, steps reported)]."""
+    trainer = DistributedTrainer(9, 3, num_workers=1, seed=0)
+    transition_queue = queue.Queue()
+    receiver, sender = mp.Pipe(duplex=False)
+    sender.send((_state_dict_to_numpy(trainer.agent.q_network.state_dict()), 1.0))
+    stop_event = threading.Event()
+    worker = threading.Thread(target=rollout_worker, args=(0, 9, 3, transition_queue, receiver, stop_event, 1,
+                                                           max_episode_steps, 0, env_kwargs))
+    worker.start()
+    results = []
+    transitions = 0
+    try:
+        while len(results) < episodes:
+            _, chunk, episode_returns = transition_queue.get(timeout=30)
+            transitions += len(chunk)
+            for _, steps, _ in episode_returns:
+                results.append((transitions, steps))
+                transitions = 0
+    finally:
+        stop_event.set()
+        worker.join()
+    return results
+
+
+def test_coasted_falls_count_every_simulated_step():
+    episodes = collect_episodes({"coast": True, "coast_gamma": 0.99}, 10)
+    assert all(steps >= transitions for transitions, steps in episodes)
+    assert any(steps > transitions for transitions, steps in episodes)
+
+
+def test_stepped_episodes_count_one_step_per_transition():
+    episodes = collect_episodes(None, 5)
+    assert all(steps == transitions for transitions, steps in episodes)
+
+
+def test_save_every_zero_never_saves(tmp_path):
+    trainer = DistributedTrainer(9, 3, num_workers=1, save_dir=str(tmp_path), save_every=0, seed=0)
+    trainer._finish_episodes([(-5.0, 10, False)] * 4)
+    assert trainer.episodes_done == 4
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_hits_come_from_the_landing(tmp_path):
+    trainer = DistributedTrainer(9, 3, num_workers=1, save_dir=str(tmp_path), save_every=0, seed=0)
+    # A coasted hit has a discounted, possibly negative return; a positive return alone is no hit
+    trainer._finish_episodes([(-3.0, 40, True), (12.0, 40, False), (950.0, 1, True)])
+    assert trainer.hits == 2
@@ -0,0 +1,26 @@
+import numpy as np
+
+from environment.trajectory_oracle import TrajectoryOracle
+from evaluation import evaluate_policy
+
+
+def oracle_policy():
+    """Q-values that put the oracle's action first, so greedy evaluation follows the oracle."""
+    oracle = TrajectoryOracle()
+
+    def policy(states):
+        q_values = np.zeros((len(states), 3), dtype=np.float32)
+        q_values[np.arange(len(states)), [oracle.act(state) for state in states]] = 1.0
+        return q_values
+
+    return policy
+
+
+def test_coasting_does_not_change_hits():
+    seeds = list(range(40))
+    stepped = evaluate_policy(oracle_policy(), seeds, lockstep=8)
+    coasted = evaluate_policy(oracle_policy(), seeds, env_kwargs={"coast": True, "coast_gamma": 0.99}, lockstep=8)
+    assert stepped["hit"].any()
+    np.testing.assert_array_equal(coasted["hit"], stepped["hit"])
+    np.testing.assert_array_equal(coasted["landed"], stepped["landed"])
+    np.testing.assert_allclose(coasted["miss_distance"], stepped["miss_distance"])
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+import torch
+
+from agent import DQNAgent
+from export import check_parity, export_checkpoint, load_policy, sample_states
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("brains") / "model_episode_1.pth"
+    torch.save(DQNAgent(9, 3, seed=0).q_network.state_dict(), path)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def states():
+    return sample_states(2048, seed=1)
+
+
+@pytest.mark.parametrize("suffix", [".npz", ".pt"])
+def test_float32_artifacts_match_checkpoint(model_path, states, tmp_path, suffix):
+    artifact = str(tmp_path / f"policy{suffix}")
+    export_checkpoint(model_path, artifact)
+    result = check_parity(model_path, artifact, states)
+    assert result["agreement"] == 1.0
+    assert result["max_abs_error"] < 1e-4
+
+
+@pytest.mark.parametrize("suffix", [".npz", ".pt"])
+def test_quantized_artifacts_stay_close(model_path, states, tmp_path, suffix):
+    artifact = str(tmp_path / f"policy{suffix}")
+    export_checkpoint(model_path, artifact, quantize=True)
+    assert check_parity(model_path, artifact, states)["agreement"] >= 0.95
+
+
+@pytest.mark.parametrize("suffix", [".npz", ".pt"])
+def test_policies_accept_float64_and_lists(model_path, states, tmp_path, suffix):
+    artifact = str(tmp_path / f"policy{suffix}")
+    export_checkpoint(model_path, artifact)
+    policy = load_policy(artifact)
+    expected = policy.act_batch(states)
+    np.testing.assert_array_equal(policy.act_batch(states.astype(np.float64)), expected)
+    np.testing.assert_allclose(policy(states[:8].astype(np.float64)), policy(states[:8]), rtol=0, atol=0)
+    assert [policy.act(state.tolist()) for state in states[:64]] == expected[:64].tolist()
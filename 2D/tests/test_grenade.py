@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from constants import HEIGHT
+from entities import Grenade
+from entities.integrators import INTEGRATORS, semi_implicit_euler
+from utils import Vector
+
+# Thrown down just below terminal velocity and carried by a strong wind, so the speed reaches the cap early
+WIND = Vector(35.0, 0)
+VELOCITY = (30.0, 57.0)
+
+
+def drop(dt, **grenade_kwargs):
+    grenade = Grenade(0.0, 0.0, **grenade_kwargs)
+    grenade.released = True
+    grenade.velocity.set(*VELOCITY)
+    top_speed = 0.0
+    while not grenade.hit_ground:
+        grenade.update(WIND, dt)
+        top_speed = max(top_speed, math.hypot(grenade.velocity.x, grenade.velocity.y))
+    return grenade.coordinates.x, grenade.flight_time, top_speed
+
+
+@pytest.mark.parametrize("integrator, tolerance", [
+    ("explicit_euler", 0.05), ("semi_implicit_euler", 0.05), ("rk4", 0.005), ("rk45", 0.005),
+])
+def test_integrators_agree_at_terminal_velocity(integrator, tolerance):
+    reference_x, reference_time, top_speed = drop(0.001, integrator="rk45", exact_contact=True, rtol=1e-10, atol=1e-12)
+    assert top_speed == pytest.approx(Grenade(0, 0).terminal_velocity)
+    x, flight_time, _ = drop(0.05, integrator=integrator, exact_contact=True)
+    assert abs(x - reference_x) < tolerance
+    assert abs(flight_time - reference_time) < tolerance
+
+
+def test_fast_path_matches_semi_implicit_stepper():
+    grenade = Grenade(0.0, 0.0)
+    grenade.released = True
+    grenade.velocity.set(*VELOCITY)
+    params = (WIND.x, WIND.y, grenade._drag_factor, grenade.mass, grenade.terminal_velocity)
+    state = (0.0, 0.0, *VELOCITY)
+    while True:
+        state = semi_implicit_euler(state, 0.1, params)
+        grenade.update(WIND, 0.1)
+        if state[1] >= HEIGHT:
+            break
+        assert (grenade.coordinates.x, grenade.coordinates.y, grenade.velocity.x, grenade.velocity.y) == state
+    assert grenade.hit_ground
@@ -0,0 +1,31 @@
+import math
+
+import numpy as np
+import pytest
+
+from entities.integrators import INTEGRATORS, rk45
+
+# A light, draggy projectile in a strong cross wind, so the drag term dominates the error
+PARAMS = (8.0, 0.0, 0.05, 0.4, None)
+START = (0.0, 0.0, 3.0, -5.0)
+DURATION = 2.0
+
+
+def integrate(step, h):
+    state = START
+    for _ in range(round(DURATION / h)):
+        state = step(state, h, PARAMS)
+    return np.array(state)
+
+
+@pytest.mark.parametrize("name, order", [("explicit_euler", 1), ("semi_implicit_euler", 1), ("rk4", 4)])
+def test_convergence_order(name, order):
+    reference, _ = rk45(START, DURATION, PARAMS, rtol=1e-13, atol=1e-13)
+    errors = [np.abs(integrate(INTEGRATORS[name], h) - reference).max() for h in (0.1, 0.05)]
+    assert math.log2(errors[0] / errors[1]) == pytest.approx(order, abs=0.2)
+
+
+def test_rk45_meets_tolerance():
+    reference, _ = rk45(START, DURATION, PARAMS, rtol=1e-13, atol=1e-13)
+    state, _ = rk45(START, DURATION, PARAMS, rtol=1e-8, atol=1e-10)
+    assert np.abs(np.array(state) - reference).max() < 1e-6
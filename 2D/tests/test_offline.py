@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from agent import DQNAgent
+from constants import HEIGHT, WIDTH, WIND_FORCE_MAX
+from environment import TrajectoryOracle, VectorEnvironment
+from training.offline import OfflineTrainer, TransitionStore, _oracle_actions, collect
+
+
+def test_oracle_labels_match_scalar_oracle():
+    oracle = TrajectoryOracle()
+    env = VectorEnvironment(64, seed=0)
+    rng = np.random.default_rng(0)
+    observations = [env.reset()]
+    for _ in range(20):
+        observations.append(env.step(rng.integers(0, 3, size=64))[0])
+    # Visited states plus random ones spread over the whole table
+    random = np.repeat(observations[0], 16, axis=0).astype(np.float64)
+    random[:, 2] = rng.uniform(0, WIDTH, len(random))
+    random[:, 3] = rng.uniform(0, HEIGHT, len(random))
+    random[:, 4] = rng.uniform(0, WIDTH, len(random))
+    random[:, 6] = rng.uniform(-WIND_FORCE_MAX, WIND_FORCE_MAX, len(random))
+    observations = np.concatenate([*observations, random])
+
+    labels = _oracle_actions(oracle, observations)
+    np.testing.assert_array_equal(labels, [oracle.act(observation) for observation in observations])
+
+
+def test_collecting_again_appends_to_the_store(tmp_path):
+    directory = str(tmp_path / "store")
+    collect(directory, 300, num_envs=16, chunk_size=128, seed=0)
+    first = TransitionStore(directory)
+    collect(directory, 300, num_envs=16, chunk_size=128, seed=1)
+    store = TransitionStore(directory)
+    assert store.size() == 600
+    # The first run's chunks are untouched and still come first
+    np.testing.assert_array_equal(store.gather(np.arange(300))[0], first.gather(np.arange(300))[0])
+
+
+@pytest.mark.parametrize("gradient_steps", [1, 3])
+def test_offline_checkpoints_every_save_every_updates(tmp_path, gradient_steps):
+    directory = str(tmp_path / "store")
+    collect(directory, 256, num_envs=16, seed=0)
+    agent = DQNAgent(9, 3, batch_size=32, gradient_steps=gradient_steps, seed=0)
+    save_dir = tmp_path / "brains"
+    OfflineTrainer(agent, TransitionStore(directory), save_dir=str(save_dir), save_every=10).run(45)
+    saved = sorted(int(path.stem.rsplit("_", 1)[1]) for path in save_dir.iterdir())
+    # Every multiple of save_every is saved at the first update count at or past it, and the run ends with a save
+    for multiple in range(10, agent.updates + 1, 10):
+        assert any(multiple <= updates < multiple + gradient_steps for updates in saved)
+    assert saved[-1] == agent.updates
@@ -0,0 +1,56 @@
+import numpy as np
+
+from agent.replay_buffer import PrioritizedReplayBuffer, SumTree
+
+
+def test_sum_tree_sums_and_finds_leaves():
+    tree = SumTree(5)
+    priorities = np.array([1.0, 2.0, 0.0, 3.0, 4.0])
+    tree.update(np.arange(5), priorities)
+    assert tree.total() == priorities.sum()
+    np.testing.assert_array_equal(tree.get(np.arange(5)), priorities)
+
+    # Leaf j owns the prefix-sum range (cumsum[j - 1], cumsum[j]]; the empty leaf 2 is never found
+    values = np.array([0.5, 1.0, 1.5, 3.0, 3.5, 6.0, 6.5, 10.0])
+    np.testing.assert_array_equal(tree.find(values), [0, 0, 1, 1, 3, 3, 4, 4])
+
+
+def test_sum_tree_duplicate_updates():
+    tree = SumTree(8)
+    tree.update(np.arange(8), np.ones(8))
+    tree.update(np.array([3, 3, 4]), np.array([5.0, 5.0, 2.0]))
+    assert tree.total() == 6 + 5 + 2
+
+
+def test_prioritized_sampling_is_proportional_to_priority():
+    buffer = PrioritizedReplayBuffer(8, 64, 1, alpha=1.0, beta_increment=0.0, epsilon=0.0, seed=0)
+    for i in range(8):
+        buffer.add((np.array([i]), 0, 0.0, np.array([i]), 0.0))
+    priorities = np.arange(1, 9, dtype=np.float64)
+    buffer.update_priorities(np.arange(8), priorities)
+
+    counts = np.zeros(8)
+    for _ in range(2000):
+        states, *_, weights, indices = buffer.sample()
+        np.testing.assert_array_equal(states[:, 0], indices)
+        counts += np.bincount(indices, minlength=8)
+    np.testing.assert_allclose(counts / counts.sum(), priorities / priorities.sum(), atol=0.005)
+
+
+def test_prioritized_weights_correct_for_priority():
+    buffer = PrioritizedReplayBuffer(4, 16, 1, alpha=1.0, beta=1.0, beta_increment=0.0, epsilon=0.0, seed=0)
+    for i in range(4):
+        buffer.add((np.array([i]), 0, 0.0, np.array([i]), 0.0))
+    buffer.update_priorities(np.arange(4), np.array([1.0, 2.0, 4.0, 8.0]))
+    *_, weights, indices = buffer.sample()
+    # With beta = 1 the weight is inversely proportional to the sampling probability
+    np.testing.assert_allclose(weights, 1.0 / 2.0 ** indices, rtol=1e-6)
+
+
+def test_prioritized_sampling_ignores_empty_slots():
+    buffer = PrioritizedReplayBuffer(16, 32, 1, seed=0)
+    for i in range(5):
+        buffer.add((np.array([i]), 0, 0.0, np.array([i]), 0.0))
+    for _ in range(100):
+        indices = buffer.sample()[-1]
+        assert indices.max() < 5
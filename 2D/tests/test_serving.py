@@ -0,0 +1,89 @@
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import torch
+
+from agent import DQNAgent
+from export import export_checkpoint, load_policy, sample_states
+from serving import PolicyClient
+
+
+def _serve(model_path, socket_path):
+    from serving import PolicyServer
+
+    PolicyServer(model_path, socket_path=socket_path, reload_interval=0.05, report_interval=0).run()
+
+
+def export(directory, name, state_size):
+    model_path = os.path.join(directory, f"{name}.pth")
+    torch.save(DQNAgent(state_size, 3, seed=0).q_network.state_dict(), model_path)
+    artifact = os.path.join(directory, f"{name}.npz")
+    export_checkpoint(model_path, artifact, state_size=state_size)
+    return artifact
+
+
+def swap_in(artifact, served_path, client, reloads):
+    """Replace the served artifact and wait until the server has reloaded it."""
+    with open(artifact, "rb") as source, open(f"{served_path}.tmp", "wb") as target:
+        target.write(source.read())
+    os.replace(f"{served_path}.tmp", served_path)
+    os.utime(served_path, ns=(time.time_ns(), time.time_ns()))  # Never the mtime of the previous file
+    deadline = time.monotonic() + 10
+    while client.stats()["reloads"] < reloads:
+        assert time.monotonic() < deadline, "the server did not reload the model"
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def server(tmp_path):
+    compatible = export(str(tmp_path), "compatible", 9)
+    served_path = str(tmp_path / "served.npz")
+    os.replace(export(str(tmp_path), "initial", 9), served_path)
+    socket_path = str(tmp_path / "policy.sock")
+    process = mp.get_context("spawn").Process(target=_serve, args=(served_path, socket_path))
+    process.start()
+    deadline = time.monotonic() + 30
+    while not os.path.exists(socket_path):
+        assert process.is_alive() and time.monotonic() < deadline, "the server did not start"
+        time.sleep(0.05)
+    yield served_path, socket_path, compatible
+    process.terminate()
+    process.join()
+    assert not os.path.exists(socket_path)
+
+
+def test_actions_match_the_served_model(server):
+    served_path, socket_path, _ = server
+    states = sample_states(64, seed=0)
+    with PolicyClient(socket_path) as client:
+        np.testing.assert_array_equal(client.act_batch(states), load_policy(served_path).act_batch(states))
+        assert client.act(states[0]) == load_policy(served_path).act(states[0])
+
+
+def test_incompatible_reload_answers_with_errors(server, tmp_path):
+    served_path, socket_path, compatible = server
+    states = sample_states(4, seed=0)
+    clients = [PolicyClient(socket_path, timeout=5.0) for _ in range(4)]
+    try:
+        swap_in(export(str(tmp_path), "incompatible", 5), served_path, clients[0], reloads=1)
+
+        def act(client):
+            with pytest.raises(RuntimeError, match="forward pass failed"):
+                client.act_batch(states)
+
+        # Concurrent requests share one failing batch; each must get its own error, not a timeout
+        with ThreadPoolExecutor(len(clients)) as pool:
+            list(pool.map(act, clients))
+
+        # The batcher survived: a compatible model is served again on the same connections
+        swap_in(compatible, served_path, clients[0], reloads=2)
+        expected = load_policy(compatible).act_batch(states)
+        for client in clients:
+            np.testing.assert_array_equal(client.act_batch(states), expected)
+    finally:
+        for client in clients:
+            client.close()
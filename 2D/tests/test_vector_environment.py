@@ -0,0 +1,22 @@
+import numpy as np
+
+from benchmarks.vector_environment import TOLERANCE, check_parity
+from environment import VectorEnvironment
+
+
+def test_landing_points_match_scalar_grenade():
+    assert check_parity(num_envs=64, seed=0) <= TOLERANCE
+
+
+def test_seeded_environments_are_reproducible():
+    runs = []
+    for _ in range(2):
+        env = VectorEnvironment(16, seed=3)
+        observations = [env.reset()]
+        actions = np.random.default_rng(3).integers(0, 3, size=(50, 16))
+        for action in actions:
+            observation, reward, done, _ = env.step(action)
+            observations += [observation, reward, done]
+        runs.append(observations)
+    for first, second in zip(*runs):
+        np.testing.assert_array_equal(first, second)
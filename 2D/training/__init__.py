@@ -0,0 +1,5 @@
+from training.trainer import Trainer
+from training.distributed import DistributedTrainer
+from training.checkpoint import CheckpointManager
+from training.offline import TransitionWriter, TransitionStore, OfflineTrainer, collect
+from training.sweep import Sweep, format_summary
@@ -0,0 +1,211 @@
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+
+import numpy as np
+import torch
+
+
+def _snapshot(value):
+    """Deep copy of nested dicts/lists whose tensors and arrays may be mutated by training afterwards."""
+    if isinstance(value, torch.Tensor):
+        return value.detach().clone()
+    if isinstance(value, np.ndarray):
+        return np.array(value)
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_snapshot(item) for item in value)
+    return value
+
+
+def _split_arrays(value, prefix, arrays):
+    """Replace every NumPy array by a {"__npy__": name} placeholder, collecting the arrays by name."""
+    if isinstance(value, np.ndarray):
+        arrays[prefix] = value
+        return {"__npy__": prefix}
+    if isinstance(value, dict):
+        return {key: _split_arrays(item, f"{prefix}.{key}" if prefix else str(key), arrays) for key, item in value.items()}
+    return value
+
+
+def _join_arrays(value, directory, mmap_mode):
+    if isinstance(value, dict):
+        if set(value) == {"__npy__"}:
+            array = np.load(os.path.join(directory, value["__npy__"] + ".npy"), mmap_mode=mmap_mode)
+            return array.view(np.ndarray) if mmap_mode else array
+        return {key: _join_arrays(item, directory, mmap_mode) for key, item in value.items()}
+    return value
+
+
+def _fsync(path):
+    with open(path, "rb") as file:
+        os.fsync(file.fileno())
+
+
+def _atomic_write(path, write):
+    """Call `write(tmp_path)`, flush it to disk, then rename over `path` so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    _fsync(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class CheckpointManager:
+    def __init__(self, directory, keep_last=3):
+        """
+        Asynchronous, atomic full-state checkpoints.
+
+        `save` snapshots the state on the calling thread (a memory copy) and a background thread
+        writes it to `<directory>/checkpoints/step_<n>/`: tensors and scalars go to `state.pt`,
+        every NumPy array (e.g. the replay buffer columns) to its own `.npy` file, which `load`
+        memory-maps so resuming does not deserialize the whole buffer up front. Each checkpoint is
+        written to a temporary directory and renamed to a name no checkpoint has (a step saved again
+        becomes `step_<n>.<k>`), so a crash leaves either the old set of checkpoints or the new one.
+        The newest `keep_last` checkpoints and the best-scoring one are kept; older ones, and older
+        versions of a step, are deleted only after the new checkpoint is in place.
+
+        Args:
+            directory (str): Root directory (e.g. the models directory, "brains").
+            keep_last (int): Number of most recent checkpoints kept besides the best one.
+        """
+        self.directory = directory
+        self.checkpoint_dir = os.path.join(directory, "checkpoints")
+        self.keep_last = keep_last
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        self.best = self._read_best()
+        # One write in flight plus one queued; a third save waits, bounding snapshot memory
+        self._queue = queue.Queue(maxsize=1)
+        self._error = None
+        self._thread = threading.Thread(target=self._writer, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def save(self, step, state, score=None, weights=None):
+        """
+        Queue a checkpoint of `state` for writing and return without waiting for the disk.
+
+        Args:
+            step (int): Checkpoint number (e.g. the episode); names the checkpoint directory.
+            state (dict): Nested dicts of tensors, NumPy arrays and picklable values.
+            score (float): Evaluation score; the highest-scoring checkpoint is never pruned.
+            weights (dict): Optional Q-network state dict, also written as `model_episode_<step>.pth`
+                in `directory` for `main.py test`/`eval`.
+        """
+        self._raise_error()
+        self._queue.put((step, _snapshot(state), score, _snapshot(weights)))
+
+    def wait(self):
+        """Block until every queued checkpoint is on disk."""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        self.wait()
+        self._queue.put(None)
+        self._thread.join()
+
+    def checkpoints(self):
+        """Completed checkpoint paths, oldest first; of a step saved more than once, only the newest."""
+        newest = {}
+        for step, version, path in self._versions():
+            newest[step] = path  # `_versions` is sorted, so the last one of each step wins
+        return [newest[step] for step in sorted(newest)]
+
+    def _versions(self):
+        """(step, version, path) of every completed checkpoint directory, sorted."""
+        found = []
+        for name in os.listdir(self.checkpoint_dir):
+            # A step saved again gets a new directory "step_<n>.<version>" instead of replacing the old one
+            match = re.fullmatch(r"step_(\d+)(?:\.(\d+))?", name)
+            if match:
+                found.append((int(match.group(1)), int(match.group(2) or 0), os.path.join(self.checkpoint_dir, name)))
+        return sorted(found)
+
+    def latest(self):
+        checkpoints = self.checkpoints()
+        return checkpoints[-1] if checkpoints else None
+
+    def load(self, path=None, mmap=True):
+        """
+        Read a checkpoint (default: the latest).
+
+        Args:
+            path (str): Checkpoint directory.
+            mmap (bool): Memory-map the arrays copy-on-write instead of reading them; pages are loaded
+                on first touch and modifications never reach the file.
+
+        Returns:
+            dict: The saved state, or None if there is no checkpoint.
+        """
+        path = path or self.latest()
+        if path is None:
+            return None
+        state = torch.load(os.path.join(path, "state.pt"), weights_only=False)
+        return _join_arrays(state, path, "c" if mmap else None)
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Writing a checkpoint failed") from error
+
+    def _writer(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as error:  # Surfaced on the training thread by the next save/wait
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _write(self, step, state, score, weights):
+        if weights is not None:
+            model_path = os.path.join(self.directory, f"model_episode_{step}.pth")
+            _atomic_write(model_path, lambda tmp_path: torch.save(weights, tmp_path))
+
+        # Never rename over an existing checkpoint: the old one is only deleted once the new one is in place
+        versions = [version for saved, version, _ in self._versions() if saved == step]
+        name = f"step_{step}.{versions[-1] + 1}" if versions else f"step_{step}"
+        final_path = os.path.join(self.checkpoint_dir, name)
+        tmp_path = os.path.join(self.checkpoint_dir, f".step_{step}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        arrays = {}
+        state = _split_arrays(state, "", arrays)
+        for name, array in arrays.items():
+            array_path = os.path.join(tmp_path, name + ".npy")
+            np.save(array_path, array)
+            _fsync(array_path)
+        torch.save(state, os.path.join(tmp_path, "state.pt"))
+        _fsync(os.path.join(tmp_path, "state.pt"))
+        os.replace(tmp_path, final_path)
+
+        if score is not None and (self.best is None or score > self.best["score"]):
+            self.best = {"step": step, "score": score}
+            _atomic_write(os.path.join(self.checkpoint_dir, "best.json"), self._write_best)
+        self._prune()
+
+    def _prune(self):
+        best_step = self.best["step"] if self.best else None
+        checkpoints = self.checkpoints()
+        keep = set(checkpoints[-self.keep_last:] if self.keep_last else [])
+        for step, _, path in self._versions():
+            # Superseded versions of a step go too, including any left by a crash after the rename
+            if path not in keep and (step != best_step or path not in checkpoints):
+                shutil.rmtree(path)
+
+    def _write_best(self, path):
+        with open(path, "w") as file:
+            json.dump(self.best, file)
+
+    def _read_best(self):
+        try:
+            with open(os.path.join(self.checkpoint_dir, "best.json")) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
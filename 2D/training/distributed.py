@@ -0,0 +1,243 @@
+import os
+import queue
+import time
+import multiprocessing as mp
+
+import numpy as np
+import torch
+
+from agent import DQNAgent
+from environment import Environment
+from utils import spawn_seeds
+
+
+def _state_dict_to_numpy(state_dict):
+    # Plain arrays pickle cheaply through a pipe and avoid sharing torch storages across processes
+    return {name: tensor.detach().cpu().numpy() for name, tensor in state_dict.items()}
+
+
+def _state_dict_from_numpy(arrays):
+    return {name: torch.from_numpy(array) for name, array in arrays.items()}
+
+
+def rollout_worker(worker_id, state_size, action_size, transition_queue, weight_conn, stop_event,
+                   chunk_size=64, max_episode_steps=200, seed=None, env_kwargs=None, inference_backend="torch"):
+    """
+    Actor process: runs its own `Environment` and a CPU copy of the Q-network.
+
+    Transitions are sent to the learner in chunks of `chunk_size`, together with the returns of the
+    episodes finished since the previous chunk. New weights and epsilon are picked up from
+    `weight_conn` whenever the learner publishes them.
+
+    Args:
+        worker_id (int): Index of the worker, reported back with every chunk.
+        state_size (int): Size of the observation vector.
+        action_size (int): Number of discrete actions.
+        transition_queue (multiprocessing.Queue): Queue shared by all workers towards the learner.
+        weight_conn (multiprocessing.connection.Connection): Receiving end of the learner's weight pipe.
+        stop_event (multiprocessing.Event): Set by the learner when training is over.
+        chunk_size (int): Number of transitions sent per message.
+        max_episode_steps (int): Steps after which an episode is cut with a -1000 penalty, as in `Trainer`.
+        seed (int): Seed of this worker's environment and exploration streams.
+        env_kwargs (dict): Extra `Environment` constructor arguments (integrator, coasting, ...).
+        inference_backend (str): Forward path of the worker's network, see `DQNAgent`.
+    """
+    torch.set_num_threads(1)  # One core per actor; the learner owns the rest
+    env_seed, agent_seed = spawn_seeds(seed, 2)
+    env = Environment(seed=env_seed, **(env_kwargs or {}))
+    # The worker only acts; its replay buffer is never filled
+    agent = DQNAgent(state_size, action_size, buffer_size=1, inference_backend=inference_backend, seed=agent_seed)
+
+    # Wait for the first weights so every actor starts from the learner's network
+    weights, agent.epsilon = weight_conn.recv()
+    agent.q_network.load_state_dict(_state_dict_from_numpy(weights))
+
+    transitions = []
+    episode_returns = []
+    state = env.reset()
+    total_reward = 0
+    steps = 0
+    while not stop_event.is_set():
+        # Keep only the most recent weights if several syncs queued up
+        while weight_conn.poll():
+            weights, agent.epsilon = weight_conn.recv()
+            agent.q_network.load_state_dict(_state_dict_from_numpy(weights))
+
+        action = agent.act(state)
+        next_state, reward, done, info = env.step(action)
+        total_reward += reward
+        steps += info["steps"]  # More than one when the fall was coasted, as in `Trainer`
+        hit = info["hit"]
+        if steps > max_episode_steps:
+            done = True
+            total_reward += -1000
+        transitions.append((state, action, reward, next_state, done))
+        state = next_state
+
+        if done:
+            episode_returns.append((total_reward, steps, hit))
+            state = env.reset()
+            total_reward = 0
+            steps = 0
+
+        if len(transitions) >= chunk_size:
+            transition_queue.put((worker_id, transitions, episode_returns))
+            transitions = []
+            episode_returns = []
+
+
+class DistributedTrainer:
+    def __init__(self, state_size, action_size, num_workers=4, sync_interval=100, chunk_size=64,
+                 updates_per_chunk=1, episodes=2000, save_dir="brains", save_every=250, report_interval=5.0,
+                 max_episode_steps=200, agent_kwargs=None, env_kwargs=None, seed=None):
+        """
+        Actor/learner training: `num_workers` processes collect experience while this process trains.
+
+        Args:
+            state_size (int): Size of the observation vector.
+            action_size (int): Number of discrete actions.
+            num_workers (int): Number of rollout worker processes.
+            sync_interval (int): Learner updates between weight broadcasts to the workers.
+            chunk_size (int): Transitions per message from a worker.
+            updates_per_chunk (int): Learner updates run for every chunk received.
+            episodes (int): Total episodes, summed over all workers, before training stops.
+            save_dir (str): Directory for model checkpoints.
+            save_every (int): Save the model every this many episodes (0: never).
+            report_interval (float): Seconds between throughput reports.
+            max_episode_steps (int): Steps after which a worker cuts an episode with a -1000 penalty.
+            agent_kwargs (dict): Extra `DQNAgent` arguments of the learner (learning rate, replay, target network, ...).
+            env_kwargs (dict): Extra `Environment` arguments of every worker.
+            seed (int): Root seed; the learner and every worker get independent child streams.
+        """
+        self.state_size = state_size
+        self.action_size = action_size
+        self.num_workers = num_workers
+        self.sync_interval = sync_interval
+        self.chunk_size = chunk_size
+        self.updates_per_chunk = updates_per_chunk
+        self.episodes = episodes
+        self.save_dir = save_dir
+        self.save_every = save_every
+        self.report_interval = report_interval
+        self.max_episode_steps = max_episode_steps
+        self.agent_kwargs = agent_kwargs or {}
+        self.env_kwargs = env_kwargs
+
+        learner_seed, *self.worker_seeds = spawn_seeds(seed, num_workers + 1)
+        self.agent = DQNAgent(state_size, action_size, seed=learner_seed, **self.agent_kwargs)
+        self.env_steps = 0
+        self.updates = 0  # Gradient updates actually performed (`agent.updates`)
+        self.synced_at = 0  # Value of `updates` at the last weight broadcast
+        self.episodes_done = 0
+        self.hits = 0
+
+    def run(self, duration=None):
+        """
+        Train until `episodes` episodes are collected (or `duration` seconds have passed).
+
+        Returns:
+            dict: Aggregate throughput of the run (env steps/sec, learner updates/sec) plus episodes and hits.
+        """
+        ctx = mp.get_context("spawn")
+        transition_queue = ctx.Queue(maxsize=4 * self.num_workers)
+        stop_event = ctx.Event()
+        weight_conns = []
+        workers = []
+        for worker_id in range(self.num_workers):
+            receiver, sender = ctx.Pipe(duplex=False)
+            worker = ctx.Process(
+                target=rollout_worker,
+                args=(worker_id, self.state_size, self.action_size, transition_queue, receiver, stop_event,
+                      self.chunk_size, self.max_episode_steps, self.worker_seeds[worker_id], self.env_kwargs,
+                      self.agent.inference_backend),
+                daemon=True,
+            )
+            worker.start()
+            weight_conns.append(sender)
+            workers.append(worker)
+
+        os.makedirs(self.save_dir, exist_ok=True)
+        self._broadcast_weights(weight_conns)
+        # Clocks start at the first chunk so process start-up (importing torch) is not counted
+        start = last_report = None
+        last_steps = last_updates = 0
+        try:
+            while self.episodes_done < self.episodes:
+                if duration is not None and start is not None and time.perf_counter() - start >= duration:
+                    break
+                try:
+                    _, transitions, episode_returns = transition_queue.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                if start is None:
+                    start = last_report = time.perf_counter()
+                states, actions, rewards, next_states, dones = zip(*transitions)
+                self.agent.replay_buffer.add_batch(np.asarray(states), np.asarray(actions), np.asarray(rewards),
+                                                   np.asarray(next_states), np.asarray(dones))
+                self.env_steps += len(transitions)
+                self._finish_episodes(episode_returns)
+
+                for _ in range(self.updates_per_chunk):
+                    # No update runs while the buffer holds less than a batch, so count what the agent did
+                    self.agent.train()
+                    self.updates = self.agent.updates
+                    if self.updates - self.synced_at >= self.sync_interval:
+                        self._broadcast_weights(weight_conns)
+                        self.synced_at = self.updates
+
+                now = time.perf_counter()
+                if now - last_report >= self.report_interval:
+                    elapsed = now - last_report
+                    print(f"--- Distributed Training ---\n"
+                          f"Workers: {self.num_workers}\n"
+                          f"Episodes: {self.episodes_done}/{self.episodes}\n"
+                          f"Hits: {self.hits}\n"
+                          f"Env steps/sec: {(self.env_steps - last_steps) / elapsed:,.0f}\n"
+                          f"Learner updates/sec: {(self.updates - last_updates) / elapsed:,.0f}\n"
+                          f"Epsilon: {self.agent.epsilon:.2f}\n"
+                          f"----------------------------")
+                    last_report, last_steps, last_updates = now, self.env_steps, self.updates
+        finally:
+            stop_event.set()
+            self._shutdown(workers, transition_queue)
+
+        elapsed = time.perf_counter() - start if start is not None else float("inf")
+        return {
+            "workers": self.num_workers,
+            "env_steps_per_sec": self.env_steps / elapsed,
+            "updates_per_sec": self.updates / elapsed,
+            "episodes": self.episodes_done,
+            "hits": self.hits,
+        }
+
+    def _finish_episodes(self, episode_returns):
+        for total_reward, steps, hit in episode_returns:
+            self.episodes_done += 1
+            if self.episodes_done % 2 == 0:
+                self.agent.decay_epsilon()
+            if hit:
+                self.hits += 1
+                print(30*"!")
+            if self.save_every and self.episodes_done % self.save_every == 0:
+                model_path = os.path.join(self.save_dir, f"model_episode_{self.episodes_done}.pth")
+                torch.save(self.agent.q_network.state_dict(), model_path)
+                print(f"Model saved at episode {self.episodes_done} to {model_path}")
+
+    def _broadcast_weights(self, weight_conns):
+        message = (_state_dict_to_numpy(self.agent.q_network.state_dict()), self.agent.epsilon)
+        for conn in weight_conns:
+            conn.send(message)
+
+    @staticmethod
+    def _shutdown(workers, transition_queue):
+        # Workers may be blocked on a full queue; keep draining until they have all exited
+        deadline = time.perf_counter() + 10.0
+        while any(worker.is_alive() for worker in workers) and time.perf_counter() < deadline:
+            try:
+                transition_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
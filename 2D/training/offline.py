@@ -0,0 +1,314 @@
+import multiprocessing as mp
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from constants import HEIGHT
+from utils import spawn_seeds
+
+COLUMNS = ("states", "actions", "rewards", "next_states", "dones")
+
+
+class TransitionWriter:
+    def __init__(self, directory, state_size, chunk_size=100_000, prefix="chunk"):
+        """
+        Append transitions to an on-disk store of fixed-size chunks.
+
+        Every chunk is a directory of fixed-dtype `.npy` columns (float32 states, int64 actions,
+        float32 rewards and dones, as in `ReplayBuffer`). A chunk is written to a temporary
+        directory and renamed into place when complete, so readers only ever see whole chunks and
+        several writers (with distinct prefixes) can fill one store concurrently. Chunk numbers
+        continue after the highest existing chunk of the same prefix, so a later run appends to
+        the store instead of colliding with its chunks.
+
+        Args:
+            directory (str): Store directory.
+            state_size (int): Length of an observation vector.
+            chunk_size (int): Transitions per chunk.
+            prefix (str): Chunk name prefix, unique per writer.
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.prefix = prefix
+        os.makedirs(directory, exist_ok=True)
+        existing = [re.fullmatch(rf"{re.escape(prefix)}_(\d+)", name) for name in os.listdir(directory)]
+        self.first_chunk = max((int(match.group(1)) + 1 for match in existing if match), default=0)
+        self.chunks_written = 0
+        self.count = 0  # Transitions in the current, unwritten chunk
+        self.total = 0  # Transitions written to disk
+        self.columns = {
+            "states": np.zeros((chunk_size, state_size), dtype=np.float32),
+            "actions": np.zeros(chunk_size, dtype=np.int64),
+            "rewards": np.zeros(chunk_size, dtype=np.float32),
+            "next_states": np.zeros((chunk_size, state_size), dtype=np.float32),
+            "dones": np.zeros(chunk_size, dtype=np.float32),
+        }
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """Append n transitions given as column arrays, as in `ReplayBuffer.add_batch`."""
+        batch = dict(zip(COLUMNS, (states, actions, rewards, next_states, dones)))
+        start, n = 0, len(actions)
+        while start < n:
+            take = min(n - start, self.chunk_size - self.count)
+            for name, column in self.columns.items():
+                column[self.count:self.count + take] = batch[name][start:start + take]
+            self.count += take
+            start += take
+            if self.count == self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        """Write the buffered transitions (possibly fewer than `chunk_size`) as one chunk."""
+        if self.count == 0:
+            return
+        name = f"{self.prefix}_{self.first_chunk + self.chunks_written:05d}"
+        tmp_path = os.path.join(self.directory, f".{name}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for column_name, column in self.columns.items():
+            np.save(os.path.join(tmp_path, column_name + ".npy"), column[:self.count])
+        os.replace(tmp_path, os.path.join(self.directory, name))
+        self.chunks_written += 1
+        self.total += self.count
+        self.count = 0
+
+    def close(self):
+        self.flush()
+
+
+class TransitionStore:
+    def __init__(self, directory, batch_size=128, seed=None):
+        """
+        Read-only view of a `TransitionWriter` store that samples minibatches through `np.memmap`.
+
+        Columns are memory-mapped, so opening a store costs nothing and only the sampled rows are
+        ever read from disk (and then served from the page cache). `sample` and `size` mirror
+        `ReplayBuffer`, so the store can stand in for an agent's replay buffer.
+
+        Args:
+            directory (str): Store directory.
+            batch_size (int): Number of transitions returned by `sample`.
+            seed (int): Seed of the sampling random stream.
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.chunks = []
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if not name.startswith(".") and os.path.isdir(path):
+                self.chunks.append({column: np.load(os.path.join(path, column + ".npy"), mmap_mode="r")
+                                    for column in COLUMNS})
+        if not self.chunks:
+            raise ValueError(f"No transition chunks in {directory}")
+        # Global index i lives in chunk searchsorted(ends, i, "right") at offset i - starts[chunk]
+        lengths = np.array([len(chunk["actions"]) for chunk in self.chunks])
+        self.ends = np.cumsum(lengths)
+        self.starts = self.ends - lengths
+        self.count = int(self.ends[-1])
+        self.state_size = self.chunks[0]["states"].shape[1]
+
+    def size(self):
+        return self.count
+
+    def sample(self):
+        """
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones) arrays of `batch_size` uniformly sampled rows.
+        """
+        return self.gather(self.rng.integers(0, self.count, size=self.batch_size))
+
+    def gather(self, indices):
+        """Rows at the given global indices, read chunk by chunk with sorted offsets for sequential access."""
+        indices = np.sort(indices)
+        chunk_ids = np.searchsorted(self.ends, indices, side="right")
+        batch = {
+            "states": np.empty((len(indices), self.state_size), dtype=np.float32),
+            "actions": np.empty(len(indices), dtype=np.int64),
+            "rewards": np.empty(len(indices), dtype=np.float32),
+            "next_states": np.empty((len(indices), self.state_size), dtype=np.float32),
+            "dones": np.empty(len(indices), dtype=np.float32),
+        }
+        for chunk_id in np.unique(chunk_ids):
+            rows = chunk_ids == chunk_id
+            offsets = indices[rows] - self.starts[chunk_id]
+            chunk = self.chunks[chunk_id]
+            for column in COLUMNS:
+                batch[column][rows] = chunk[column][offsets]
+        return tuple(batch[column] for column in COLUMNS)
+
+
+def _oracle_actions(oracle, observations, tolerance=0.5):
+    """Vectorized `TrajectoryOracle.act` for a (batch, 9) observation array."""
+    # Same inputs as `TrajectoryOracle.predict`: the fall height, with release y and wind rounded like its cache key
+    release_y = np.round(observations[:, 3], oracle.cache_decimals)
+    winds = np.round(observations[:, 6], oracle.cache_decimals)
+    offsets, _ = oracle.query(HEIGHT - release_y, np.zeros(len(observations)), winds)
+    miss = observations[:, 2] + offsets - observations[:, 4]
+    return np.where(np.abs(miss) <= tolerance, 2, np.where(miss > 0, 1, 0))
+
+
+def collect_worker(directory, steps, policy="random", model_path=None, epsilon=0.1, num_envs=256,
+                   chunk_size=100_000, prefix="chunk", seed=None):
+    """
+    Step a `VectorEnvironment` for `steps` transitions and write them with a `TransitionWriter`.
+
+    Args:
+        directory (str): Store directory.
+        steps (int): Number of transitions to write.
+        policy (str): "random", "oracle" (`TrajectoryOracle` baseline) or "model" (greedy Q-network).
+        model_path (str): `QNetwork` checkpoint for the "model" policy.
+        epsilon (float): Probability of replacing the policy's action with a random one.
+        num_envs (int): Episodes stepped in parallel.
+        chunk_size (int): Transitions per chunk.
+        prefix (str): Chunk name prefix, unique per worker.
+        seed (int): Seed for the environments and the exploration stream.
+
+    Returns:
+        int: Number of transitions written.
+    """
+    from environment import TrajectoryOracle, VectorEnvironment
+
+    env_seed, action_seed = spawn_seeds(seed, 2)
+    rng = np.random.default_rng(action_seed)
+    env = VectorEnvironment(num_envs, seed=env_seed)
+    observations = env.reset()
+    if policy == "oracle":
+        oracle = TrajectoryOracle(dt=env.dt)
+        choose = lambda observations: _oracle_actions(oracle, observations)
+    elif policy == "model":
+        import torch
+
+        from agent.agent import QNetwork
+        from agent.inference import NumpyQNetwork
+
+        torch.set_num_threads(1)
+        q_network = QNetwork(observations.shape[1], 3)
+        q_network.load_state_dict(torch.load(model_path))
+        network = NumpyQNetwork(q_network)
+        choose = lambda observations: network(observations.astype(np.float32)).argmax(axis=1)
+    elif policy == "random":
+        choose = lambda observations: rng.integers(0, 3, size=len(observations))
+    else:
+        raise ValueError(f"Unknown collection policy: {policy}")
+
+    writer = TransitionWriter(directory, observations.shape[1], chunk_size, prefix)
+    written = 0
+    while written < steps:
+        actions = choose(observations)
+        explore = rng.random(num_envs) < epsilon
+        actions = np.where(explore, rng.integers(0, 3, size=num_envs), actions)
+        next_observations, rewards, dones, info = env.step(actions)
+        # Finished slots were already reset; their true successor states are the final observations
+        stored_next = next_observations.copy()
+        if dones.any():
+            stored_next[dones] = info["final_observation"]
+        # Truncation is not a terminal state, so those transitions still bootstrap
+        terminal = dones & ~info["truncated"]
+        take = min(num_envs, steps - written)
+        writer.add_batch(observations[:take], actions[:take], rewards[:take], stored_next[:take], terminal[:take])
+        written += take
+        observations = next_observations
+    writer.close()
+    return written
+
+
+def collect(directory, steps, workers=1, policy="random", model_path=None, epsilon=0.1, num_envs=256,
+            chunk_size=100_000, seed=None):
+    """
+    Generate an offline dataset of `steps` transitions with `workers` processes writing into one store.
+
+    Returns:
+        dict: Transitions written and collection throughput (transitions/sec).
+    """
+    worker_seeds = spawn_seeds(seed, workers)
+    shares = [steps // workers + (i < steps % workers) for i in range(workers)]
+    start = time.perf_counter()
+    if workers == 1:
+        written = collect_worker(directory, shares[0], policy, model_path, epsilon, num_envs, chunk_size,
+                                 "worker00", worker_seeds[0])
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+            futures = [pool.submit(collect_worker, directory, shares[i], policy, model_path, epsilon, num_envs,
+                                   chunk_size, f"worker{i:02d}", worker_seeds[i]) for i in range(workers)]
+            written = sum(future.result() for future in futures)
+    elapsed = time.perf_counter() - start
+    return {"transitions": written, "transitions_per_sec": written / elapsed}
+
+
+class OfflineTrainer:
+    def __init__(self, agent, store, save_dir="brains", save_every=10_000, status_interval=5.0):
+        """
+        Train a `DQNAgent` from a `TransitionStore` with no environment in the loop.
+
+        The store replaces the agent's replay buffer, so every update samples straight from the
+        memory-mapped dataset.
+
+        Args:
+            agent (DQNAgent): Agent to train; prioritized replay is not supported offline.
+            store (TransitionStore): Dataset to learn from.
+            save_dir (str): Directory for model checkpoints.
+            save_every (int): Save the model every this many updates and at the end of `run` (0: never).
+            status_interval (float): Minimum seconds between console status lines.
+        """
+        if agent.prioritized:
+            raise ValueError("Offline training samples uniformly; create the agent with prioritized=False")
+        if store.size() < agent.replay_buffer.batch_size:
+            raise ValueError(f"The store holds {store.size()} transitions, fewer than one batch")
+        self.agent = agent
+        self.store = store
+        store.batch_size = agent.replay_buffer.batch_size
+        agent.replay_buffer = store
+        agent.train_every = 1
+        self.save_dir = save_dir
+        self.save_every = save_every
+        self.status_interval = status_interval
+
+    def run(self, updates):
+        """
+        Run `updates` gradient updates.
+
+        Returns:
+            dict: Updates performed, updates/sec and the mean loss of the run.
+        """
+        from utils import RateLimiter
+
+        agent = self.agent
+        status = RateLimiter(self.status_interval)
+        if self.save_every:
+            os.makedirs(self.save_dir, exist_ok=True)
+        start = time.perf_counter()
+        first_update = agent.updates
+        # A threshold, not a modulo: with `gradient_steps` > 1 the counter can jump over a multiple
+        next_save = (agent.updates // self.save_every + 1) * self.save_every if self.save_every else None
+        saved_at = None
+        total_loss = 0.0
+        calls = 0
+        while agent.updates - first_update < updates:
+            loss = agent.train()  # `gradient_steps` updates per call
+            total_loss += loss
+            calls += 1
+            done = agent.updates - first_update
+            if status.ready():
+                print(f"Offline updates: {done}/{updates}, loss {loss:.4f}, "
+                      f"{done / (time.perf_counter() - start):,.0f} updates/sec")
+            if self.save_every and agent.updates >= next_save:
+                saved_at = self.save_checkpoint()
+                next_save += self.save_every
+        if self.save_every and agent.updates > first_update and saved_at != agent.updates:
+            self.save_checkpoint()  # The final model, unless it was just saved
+        elapsed = time.perf_counter() - start
+        done = agent.updates - first_update
+        return {"updates": done, "updates_per_sec": done / elapsed, "mean_loss": total_loss / max(calls, 1)}
+
+    def save_checkpoint(self):
+        """Write the Q-network to `model_offline_<updates>.pth`; returns the update count saved."""
+        import torch
+
+        model_path = os.path.join(self.save_dir, f"model_offline_{self.agent.updates}.pth")
+        torch.save(self.agent.q_network.state_dict(), model_path)
+        return self.agent.updates
@@ -0,0 +1,326 @@
+import contextlib
+import inspect
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import multiprocessing as mp
+
+import numpy as np
+
+from utils import spawn_seeds
+
+# Used when no search space is given: the agent's most sensitive hyperparameters around their defaults
+DEFAULT_SPACE = {
+    "learning_rate": {"low": 1e-4, "high": 1e-2, "log": True},
+    "gamma": [0.95, 0.98, 0.99, 0.995],
+    "epsilon_decay": [0.99, 0.995, 0.998],
+    "buffer_size": [2000, 10_000, 50_000],
+    "batch_size": [32, 64, 128, 256],
+}
+
+
+def sample_config(space, rng):
+    """
+    Draw one trial configuration from a search space.
+
+    Args:
+        space (dict): Maps a `DQNAgent` argument to a list of choices, to a range
+            {"low", "high", "log" (sample the logarithm uniformly), "int" (round)} or to a fixed value.
+        rng (np.random.Generator): Random stream.
+    """
+    config = {}
+    for name, spec in space.items():
+        if isinstance(spec, list):
+            value = spec[int(rng.integers(len(spec)))]
+        elif isinstance(spec, dict):
+            low, high = spec["low"], spec["high"]
+            if spec.get("log"):
+                value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            else:
+                value = float(rng.uniform(low, high))
+            if spec.get("int"):
+                value = int(round(value))
+        else:
+            value = spec
+        config[name] = value
+    return config
+
+
+def rung_budgets(min_episodes, max_episodes, eta):
+    """Episode budgets of the successive-halving rungs: min_episodes * eta**k, capped by max_episodes."""
+    budgets = []
+    budget = min_episodes
+    while budget < max_episodes:
+        budgets.append(int(budget))
+        budget *= eta
+    budgets.append(max_episodes)
+    return budgets
+
+
+def available_cpus():
+    """CPUs this process may run on (the affinity mask where supported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _init_worker(cpu_sets, threads):
+    import torch
+
+    # Each worker takes its own block of cores, so trials never compete for a core
+    cpus = cpu_sets.get()
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    torch.set_num_threads(threads)
+
+
+def run_trial(trial_dir, config, episodes, seed, env_kwargs=None, max_episode_steps=200, eval_episodes=0, eval_seed=0):
+    """
+    Train one trial up to `episodes` episodes in total, continuing from its last segment if there is one.
+
+    The full training state is checkpointed in `trial_dir` after every segment, so a promoted
+    trial picks up exactly where it stopped, in whichever worker runs it. Console output goes to
+    `trial_dir/train.log`.
+
+    Args:
+        trial_dir (str): Directory of the trial's checkpoints and logs.
+        config (dict): `DQNAgent` keyword arguments.
+        episodes (int): Episode budget to reach.
+        seed (int): Seed of the trial's environment and agent streams.
+        env_kwargs (dict): Extra `Environment` constructor arguments.
+        max_episode_steps (int): Steps after which an episode is cut.
+        eval_episodes (int): Greedy evaluation episodes scoring the segment; 0 scores it by the mean
+            training reward of its last tenth (at least 10 episodes).
+        eval_seed (int): Root of the evaluation seeds, shared by all trials so scores are comparable.
+
+    Returns:
+        dict: Episodes trained, score and training throughput of the segment.
+    """
+    from agent import DQNAgent
+    from environment import Environment
+    from training.checkpoint import CheckpointManager
+    from training.trainer import Trainer
+
+    os.makedirs(trial_dir, exist_ok=True)
+    with open(os.path.join(trial_dir, "train.log"), "a") as log, contextlib.redirect_stdout(log):
+        env_seed, agent_seed = spawn_seeds(seed, 2)
+        agent = DQNAgent(9, 3, seed=agent_seed, **config)  # Observation and action sizes of `Environment`
+        env = Environment(seed=env_seed, **(env_kwargs or {}))
+        trainer = Trainer(agent, env, save_dir=trial_dir, save_every=0, metrics_dir=os.path.join(trial_dir, "metrics"),
+                          status_interval=float("inf"), max_episode_steps=max_episode_steps,
+                          eval_episodes=eval_episodes, eval_seed=eval_seed)
+        checkpoints = CheckpointManager(trial_dir, keep_last=1)
+        state = checkpoints.load()
+        if state is not None:
+            trainer.load_state_dict(state)
+        start = time.perf_counter()
+        first_episode = trainer.episode
+        rewards = trainer.run(max(episodes - trainer.episode, 0))
+        elapsed = time.perf_counter() - start
+        if eval_episodes:
+            score = trainer.evaluate()
+        else:
+            tail = rewards[-max(len(rewards) // 10, 10):]
+            score = float(np.mean(tail)) if tail else float("nan")
+        checkpoints.save(trainer.episode, trainer.state_dict(), score=score, weights=agent.q_network.state_dict())
+        checkpoints.close()
+        trainer.close()
+        env.close()
+    return {
+        "episodes": trainer.episode,
+        "score": score,
+        "episodes_per_sec": (trainer.episode - first_episode) / elapsed if elapsed > 0 else float("nan"),
+    }
+
+
+class Sweep:
+    def __init__(self, sweep_dir, space=None, trials=16, min_episodes=50, max_episodes=2000, eta=3, workers=None,
+                 threads_per_worker=1, pin_cpus=True, env_kwargs=None, max_episode_steps=200, eval_episodes=0,
+                 seed=None):
+        """
+        Hyperparameter sweep with asynchronous successive halving (ASHA) over a process pool.
+
+        Every trial is first trained for `min_episodes` episodes. Whenever a worker frees up, the
+        scheduler promotes a trial that ranks in the top 1/`eta` of its rung to the next rung
+        (`eta` times more episodes, resumed from its checkpoint), or starts a new trial if no
+        trial can be promoted. Only the best trials therefore ever reach `max_episodes`, and no
+        worker waits for a rung to fill up. Once every trial has started, the best trial of a rung is
+        always promotable, so the sweep ends with at least one trial trained to `max_episodes`.
+
+        Each worker owns `threads_per_worker` cores (torch threads and, with `pin_cpus`, the CPU
+        affinity mask), and `workers` defaults to the available cores divided by that, so the box
+        is fully used without oversubscription.
+
+        Args:
+            sweep_dir (str): Directory of the trial subdirectories and the summary files.
+            space (dict): Search space, see `sample_config` (default: `DEFAULT_SPACE`).
+            trials (int): Number of configurations sampled.
+            min_episodes (int): Episodes of the first rung.
+            max_episodes (int): Episodes of the last rung.
+            eta (int): Reduction factor: a rung keeps 1/eta of its trials and trains them eta times longer.
+            workers (int): Worker processes (default: available cores // threads_per_worker; 0: in-process).
+            threads_per_worker (int): Torch threads (and pinned cores) per worker.
+            pin_cpus (bool): Pin every worker to its own cores.
+            env_kwargs (dict): Extra `Environment` constructor arguments, shared by all trials.
+            max_episode_steps (int): Steps after which an episode is cut.
+            eval_episodes (int): Greedy evaluation episodes scoring every rung (0: mean training reward).
+            seed (int): Root seed of the configuration sampling and of every trial.
+        """
+        from agent import DQNAgent
+
+        self.sweep_dir = sweep_dir
+        self.space = space or DEFAULT_SPACE
+        unknown = set(self.space) - set(inspect.signature(DQNAgent).parameters)
+        if unknown:
+            raise ValueError(f"Unknown DQNAgent argument(s) in the search space: {', '.join(sorted(unknown))}")
+        self.num_trials = trials
+        self.budgets = rung_budgets(min_episodes, max_episodes, eta)
+        self.eta = eta
+        self.threads_per_worker = threads_per_worker
+        self.cpus = available_cpus()
+        self.workers = max(len(self.cpus) // threads_per_worker, 1) if workers is None else workers
+        self.pin_cpus = pin_cpus
+        self.env_kwargs = env_kwargs
+        self.max_episode_steps = max_episode_steps
+        self.eval_episodes = eval_episodes
+
+        space_seed, *trial_seeds = spawn_seeds(seed, trials + 1)
+        rng = np.random.default_rng(space_seed)
+        self.trials = [{
+            "trial": i,
+            "config": sample_config(self.space, rng),
+            "seed": trial_seeds[i],
+            "scores": [],  # Score at every rung reached, in rung order
+            "episodes": 0,
+            "episodes_per_sec": None,
+            "running": False,
+        } for i in range(trials)]
+        self.started = 0
+        self.promoted = [set() for _ in self.budgets]  # Trials promoted out of every rung
+
+    def _next_job(self):
+        """(trial, rung) to run next: a promotion from the highest possible rung, else a new trial, else None."""
+        for rung in range(len(self.budgets) - 2, -1, -1):
+            finished = [trial for trial in self.trials if len(trial["scores"]) > rung]
+            keep = len(finished) // self.eta
+            if self.started == self.num_trials:
+                keep = max(keep, 1)  # With no trials left to start, the best one always climbs to the last rung
+            top = sorted(finished, key=lambda trial: -_sortable(trial["scores"][rung]))[:keep]
+            for trial in top:
+                if trial["trial"] not in self.promoted[rung] and not trial["running"]:
+                    self.promoted[rung].add(trial["trial"])
+                    return trial, rung + 1
+        if self.started < self.num_trials:
+            self.started += 1
+            return self.trials[self.started - 1], 0
+        return None
+
+    def _submit(self, submit, trial, rung):
+        trial["running"] = True
+        return submit(run_trial, os.path.join(self.sweep_dir, f"trial_{trial['trial']:03d}"), trial["config"],
+                      self.budgets[rung], trial["seed"], self.env_kwargs, self.max_episode_steps,
+                      self.eval_episodes)
+
+    def _record(self, trial, result):
+        trial["running"] = False
+        trial["scores"].append(result["score"])
+        trial["episodes"] = result["episodes"]
+        trial["episodes_per_sec"] = result["episodes_per_sec"]
+        print(f"Trial {trial['trial']} reached {result['episodes']} episodes: score {result['score']:.1f} "
+              f"({result['episodes_per_sec']:.1f} episodes/sec)")
+
+    def run(self):
+        """
+        Run the sweep to completion and write `summary.json` and `summary.csv` to `sweep_dir`.
+
+        Returns:
+            list: `summary()` rows, best first.
+        """
+        os.makedirs(self.sweep_dir, exist_ok=True)
+        start = time.perf_counter()
+        if self.workers == 0:
+            job = self._next_job()
+            while job is not None:
+                trial, rung = job
+                self._record(trial, self._submit(lambda fn, *args: fn(*args), trial, rung))
+                job = self._next_job()
+        else:
+            ctx = mp.get_context("spawn")
+            cpu_sets = ctx.Queue()
+            for worker in range(self.workers):
+                cores = self.cpus[worker * self.threads_per_worker:(worker + 1) * self.threads_per_worker]
+                cpu_sets.put(set(cores) if self.pin_cpus and len(cores) == self.threads_per_worker else None)
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx, initializer=_init_worker,
+                                     initargs=(cpu_sets, self.threads_per_worker)) as pool:
+                running = {}
+                while True:
+                    while len(running) < self.workers:
+                        job = self._next_job()
+                        if job is None:
+                            break
+                        running[self._submit(pool.submit, *job)] = job[0]
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record(running.pop(future), future.result())
+        elapsed = time.perf_counter() - start
+        total = sum(trial["episodes"] for trial in self.trials)
+        print(f"Sweep finished: {total:,} episodes in {elapsed:.1f} s ({total / elapsed:.1f} episodes/sec), "
+              f"{total / (self.num_trials * self.budgets[-1]):.0%} of a full grid of {self.num_trials} trials")
+        summary = self.summary()
+        self.write_summary(summary)
+        return summary
+
+    def summary(self):
+        """One row per trial, ranked by the highest rung reached, then by the score there."""
+        rows = []
+        for trial in self.trials:
+            rung = len(trial["scores"]) - 1
+            rows.append({
+                "trial": trial["trial"],
+                "episodes": trial["episodes"],
+                "rung": rung,
+                "score": trial["scores"][-1] if trial["scores"] else None,
+                "status": "complete" if rung == len(self.budgets) - 1 else ("pruned" if rung >= 0 else "not run"),
+                "episodes_per_sec": trial["episodes_per_sec"],
+                "scores": trial["scores"],
+                **trial["config"],
+            })
+        rows.sort(key=lambda row: (-row["rung"], -_sortable(row["score"])))
+        return rows
+
+    def write_summary(self, summary):
+        with open(os.path.join(self.sweep_dir, "summary.json"), "w") as file:
+            json.dump({"budgets": self.budgets, "space": self.space, "trials": summary}, file, indent=2)
+        columns = ["trial", "status", "episodes", "score", "episodes_per_sec", *self.space]
+        with open(os.path.join(self.sweep_dir, "summary.csv"), "w") as file:
+            file.write(",".join(columns) + "\n")
+            for row in summary:
+                file.write(",".join("" if row[column] is None else str(row[column]) for column in columns) + "\n")
+
+
+def _sortable(score):
+    """Scores with missing or NaN values ranked last."""
+    return -math.inf if score is None or math.isnan(score) else score
+
+
+def format_summary(summary, space):
+    """Ranked plain-text table of `Sweep.summary` rows."""
+    def cell(value):
+        if value is None:
+            return "n/a"
+        if isinstance(value, float):
+            return f"{value:.4g}"
+        return str(value)
+
+    columns = ["rank", "trial", "status", "episodes", "score", *space]
+    rows = [[str(rank), str(row["trial"]), row["status"], str(row["episodes"]), cell(row["score"]),
+             *(cell(row[name]) for name in space)] for rank, row in enumerate(summary, 1)]
+    widths = [max(len(column), *(len(row[i]) for row in rows)) if rows else len(column)
+              for i, column in enumerate(columns)]
+    lines = ["  ".join(column.rjust(width) for column, width in zip(columns, widths))]
+    lines += ["  ".join(value.rjust(width) for value, width in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
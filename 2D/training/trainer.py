@@ -0,0 +1,202 @@
+import os
+import time
+
+import torch
+
+from environment import write_episode_logs
+from training.checkpoint import CheckpointManager
+from utils import MetricsWriter, RateLimiter, Profiler, spawn_seeds
+
+
+class Trainer:
+    def __init__(self, agent, env, save_dir="brains", save_every=250, metrics_dir="metrics", status_interval=5.0,
+                 render_every=0, episode_log=None, profiler=None, max_episode_steps=200, keep_checkpoints=3,
+                 eval_episodes=0, eval_seed=0):
+        """
+        Single-process training loop: act, step, store, train, with metrics, checkpoints and optional rendering.
+
+        `run` can be called repeatedly; episodes are counted across calls.
+
+        Args:
+            agent (DQNAgent): Agent to train.
+            env (Environment): Environment to train in.
+            save_dir (str): Directory for model checkpoints.
+            save_every (int): Save the model every this many episodes (0: never).
+            metrics_dir (str): Directory of the streaming per-episode metrics log (None: no log).
+            status_interval (float): Minimum seconds between console status blocks.
+            render_every (int): Render every Kth episode (0: fully headless).
+            episode_log (str): Append a replayable log line (seed + actions) per episode to this file.
+            profiler (Profiler): Per-phase timers and capture window (default: disabled).
+            max_episode_steps (int): Steps after which an episode is cut with a -1000 penalty.
+            keep_checkpoints (int): Most recent full-state checkpoints kept (plus the best one).
+            eval_episodes (int): Greedy evaluation episodes scoring each checkpoint; 0 scores it by the
+                mean training reward since the previous checkpoint instead.
+            eval_seed (int): Root of the fixed evaluation episode seeds.
+        """
+        self.agent = agent
+        self.env = env
+        self.save_dir = save_dir
+        self.save_every = save_every
+        self.render_every = render_every
+        self.episode_log = episode_log
+        self.max_episode_steps = max_episode_steps
+        self.profiler = profiler or Profiler()
+        agent.profiler = self.profiler
+        # Per-episode metrics are streamed to disk; the console only gets a periodic summary
+        self.metrics = MetricsWriter(metrics_dir) if metrics_dir else None
+        self.status = RateLimiter(status_interval)
+        # Full training state is written in the background; see `resume`
+        self.checkpoints = CheckpointManager(save_dir, keep_last=keep_checkpoints) if save_every else None
+        self.eval_seeds = spawn_seeds(eval_seed, eval_episodes) if eval_episodes else None
+        self.rewards_since_save = []
+
+        self.episode = 0
+        self.hits = 0
+        self.start_time = time.perf_counter()
+
+    def run(self, episodes):
+        """
+        Train for `episodes` more episodes.
+
+        Returns:
+            list: Total reward of every episode run by this call.
+        """
+        agent, env, profiler = self.agent, self.env, self.profiler
+        last_episode = self.episode + episodes
+        rewards = []
+
+        while self.episode < last_episode:
+            episode = self.episode
+            state = env.reset()  # Reset the environment and get initial state
+            total_reward = 0
+            done = False
+            hit = False
+            steps = 0
+            losses = []
+            updates_before = agent.updates
+            episode_start = time.perf_counter()
+            render = self.render_every > 0 and episode % self.render_every == 0
+            profiler.start_episode(episode)
+            while not done:
+                env.score = total_reward
+                with profiler.phase("agent.act"):
+                    action = agent.act(state)  # Get action from agent
+                with profiler.phase("env.step"):
+                    next_state, reward, done, info = env.step(action)  # Take action in the environment
+                if render:
+                    with profiler.phase("env.render"):
+                        env.render()
+                        env.process_events()  # Process Pygame events to avoid freezing
+                with profiler.phase("replay.add"):
+                    agent.replay_buffer.add((state, action, reward, next_state, done))  # Add experience to replay buffer
+                loss = agent.train()  # Train the agent using replay buffer
+                if loss is not None:
+                    losses.append(loss)
+                state = next_state  # Update state
+                total_reward += reward
+                steps += info["steps"]  # More than one when the fall was coasted
+                hit = info["hit"]  # Decided from the landing, like evaluation; a coasted reward is a discounted sum
+                if steps > self.max_episode_steps:
+                    done = True
+                    total_reward += -1000
+
+            self.episode += 1
+            rewards.append(total_reward)
+            self.rewards_since_save.append(total_reward)
+
+            if self.episode_log is not None:
+                write_episode_logs(self.episode_log, [env.episode_log()])
+
+            if self.episode % 2 == 0:
+                agent.decay_epsilon()
+
+            if hit:
+                self.hits += 1
+
+            episode_time = time.perf_counter() - episode_start
+            if self.metrics is not None:
+                self.metrics.write(
+                    episode=self.episode,
+                    reward=total_reward,
+                    hit=int(hit),
+                    steps=steps,
+                    epsilon=agent.epsilon,
+                    loss=sum(losses) / len(losses) if losses else "",
+                    env_steps_per_sec=steps / episode_time,
+                    updates_per_sec=(agent.updates - updates_before) / episode_time,
+                    wall_time=time.perf_counter() - self.start_time,
+                )
+
+            if self.status.ready() or self.episode == last_episode:
+                print(f"--- Simulation Status ---\n"
+                      f"Episode {self.episode}/{last_episode}\n"
+                      f"Total Reward: {total_reward}\n"
+                      f"Hits: {self.hits}\n"
+                      f"Epsilon: {agent.epsilon:.2f}\n"
+                      f"Steps: {steps}\n"
+                      f"------------------------")
+
+            if self.save_every and self.episode % self.save_every == 0:
+                with profiler.phase("checkpoint"):
+                    self.save_checkpoint()
+
+        return rewards
+
+    def save_checkpoint(self):
+        """Queue a full-state checkpoint of the current episode; the training thread only pays for a memory copy."""
+        score = self.evaluate() if self.eval_seeds else sum(self.rewards_since_save) / max(len(self.rewards_since_save), 1)
+        self.rewards_since_save = []
+        self.checkpoints.save(self.episode, self.state_dict(), score=score, weights=self.agent.q_network.state_dict())
+        model_path = os.path.join(self.save_dir, f"model_episode_{self.episode}.pth")
+        print(f"Model saved at episode {self.episode} to {model_path} (score {score:.1f})")
+
+    def evaluate(self):
+        """Mean reward of greedy episodes on the fixed evaluation seeds."""
+        from evaluation import evaluate_policy
+
+        results = evaluate_policy(self.agent.policy, self.eval_seeds, self.agent.state_size, self.max_episode_steps,
+                                  self.env.config())
+        return float(results["reward"].mean())
+
+    def state_dict(self):
+        """Agent state plus loop counters and the environment and torch random streams."""
+        return {
+            "episode": self.episode,
+            "hits": self.hits,
+            "env_rng": self.env.np_random.bit_generator.state,
+            "torch_rng": torch.get_rng_state(),
+            "agent": self.agent.state_dict(),
+        }
+
+    def load_state_dict(self, state):
+        self.episode = state["episode"]
+        self.hits = state["hits"]
+        self.env.np_random.bit_generator.state = state["env_rng"]
+        torch.set_rng_state(state["torch_rng"])
+        self.agent.load_state_dict(state["agent"])
+
+    def resume(self, path=None):
+        """
+        Continue from a full-state checkpoint (default: the latest in `save_dir`).
+
+        Returns:
+            bool: False if there was no checkpoint to resume from.
+        """
+        manager = self.checkpoints or CheckpointManager(self.save_dir)
+        state = manager.load(path)
+        if state is None:
+            return False
+        self.load_state_dict(state)
+        print(f"Resumed from {path or manager.latest()} at episode {self.episode}")
+        return True
+
+    def close(self):
+        """Wait for pending checkpoints, flush the metrics log and print the profiler summary (if profiling was enabled)."""
+        if self.checkpoints is not None:
+            self.checkpoints.close()
+        if self.metrics is not None:
+            self.metrics.close()
+        self.profiler.close()
+        report = self.profiler.summary()
+        if report:
+            print(report)
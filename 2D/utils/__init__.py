@@ -1 +1,4 @@
-from utils.vector import Vector
\ No newline at end of file
+from utils.vector import Vector
+from utils.seeding import spawn_seeds
+from utils.metrics import MetricsWriter, MetricsTailer, RateLimiter
+from utils.profiler import Profiler
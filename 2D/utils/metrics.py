@@ -0,0 +1,114 @@
+import csv
+import glob
+import io
+import os
+import time
+
+METRICS_FIELDS = ("episode", "reward", "hit", "steps", "epsilon", "loss", "env_steps_per_sec", "updates_per_sec", "wall_time")
+
+
+class MetricsWriter:
+    def __init__(self, log_dir, fields=METRICS_FIELDS, flush_every=20, rotate_rows=100_000):
+        """
+        Append-only, buffered CSV metrics log split into rotating chunk files.
+
+        Rows are buffered in memory and appended to `log_dir/metrics_NNNNN.csv` every `flush_every` rows,
+        so a crash loses at most one buffer. A new chunk file is started every `rotate_rows` rows;
+        a restarted run continues with the next chunk number instead of overwriting.
+
+        Args:
+            log_dir (str): Directory for the chunk files.
+            fields (tuple): Column names, in order.
+            flush_every (int): Rows buffered between writes to disk.
+            rotate_rows (int): Maximum rows per chunk file.
+        """
+        self.log_dir = log_dir
+        self.fields = tuple(fields)
+        self.flush_every = flush_every
+        self.rotate_rows = rotate_rows
+        os.makedirs(log_dir, exist_ok=True)
+
+        self._buffer = []
+        self._chunk = len(metrics_files(log_dir))
+        self._rows_in_chunk = 0
+
+    def write(self, **row):
+        """Buffer one row; missing fields are left empty."""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        while self._buffer:
+            if self._rows_in_chunk >= self.rotate_rows:
+                self._chunk += 1
+                self._rows_in_chunk = 0
+            take = min(len(self._buffer), self.rotate_rows - self._rows_in_chunk)
+            rows, self._buffer = self._buffer[:take], self._buffer[take:]
+            path = os.path.join(self.log_dir, f"metrics_{self._chunk:05d}.csv")
+            new_file = not os.path.exists(path)
+            # Format the whole batch in memory and append it with one write call
+            text = io.StringIO()
+            writer = csv.DictWriter(text, fieldnames=self.fields, extrasaction="ignore", lineterminator="\n")
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+            with open(path, "a", newline="") as file:
+                file.write(text.getvalue())
+            self._rows_in_chunk += take
+
+    def close(self):
+        self.flush()
+
+
+def metrics_files(log_dir):
+    return sorted(glob.glob(os.path.join(log_dir, "metrics_*.csv")))
+
+
+class MetricsTailer:
+    def __init__(self, log_dir):
+        """
+        Incremental reader for a `MetricsWriter` directory: every `poll` returns only the rows
+        appended since the previous call, following rotation into new chunk files.
+        """
+        self.log_dir = log_dir
+        self._offsets = {}
+        self._headers = {}
+
+    def poll(self):
+        """
+        Returns:
+            list: New rows as dicts of strings (empty strings for missing values).
+        """
+        rows = []
+        for path in metrics_files(self.log_dir):
+            offset = self._offsets.get(path, 0)
+            with open(path, "rb") as file:
+                file.seek(offset)
+                data = file.read()
+            # Only consume complete lines; a partially written last line is picked up next time
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                continue
+            lines = data[:end].decode().splitlines()
+            self._offsets[path] = offset + end
+            if path not in self._headers:
+                self._headers[path] = next(csv.reader([lines[0]]))
+                lines = lines[1:]
+            for values in csv.reader(lines):
+                rows.append(dict(zip(self._headers[path], values)))
+        return rows
+
+
+class RateLimiter:
+    def __init__(self, interval):
+        """Allow an action at most once per `interval` seconds (e.g. console status output)."""
+        self.interval = interval
+        self._last = None
+
+    def ready(self):
+        now = time.perf_counter()
+        if self._last is None or now - self._last >= self.interval:
+            self._last = now
+            return True
+        return False
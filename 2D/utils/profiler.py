@@ -0,0 +1,129 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+from collections import defaultdict
+
+import numpy as np
+
+
+class _NullTimer:
+    """Shared do-nothing context manager returned while profiling is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _PhaseTimer:
+    __slots__ = ("durations", "start")
+
+    def __init__(self, durations):
+        self.durations = durations
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.durations.append(time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled=False, cprofile_start=None, cprofile_episodes=0, torch_profile=False, output_dir="profiles"):
+        """
+        Per-phase wall-clock timers for the training loop, with optional cProfile/torch.profiler capture.
+
+        `phase(name)` returns a context manager that records one duration; while disabled it returns
+        a shared no-op object, so instrumented code pays only a method call. A capture window of
+        `cprofile_episodes` episodes starting at episode `cprofile_start` is recorded with cProfile
+        (and torch.profiler if requested) and written to `output_dir`.
+
+        Args:
+            enabled (bool): Record phase timings.
+            cprofile_start (int): First episode of the capture window (None: no capture).
+            cprofile_episodes (int): Number of episodes in the capture window.
+            torch_profile (bool): Also capture the window with torch.profiler (Chrome trace output).
+            output_dir (str): Directory for capture files.
+        """
+        self.enabled = enabled
+        self.cprofile_start = cprofile_start
+        self.cprofile_episodes = cprofile_episodes
+        self.torch_profile = torch_profile
+        self.output_dir = output_dir
+        self.timings = defaultdict(list)
+        self._cprofile = None
+        self._torch_profiler = None
+        self._capture_summary = None
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _PhaseTimer(self.timings[name])
+
+    def start_episode(self, episode):
+        """Open or close the capture window; call at the start of every episode."""
+        if self.cprofile_start is None or self.cprofile_episodes <= 0:
+            return
+        if episode == self.cprofile_start:
+            self._start_capture()
+        elif episode == self.cprofile_start + self.cprofile_episodes:
+            self._stop_capture()
+
+    def _start_capture(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.torch_profile:
+            import torch.profiler
+
+            self._torch_profiler = torch.profiler.profile(activities=[torch.profiler.ProfilerActivity.CPU])
+            self._torch_profiler.__enter__()
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def _stop_capture(self):
+        if self._cprofile is None:
+            return
+        self._cprofile.disable()
+        path = os.path.join(self.output_dir, "training.prof")
+        self._cprofile.dump_stats(path)
+        text = io.StringIO()
+        pstats.Stats(self._cprofile, stream=text).sort_stats("cumulative").print_stats(20)
+        self._capture_summary = f"cProfile capture written to {path}\n{text.getvalue()}"
+        self._cprofile = None
+        if self._torch_profiler is not None:
+            self._torch_profiler.__exit__(None, None, None)
+            trace = os.path.join(self.output_dir, "training_trace.json")
+            self._torch_profiler.export_chrome_trace(trace)
+            self._capture_summary += f"torch.profiler trace written to {trace}\n"
+            self._torch_profiler = None
+
+    def close(self):
+        """Finish a capture window that was still open when the run ended."""
+        self._stop_capture()
+
+    def summary(self):
+        """
+        Returns:
+            str: Table with count, total, share of the summed phase time, mean, p50 and p99 per phase.
+        """
+        lines = []
+        if self.timings:
+            grand_total = sum(sum(durations) for durations in self.timings.values())
+            lines.append(f"{'phase':18s} {'count':>9s} {'total s':>9s} {'share':>7s} {'mean ms':>9s} {'p50 ms':>9s} {'p99 ms':>9s}")
+            for name, durations in sorted(self.timings.items(), key=lambda item: -sum(item[1])):
+                values = np.asarray(durations) * 1e3
+                total = values.sum() / 1e3
+                p50, p99 = np.percentile(values, [50, 99])
+                lines.append(f"{name:18s} {len(values):9d} {total:9.2f} {total / grand_total:7.1%} "
+                             f"{values.mean():9.3f} {p50:9.3f} {p99:9.3f}")
+        if self._capture_summary:
+            lines.append(self._capture_summary)
+        return "\n".join(lines)
@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def spawn_seeds(seed, n):
+    """
+    Derive `n` statistically independent integer seeds from one root seed.
+
+    Uses `numpy.random.SeedSequence.spawn`, so streams handed to vectorized slots or worker
+    processes never overlap, and the same root seed always yields the same children.
+
+    Args:
+        seed (int): Root seed; None draws fresh entropy from the OS.
+        n (int): Number of child seeds.
+
+    Returns:
+        list: `n` Python ints, usable with `np.random.default_rng` and JSON logs.
+    """
+    children = np.random.SeedSequence(seed).spawn(n)
+    return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in children]
@@ -1,6 +1,8 @@
 import math
 
 class Vector:
+    __slots__ = ("x", "y")
+
     def __init__(self, x=0.0, y=0.0):
         self.x = x
         self.y = y
@@ -28,11 +30,39 @@ class Vector:
     def __repr__(self):
         return f"Vector({self.x}, {self.y})"
 
+    # In-place variants: mutate and return self so hot loops allocate nothing
+
+    def set(self, x, y):
+        self.x = x
+        self.y = y
+        return self
+
+    def iadd(self, other):
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def isub(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def scale_(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def add_scaled_(self, other, scalar):
+        """self += other * scalar without the temporary vector."""
+        self.x += other.x * scalar
+        self.y += other.y * scalar
+        return self
+
     def magnitude(self):
-        return math.sqrt(self.x**2 + self.y**2)
+        return math.sqrt(self.x * self.x + self.y * self.y)
     
     def magnitude_squared(self):
-        return self.magnitude()**2
+        return self.x * self.x + self.y * self.y
 
     def normalize(self):
         mag = self.magnitude()
@@ -43,8 +73,16 @@ class Vector:
         else:
             raise ValueError("Cannot normalize a zero vector.")
 
+    def normalize_(self):
+        mag = self.magnitude()
+        if mag != 0:
+            self.x /= mag
+            self.y /= mag
+            return self
+        raise ValueError("Cannot normalize a zero vector.")
+
     def dot(self, other):
         return self.x * other.x + self.y * other.y
 
     def cross(self, other):
-        return self.x * other.y - self.y * other.x
\ No newline at end of file
+        return self.x * other.y - self.y * other.x